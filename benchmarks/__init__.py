@@ -0,0 +1 @@
+"""Treestamps benchmarks."""
@@ -0,0 +1,62 @@
+"""Benchmark serial and concurrent Grovestamps tree loading."""
+
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from benchmarks.trees import make_entries, make_wide_paths
+from treestamps.grove import Grovestamps, GrovestampsConfig
+from treestamps.serializers import FILE_FORMATS, JSONL_FORMAT
+from treestamps.tree import Treestamps
+from treestamps.tree.config import TreestampsConfig
+
+PROGRAM_NAME = "bench"
+
+
+def make_roots(tmp_dir: Path, num_roots: int, num_entries: int, file_format: str):
+    """Create roots each with a dumped timestamp file."""
+    roots = []
+    for root_index in range(num_roots):
+        root = tmp_dir / f"root{root_index}"
+        root.mkdir()
+        ts = Treestamps(
+            TreestampsConfig(PROGRAM_NAME, path=root, file_format=file_format)
+        )
+        paths = make_wide_paths(num_entries)
+        ts.load_map(root, make_entries(paths))
+        ts.dumpf()
+        if ts.get(paths[0]) is None:
+            reason = f"No timestamps dumped for {root}"
+            raise ValueError(reason)
+        roots.append(root)
+    return roots
+
+
+def bench_grove(roots: list[Path], tree_workers: int) -> float:
+    """Time loading a grove."""
+    config = GrovestampsConfig(PROGRAM_NAME, paths=roots, tree_workers=tree_workers)
+    start = perf_counter()
+    Grovestamps(config)
+    return perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--roots", type=int, default=8)
+    parser.add_argument("--entries", type=int, default=20_000)
+    parser.add_argument("--format", choices=sorted(FILE_FORMATS), default=JSONL_FORMAT)
+    args = parser.parse_args()
+
+    print(f"{args.roots} roots x {args.entries} entries, {args.format}")
+    print(f"{'workers':>8} {'load s':>8}")
+    with TemporaryDirectory() as tmp_dir:
+        roots = make_roots(Path(tmp_dir), args.roots, args.entries, args.format)
+        for tree_workers in (1, args.roots):
+            elapsed = bench_grove(roots, tree_workers)
+            print(f"{tree_workers:>8} {elapsed:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark read only startup from the memory mapped index."""
+
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from benchmarks.trees import make_deep_paths, make_entries
+from treestamps.tree import Treestamps
+from treestamps.tree.config import TreestampsConfig
+
+PROGRAM_NAME = "bench"
+NUM_GETS = 1000
+
+
+def bench_startup(root: Path, paths: list[str], **kwargs) -> tuple[float, float]:
+    """Time loading the tree and getting some timestamps."""
+    config = TreestampsConfig(PROGRAM_NAME, path=root, file_format="jsonl", **kwargs)
+    start = perf_counter()
+    ts = Treestamps(config)
+    ts.loadf_tree()
+    load_time = perf_counter() - start
+    start = perf_counter()
+    for path in paths:
+        ts.get(path)
+    get_time = perf_counter() - start
+    ts.close()
+    return load_time, get_time
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--depth", type=int, default=8)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        paths = make_deep_paths(args.entries, args.depth)
+        entries = make_entries(paths)
+        ts = Treestamps(
+            TreestampsConfig(PROGRAM_NAME, path=root, file_format="jsonl", index=True)
+        )
+        ts.load_map(root, entries)
+        ts.dumpf()
+        paths = paths[:: max(args.entries // NUM_GETS, 1)]
+
+        print(f"{args.entries} entries, {len(paths)} gets")
+        print(f"{'mode':>10} {'load s':>8} {'get us':>8}")
+        for name, kwargs in (("full", {}), ("read_only", {"read_only": True})):
+            load_time, get_time = bench_startup(root, paths, **kwargs)
+            per_get = get_time / len(paths) * 1e6
+            print(f"{name:>10} {load_time:>8.4f} {per_get:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Benchmark loading timestamps on a deep synthetic tree."""
+
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from benchmarks.trees import DEEP_DEPTH, make_deep_paths, make_entries
+from treestamps.tree import Treestamps
+from treestamps.tree.config import TreestampsConfig
+
+
+def bench_load_map(root: Path, entries: dict) -> float:
+    """Time loading entries into a fresh Treestamps."""
+    ts = Treestamps(TreestampsConfig("bench", path=root))
+    start = perf_counter()
+    ts.load_map(root, entries)
+    return perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--depth", type=int, default=DEEP_DEPTH)
+    args = parser.parse_args()
+
+    print(f"depth {args.depth}")
+    print(f"{'entries':>8} {'load s':>8} {'us/entry':>9}")
+    with TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        num_entries = max(args.entries // 8, 1)
+        while num_entries <= args.entries:
+            entries = make_entries(make_deep_paths(num_entries, args.depth))
+            elapsed = bench_load_map(root, entries)
+            per_entry = elapsed / num_entries * 1e6
+            print(f"{num_entries:>8} {elapsed:>8.3f} {per_entry:>9.2f}")
+            num_entries *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark peak memory loading a timestamp file with tracemalloc."""
+
+import tracemalloc
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from benchmarks.trees import make_entries, make_mixed_paths, parse_count
+from treestamps.serializers import FILE_FORMATS, JSONL_FORMAT
+from treestamps.tree import Treestamps
+from treestamps.tree.config import TreestampsConfig
+
+PROGRAM_NAME = "bench"
+MB = 1024 * 1024
+
+
+def write_file(root: Path, num_entries: int, file_format: str) -> Path:
+    """Dump a timestamp file of num_entries entries."""
+    config = TreestampsConfig(PROGRAM_NAME, path=root, file_format=file_format)
+    ts = Treestamps(config)
+    ts.load_map(root, make_entries(make_mixed_paths(num_entries)))
+    ts.dumpf()
+    return ts._dump_path  # noqa: SLF001
+
+
+def bench_loadf(root: Path, path: Path) -> tuple[float, float, float]:
+    """Return the retained and peak MB and seconds to load a file."""
+    ts = Treestamps(TreestampsConfig(PROGRAM_NAME, path=root))
+    tracemalloc.start()
+    start = perf_counter()
+    ts.loadf(path)
+    elapsed = perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if not ts._timestamps:  # noqa: SLF001
+        reason = f"No timestamps loaded from {path}"
+        raise ValueError(reason)
+    return retained / MB, peak / MB, elapsed
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=parse_count, default=2_000_000)
+    parser.add_argument(
+        "--format", choices=sorted(FILE_FORMATS), action="append", dest="formats"
+    )
+    args = parser.parse_args()
+
+    print(f"{args.entries} entries")
+    print(f"{'format':>10} {'file MB':>8} {'store MB':>9} {'peak MB':>8} {'load s':>7}")
+    with TemporaryDirectory() as tmp_dir:
+        for file_format in args.formats or (JSONL_FORMAT,):
+            root = Path(tmp_dir) / file_format
+            root.mkdir()
+            path = write_file(root, args.entries, file_format)
+            size = path.stat().st_size / MB
+            retained, peak, elapsed = bench_loadf(root, path)
+            print(
+                f"{file_format:>10} {size:>8.1f} {retained:>9.1f} {peak:>8.1f}"
+                f" {elapsed:>7.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Benchmark normalizing caller paths, cold and from the path cache."""
+
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from benchmarks.trees import make_mixed_paths
+from treestamps.tree import Treestamps
+from treestamps.tree.config import TreestampsConfig
+
+PROGRAM_NAME = "bench"
+
+
+def bench(ts: Treestamps, paths: list, *, cache: bool) -> float:
+    """Return the microseconds to normalize each path."""
+    root = ts.root_dir
+    start = perf_counter()
+    for path in paths:
+        ts._get_absolute_parts(root, path, cache=cache)  # noqa: SLF001
+    return (perf_counter() - start) / len(paths) * 1e6
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--paths", type=int, default=4000)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        ts = Treestamps(TreestampsConfig(PROGRAM_NAME, path=root))
+        rel_paths = make_mixed_paths(args.paths)
+        kinds = {
+            "rel str": rel_paths,
+            "abs str": [str(root / path) for path in rel_paths],
+            "abs Path": [root / path for path in rel_paths],
+        }
+        print(f"{len(rel_paths)} paths")
+        print(f"{'input':>10} {'cold us':>8} {'cached us':>10}")
+        for name, paths in kinds.items():
+            cold = bench(ts, paths, cache=False)
+            bench(ts, paths, cache=True)
+            cached = bench(ts, paths, cache=True)
+            print(f"{name:>10} {cold:>8.2f} {cached:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
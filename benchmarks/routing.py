@@ -0,0 +1,51 @@
+"""Benchmark finding the tree that holds a path among many roots."""
+
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from treestamps.grove import Grovestamps, GrovestampsConfig
+
+PROGRAM_NAME = "bench"
+
+
+def linear_find(grove: Grovestamps, path: str) -> Path | None:
+    """Find the deepest root by checking every root, as before the index."""
+    abs_path = Path(path).absolute()
+    for top_path in sorted(grove, key=lambda root: len(root.parts), reverse=True):
+        if abs_path.is_relative_to(top_path):
+            return top_path
+    return None
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--paths", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'roots':>6} {'linear us':>10} {'index us':>9}")
+    for num_roots in (1, 10, 100, 500):
+        with TemporaryDirectory() as tmp_dir:
+            roots = [Path(tmp_dir) / f"root{index}" for index in range(num_roots)]
+            for root in roots:
+                root.mkdir()
+            grove = Grovestamps(GrovestampsConfig(PROGRAM_NAME, paths=roots))
+            paths = [
+                str(roots[index % num_roots] / "d" / f"f{index}")
+                for index in range(args.paths)
+            ]
+            start = perf_counter()
+            for path in paths:
+                linear_find(grove, path)
+            linear = (perf_counter() - start) / len(paths) * 1e6
+            start = perf_counter()
+            for path in paths:
+                grove.find_tree(path)
+            indexed = (perf_counter() - start) / len(paths) * 1e6
+            print(f"{num_roots:>6} {linear:>10.2f} {indexed:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Benchmark timestamp file serializers."""
+
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from benchmarks.trees import make_entries, make_paths
+from treestamps.serializers import FILE_FORMATS, get_serializer
+
+PROGRAM_CONFIG = {"config": {"quality": 90}}
+
+
+def make_dump_dict(num_entries: int) -> dict:
+    """Create a dump_dict() style mapping."""
+    data = make_entries(make_paths("mixed", num_entries))
+    data.update(PROGRAM_CONFIG)
+    return data
+
+
+def bench_format(file_format: str, data: dict, path: Path) -> tuple[float, float]:
+    """Time dumping and loading one format."""
+    serializer = get_serializer(file_format)
+    start = perf_counter()
+    serializer.dump(data, path)
+    dump_time = perf_counter() - start
+    start = perf_counter()
+    loaded = serializer.load(path)
+    load_time = perf_counter() - start
+    if not loaded or len(loaded) != len(data):
+        reason = f"{file_format} round trip lost entries"
+        raise ValueError(reason)
+    return dump_time, load_time
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=100_000)
+    args = parser.parse_args()
+
+    data = make_dump_dict(args.entries)
+    print(f"{args.entries} entries")
+    print(f"{'format':<10} {'dump s':>8} {'load s':>8} {'MB':>6}")
+    with TemporaryDirectory() as tmp_dir:
+        for file_format in sorted(FILE_FORMATS):
+            path = Path(tmp_dir) / file_format
+            dump_time, load_time = bench_format(file_format, data, path)
+            size = path.stat().st_size / 1024**2
+            print(f"{file_format:<10} {dump_time:>8.3f} {load_time:>8.3f} {size:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark pickling timestamps for worker processes."""
+
+import pickle
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from benchmarks.trees import make_mixed_paths, parse_count
+from treestamps.tree import Treestamps
+from treestamps.tree.config import TreestampsConfig
+
+PROGRAM_NAME = "bench"
+
+
+def bench(obj: object) -> tuple[int, float, float]:
+    """Return the pickle size and the milliseconds to pickle and unpickle."""
+    start = perf_counter()
+    data = pickle.dumps(obj)
+    dumped = perf_counter()
+    pickle.loads(data)  # noqa: S301
+    loaded = perf_counter()
+    return len(data), (dumped - start) * 1e3, (loaded - dumped) * 1e3
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=parse_count, default=100_000)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        ts = Treestamps(TreestampsConfig(PROGRAM_NAME, path=root))
+        paths = make_mixed_paths(args.entries)
+        ts.set_many(paths, [float(index) for index in range(len(paths))])
+        kinds = {
+            "path dict": {
+                Path(*parts): mtime
+                for parts, mtime in ts._timestamps.iter_parts()  # noqa: SLF001
+            },
+            "snapshot": ts.snapshot(),
+        }
+        print(f"{len(paths)} entries")
+        print(f"{'object':>10} {'bytes':>11} {'dump ms':>8} {'load ms':>8}")
+        for name, obj in kinds.items():
+            size, dump_ms, load_ms = bench(obj)
+            print(f"{name:>10} {size:>11} {dump_ms:>8.1f} {load_ms:>8.1f}")
+        ts.close()
+
+
+if __name__ == "__main__":
+    main()
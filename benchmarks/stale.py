@@ -0,0 +1,93 @@
+"""Benchmark finding files modified after their timestamps."""
+
+import os
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from treestamps.tree import Treestamps
+from treestamps.tree.config import TreestampsConfig
+
+PROGRAM_NAME = "bench"
+FILES_PER_DIR = 100
+
+
+def get_and_stat(ts: Treestamps, entries: list[os.DirEntry]) -> list[os.DirEntry]:
+    """Compare times the way callers did before filter_stale()."""
+    stale = []
+    for entry in entries:
+        timestamp = ts.get(entry.path)
+        if timestamp is None or Path(entry.path).stat().st_mtime > timestamp:
+            stale.append(entry)
+    return stale
+
+
+def walk_get_and_stat(ts: Treestamps) -> list[str]:
+    """Walk and compare times the way the README pattern did."""
+    stale = []
+    for dir_path, _, names in os.walk(ts.root_dir):
+        for name in names:
+            if name.startswith(f".{PROGRAM_NAME}_treestamps"):
+                continue
+            path = os.path.join(dir_path, name)  # noqa: PTH118
+            timestamp = ts.get(path)
+            if timestamp is None or Path(path).stat().st_mtime > timestamp:
+                stale.append(path)
+    return stale
+
+
+def time_walks(ts: Treestamps, label: str) -> None:
+    """Time a walk that checks every file against walk_stale()."""
+    start = perf_counter()
+    before = walk_get_and_stat(ts)
+    walk = perf_counter() - start
+    start = perf_counter()
+    after = list(ts.walk_stale())
+    walked = perf_counter() - start
+    assert len(before) == len(after)
+    print(f"{label}: os.walk() get() stat() {walk:.2f}s, walk_stale() {walked:.2f}s")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=20000)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        ts = Treestamps(TreestampsConfig(PROGRAM_NAME, path=root))
+        for index in range(args.files):
+            path = root / f"d{index // FILES_PER_DIR}" / f"f{index}"
+            path.parent.mkdir(exist_ok=True)
+            path.touch()
+            if index % 10:
+                ts.set(path)
+        entries = [
+            entry
+            for dir_entry in os.scandir(root)
+            if dir_entry.is_dir()
+            for entry in os.scandir(dir_entry.path)
+        ]
+
+        start = perf_counter()
+        before = get_and_stat(ts, entries)
+        loop = (perf_counter() - start) / len(entries) * 1e6
+        start = perf_counter()
+        after = list(ts.filter_stale(entries))
+        filtered = (perf_counter() - start) / len(entries) * 1e6
+        assert len(before) == len(after)
+        print(f"{len(entries)} files, {len(after)} stale")
+        print(f"get() and stat() loop {loop:.2f} us/file")
+        print(f"filter_stale()        {filtered:.2f} us/file")
+        time_walks(ts, "per file timestamps")
+        for dir_entry in os.scandir(root):
+            if dir_entry.is_dir() and not dir_entry.name.endswith("0"):
+                ts.set(dir_entry.path, compact=True)
+        time_walks(ts, "compacted timestamps")
+        ts._close_wal()  # noqa: SLF001
+
+
+if __name__ == "__main__":
+    main()
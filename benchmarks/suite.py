@@ -0,0 +1,245 @@
+"""Benchmark load, get, set, compact, dump and WAL replay across tree shapes."""
+
+import json
+import os
+import platform
+import sys
+from argparse import ArgumentParser
+from collections.abc import Callable
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from benchmarks.trees import (
+    BASE_TIMESTAMP,
+    SHAPES,
+    make_entries,
+    make_paths,
+    parse_count,
+)
+from treestamps.serializers import FILE_FORMATS, JSONL_FORMAT
+from treestamps.tree import Treestamps
+from treestamps.tree.config import TreestampsConfig
+
+PROGRAM_NAME = "bench"
+MAX_SAMPLES = 10_000
+NEWER = BASE_TIMESTAMP * 2
+
+
+class Scenario:
+    """A tree of timestamps on disk to run scenarios against."""
+
+    def __init__(self, root: Path, paths: list[str], file_format: str) -> None:
+        """Dump the tree to disk."""
+        self.root: Path = root
+        self.paths: list[str] = paths
+        self.file_format: str = file_format
+        step = max(len(paths) // MAX_SAMPLES, 1)
+        self.samples: list[str] = paths[::step]
+        ts = self.treestamps()
+        ts.load_map(root, make_entries(paths))
+        ts.dumpf()
+
+    def treestamps(self, **kwargs) -> Treestamps:
+        """Create a Treestamps for the tree."""
+        config = TreestampsConfig(
+            PROGRAM_NAME, path=self.root, file_format=self.file_format, **kwargs
+        )
+        return Treestamps(config)
+
+    def loaded(self) -> Treestamps:
+        """Create and load a Treestamps for the tree."""
+        ts = self.treestamps()
+        ts.loadf_tree()
+        return ts
+
+    def load(self) -> tuple[float, int]:
+        """Time loadf_tree()."""
+        ts = self.treestamps()
+        start = perf_counter()
+        ts.loadf_tree()
+        return perf_counter() - start, len(self.paths)
+
+    def get(self) -> tuple[float, int]:
+        """Time getting sampled paths."""
+        ts = self.loaded()
+        start = perf_counter()
+        for path in self.samples:
+            ts.get(path)
+        return perf_counter() - start, len(self.samples)
+
+    def set(self) -> tuple[float, int]:
+        """Time setting sampled paths, including the WAL."""
+        ts = self.loaded()
+        start = perf_counter()
+        for path in self.samples:
+            ts.set(path, NEWER)
+        elapsed = perf_counter() - start
+        ts._close_wal()  # noqa: SLF001
+        ts._wal_path.unlink()  # noqa: SLF001
+        return elapsed, len(self.samples)
+
+    def get_many(self) -> tuple[float, int]:
+        """Time getting sampled paths in one batch."""
+        ts = self.loaded()
+        start = perf_counter()
+        ts.get_many(self.samples)
+        return perf_counter() - start, len(self.samples)
+
+    def set_many(self) -> tuple[float, int]:
+        """Time setting sampled paths in one batch, including the WAL."""
+        ts = self.loaded()
+        start = perf_counter()
+        ts.set_many(self.samples, NEWER)
+        elapsed = perf_counter() - start
+        ts._close_wal()  # noqa: SLF001
+        ts._wal_path.unlink()  # noqa: SLF001
+        return elapsed, len(self.samples)
+
+    def compact(self) -> tuple[float, int]:
+        """Time compacting the largest top level directory."""
+        ts = self.loaded()
+        top = max(
+            {path.split("/", 1)[0] for path in self.paths if "/" in path},
+            key=lambda top: sum(path.startswith(f"{top}/") for path in self.paths),
+        )
+        (self.root / top).mkdir(exist_ok=True)
+        abs_top = self.root / top
+        ts._timestamps[abs_top] = NEWER  # noqa: SLF001
+        before = len(ts._timestamps)  # noqa: SLF001
+        start = perf_counter()
+        ts.compact(top)
+        elapsed = perf_counter() - start
+        return elapsed, before - len(ts._timestamps)  # noqa: SLF001
+
+    def dump(self) -> tuple[float, int]:
+        """Time dumpf() of a changed tree."""
+        ts = self.loaded()
+        ts._changed = True  # noqa: SLF001
+        start = perf_counter()
+        ts.dumpf()
+        return perf_counter() - start, len(self.paths)
+
+    def wal_replay(self) -> tuple[float, int]:
+        """Time replaying a crashed run's delta WAL on top of the snapshot."""
+        ts = self.treestamps(wal_mode="delta")
+        ts.loadf_tree()
+        for path in self.samples:
+            ts.set(path, NEWER)
+        ts._close_wal()  # noqa: SLF001
+        ts = self.treestamps()
+        ts.loadf(ts._dump_path)  # noqa: SLF001
+        start = perf_counter()
+        ts.loadf(ts._wal_path)  # noqa: SLF001
+        elapsed = perf_counter() - start
+        ts._wal_path.unlink()  # noqa: SLF001
+        return elapsed, len(self.samples)
+
+
+SCENARIOS: dict[str, Callable[[Scenario], tuple[float, int]]] = {
+    "load": Scenario.load,
+    "get": Scenario.get,
+    "set": Scenario.set,
+    "get_many": Scenario.get_many,
+    "set_many": Scenario.set_many,
+    "compact": Scenario.compact,
+    "dump": Scenario.dump,
+    "wal_replay": Scenario.wal_replay,
+}
+
+
+def get_environment() -> dict:
+    """Describe where the benchmark ran."""
+    try:
+        treestamps_version = version("treestamps")
+    except PackageNotFoundError:
+        treestamps_version = "unknown"
+    return {
+        "treestamps": treestamps_version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def run(
+    shapes: list[str], sizes: list[int], file_format: str, scenarios: list[str]
+) -> list[dict]:
+    """Run every scenario on every tree."""
+    results = []
+    for shape in shapes:
+        for size in sizes:
+            paths = make_paths(shape, size)
+            with TemporaryDirectory() as tmp_dir:
+                scenario = Scenario(Path(tmp_dir), paths, file_format)
+                for name in scenarios:
+                    seconds, ops = SCENARIOS[name](scenario)
+                    result = {
+                        "scenario": name,
+                        "shape": shape,
+                        "entries": size,
+                        "format": file_format,
+                        "ops": ops,
+                        "seconds": round(seconds, 6),
+                        "us_per_op": round(seconds / max(ops, 1) * 1e6, 3),
+                    }
+                    print(
+                        f"{name:<10} {shape:<6} {size:>9} {ops:>9} "
+                        f"{seconds:>9.3f} {result['us_per_op']:>9.2f}"
+                    )
+                    results.append(result)
+    return results
+
+
+def _get_key(result: dict) -> tuple:
+    return (result["scenario"], result["shape"], result["entries"], result["format"])
+
+
+def compare(results: list[dict], baseline_path: Path, tolerance: float) -> int:
+    """Print results slower per op than the baseline. Return the count."""
+    baseline = json.loads(baseline_path.read_text())
+    old_results = {_get_key(result): result for result in baseline["results"]}
+    regressions = 0
+    for result in results:
+        old_result = old_results.get(_get_key(result))
+        if not old_result or not old_result["us_per_op"]:
+            continue
+        ratio = result["us_per_op"] / old_result["us_per_op"]
+        if ratio > 1 + tolerance:
+            regressions += 1
+            print(
+                f"REGRESSION {' '.join(map(str, _get_key(result)))}: "
+                f"{old_result['us_per_op']} -> {result['us_per_op']} us/op"
+            )
+    return regressions
+
+
+def main() -> None:
+    """Run the benchmark suite."""
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--shapes", default=",".join(sorted(SHAPES)))
+    parser.add_argument("--sizes", default="10k,100k", help="up to 5M")
+    parser.add_argument("--format", choices=sorted(FILE_FORMATS), default=JSONL_FORMAT)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="JSON results to compare to")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    shapes = args.shapes.split(",")
+    sizes = [parse_count(size) for size in args.sizes.split(",")]
+    scenarios = args.scenarios.split(",")
+    print(
+        f"{'scenario':<10} {'shape':<6} {'entries':>9} {'ops':>9} {'s':>9} {'us/op':>9}"
+    )
+    results = run(shapes, sizes, args.format, scenarios)
+    if args.output:
+        report = {"environment": get_environment(), "results": results}
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.baseline and compare(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
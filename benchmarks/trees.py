@@ -0,0 +1,75 @@
+"""Synthetic tree generators shared by the benchmarks."""
+
+from collections.abc import Callable
+from random import Random
+
+BASE_TIMESTAMP = 1700000000.0
+CONFIG = {"treestamps_config": {"ignore": frozenset(), "symlinks": True}}
+FILES_PER_DIR = 16
+DEEP_DEPTH = 30
+WIDE_DIRS = 1000
+MIXED_MAX_DEPTH = 12
+SEED = 1729
+
+
+def make_wide_paths(num_entries: int) -> list[str]:
+    """Create paths in WIDE_DIRS sibling directories one level deep."""
+    return [f"dir{index % WIDE_DIRS}/file{index}" for index in range(num_entries)]
+
+
+def make_deep_paths(num_entries: int, depth: int = DEEP_DEPTH) -> list[str]:
+    """Create paths in leaf directories of a 4 way tree depth levels deep."""
+    paths = []
+    for index in range(num_entries):
+        leaf = index // FILES_PER_DIR
+        dirs = "/".join(f"d{k}_{(leaf >> (2 * k)) & 3}" for k in range(depth))
+        paths.append(f"{dirs}/file{index}")
+    return paths
+
+
+def make_mixed_paths(num_entries: int) -> list[str]:
+    """Create paths at random depths with random fan out, like a photo library."""
+    rand = Random(SEED)  # noqa: S311
+    paths = []
+    index = 0
+    while index < num_entries:
+        depth = rand.randint(0, MIXED_MAX_DEPTH)
+        dirs = "/".join(f"d{k}_{rand.randint(0, 7 - k // 2)}" for k in range(depth))
+        for _ in range(rand.randint(1, 2 * FILES_PER_DIR)):
+            name = f"file{index}.jpg"
+            paths.append(f"{dirs}/{name}" if dirs else name)
+            index += 1
+            if index >= num_entries:
+                break
+    return paths
+
+
+SHAPES: dict[str, Callable[[int], list[str]]] = {
+    "deep": make_deep_paths,
+    "mixed": make_mixed_paths,
+    "wide": make_wide_paths,
+}
+
+
+def make_paths(shape: str, num_entries: int) -> list[str]:
+    """Create relative paths for a tree shape."""
+    return SHAPES[shape](num_entries)
+
+
+def make_entries(paths: list[str], *, config: bool = True) -> dict:
+    """Create a dump_dict() style mapping of paths to increasing timestamps."""
+    entries: dict = {path: BASE_TIMESTAMP + index for index, path in enumerate(paths)}
+    if config:
+        entries.update(CONFIG)
+    return entries
+
+
+def parse_count(count: str) -> int:
+    """Parse counts like 10k or 5M."""
+    count = count.strip().lower()
+    multiplier = 1
+    if count.endswith("k"):
+        multiplier = 1_000
+    elif count.endswith("m"):
+        multiplier = 1_000_000
+    return int(float(count.rstrip("km")) * multiplier)
@@ -3,7 +3,20 @@
 import shutil
 from pathlib import Path
 
-from tests import TEST_FILES_DIR, get_test_dir
+from tests import PROGRAM, TEST_FILES_DIR, get_test_dir
+from treestamps.stats import Stats
+from treestamps.tree import Treestamps
+from treestamps.tree.config import TreestampsConfig
+
+PROGRAM_NAME = f"{PROGRAM}-tests"
+
+
+def load_treestamps(path: Path, stats: Stats | None = None, **kwargs) -> Treestamps:
+    """Create a tree for the path and load its timestamps."""
+    config = TreestampsConfig(PROGRAM_NAME, path=path, **kwargs)
+    ts = Treestamps(config, stats=stats)
+    ts.loadf_tree()
+    return ts
 
 
 class BaseTestDir:
@@ -24,3 +37,7 @@ class BaseTestDir:
     def teardown_method(self) -> None:
         """Tear down method."""
         shutil.rmtree(self.TMP_ROOT, ignore_errors=True)
+
+    def _treestamps(self, path: Path | None = None, **kwargs) -> Treestamps:
+        """Create and load a tree for the test dir or a path under it."""
+        return load_treestamps(path or self.TMP_ROOT, **kwargs)
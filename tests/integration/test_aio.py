@@ -0,0 +1,81 @@
+"""Test the asyncio facade."""
+
+import asyncio
+
+import pytest
+
+from tests import PROGRAM
+from tests.integration.base_test import BaseTestDir
+from treestamps.aio import AsyncGrovestamps
+from treestamps.grove import GrovestampsConfig
+
+__all__ = ()
+
+PROGRAM_NAME = f"{PROGRAM}-tests"
+PATHS = ("a", "a/b", "c")
+
+
+class TestAsyncGrovestamps(BaseTestDir):
+    """Test the asyncio facade."""
+
+    def _config(self) -> GrovestampsConfig:
+        return GrovestampsConfig(PROGRAM_NAME, paths=(self.TMP_ROOT,))
+
+    @pytest.mark.asyncio
+    async def test_set_get_dump(self) -> None:
+        """Test concurrent sets are batched, readable and dumped."""
+        async with AsyncGrovestamps(self._config()) as agrove:
+            results = await asyncio.gather(
+                *(
+                    agrove.set(self.TMP_ROOT / path, float(index))
+                    for index, path in enumerate(PATHS)
+                )
+            )
+            assert results == [0.0, 1.0, 2.0]
+            assert agrove.get(self.TMP_ROOT / "a/b/x") == 1.0
+            assert agrove.get_many([self.TMP_ROOT / "c", "/outside"]) == [2.0, None]
+            ts = agrove.grove[self.TMP_ROOT]
+            assert ts.wal.entries_written == len(PATHS)
+            await agrove.set(self.TMP_ROOT / "a", 5.0, compact=True)
+            await agrove.dump()
+
+        async with AsyncGrovestamps(self._config()) as agrove:
+            assert agrove.get(self.TMP_ROOT / "a/b") == 5.0  # noqa: PLR2004
+            assert agrove.get(self.TMP_ROOT / "c") == 2.0  # noqa: PLR2004
+
+    @pytest.mark.asyncio
+    async def test_get_during_sets(self) -> None:
+        """Test gets on the event loop run beside sets and compaction."""
+        rounds = 20
+        async with AsyncGrovestamps(self._config()) as agrove:
+            agrove.grove[self.TMP_ROOT]._PATH_CACHE_SIZE = 8
+            paths = [self.TMP_ROOT / f"d{index % 4}/f{index}" for index in range(50)]
+            done = asyncio.Event()
+
+            async def read() -> int:
+                reads = 0
+                while not done.is_set():
+                    agrove.get_many(paths)
+                    reads += 1
+                    await asyncio.sleep(0)
+                return reads
+
+            reader = asyncio.create_task(read())
+            for mtime in range(rounds):
+                await asyncio.gather(
+                    *(agrove.set(path, float(mtime)) for path in paths)
+                )
+                await agrove.set(paths[mtime % 4].parent, float(mtime), compact=True)
+            done.set()
+            assert await reader
+            assert agrove.get_many(paths) == [float(rounds - 1)] * len(paths)
+
+    @pytest.mark.asyncio
+    async def test_not_loaded(self) -> None:
+        """Test using the grove before loading raises."""
+        agrove = AsyncGrovestamps(self._config())
+        with pytest.raises(ValueError, match="load_tree"):
+            agrove.get("a")
+        with pytest.raises(ValueError, match="load_tree"):
+            await agrove.set("a", 1.0)
+        await agrove.aclose()
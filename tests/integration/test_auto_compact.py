@@ -0,0 +1,108 @@
+"""Test automatic compaction."""
+
+from tests.integration.base_test import BaseTestDir
+from treestamps.tree import Treestamps
+
+__all__ = ()
+
+FILES = ("a/x", "a/y", "a/b/z")
+
+
+class TestAutoCompact(BaseTestDir):
+    """Test automatic compaction."""
+
+    def _set_files_then_dir(self, ts: Treestamps) -> None:
+        for path in FILES:
+            ts.set(path, 1.0)
+        ts.set("c", 1.0)
+        ts.set("a", 2.0)
+
+    def test_dumpf(self) -> None:
+        """Test paths set since the last dump are compacted on dump."""
+        ts = self._treestamps(auto_compact=True)
+        self._set_files_then_dir(ts)
+        assert len(ts._timestamps) == len(FILES) + 2
+        assert ts._compact_pending == {(self.TMP_ROOT / "a").parts}
+        ts.dumpf()
+        assert set(ts.dump_dict()) >= {"a", "c"}
+        assert len(ts._timestamps) == 2  # noqa: PLR2004
+        assert ts.get("a/b/z") == 2.0  # noqa: PLR2004
+
+        ts = self._treestamps()
+        assert len(ts._timestamps) == 2  # noqa: PLR2004
+
+    def test_off(self) -> None:
+        """Test nothing is compacted by default."""
+        ts = self._treestamps()
+        self._set_files_then_dir(ts)
+        ts.dumpf()
+        assert len(ts._timestamps) == len(FILES) + 2
+
+    def test_threshold(self) -> None:
+        """Test setting a big directory compacts it right away."""
+        ts = self._treestamps(compact_threshold=2)
+        self._set_files_then_dir(ts)
+        assert len(ts._timestamps) == 2  # noqa: PLR2004
+        assert not ts._compact_pending
+
+    def test_threshold_parent(self) -> None:
+        """Test setting old files in a big directory compacts the directory."""
+        ts = self._treestamps(compact_threshold=2)
+        ts.set("a", 2.0)
+        ts.set("a/x", 1.0)
+        assert len(ts._timestamps) == 2  # noqa: PLR2004
+        ts.set("a/y", 1.0)
+        assert len(ts._timestamps) == 1
+        ts.set("a/x", 3.0)
+        ts.set("a/y", 3.0)
+        assert len(ts._timestamps) == 3  # noqa: PLR2004
+
+    def test_threshold_bulk(self) -> None:
+        """Test a big directory is only compacted again once it has grown."""
+        threshold = 10
+        num_files = 1000
+        ts = self._treestamps(compact_threshold=threshold)
+        ts.set("a", 100.0)
+        calls = []
+        compact_parts = ts._compact_parts
+
+        def count_compact_parts(parts_list) -> int:
+            calls.append(parts_list)
+            return compact_parts(parts_list)
+
+        ts._compact_parts = count_compact_parts
+        for index in range(num_files):
+            ts.set(f"a/f{index}", 50.0 if index % 2 else 200.0)
+        assert len(calls) <= num_files // threshold
+        assert ts.get("a/f1") == 100.0  # noqa: PLR2004
+        assert ts.get("a/f2") == 200.0  # noqa: PLR2004
+
+    def test_merged_children(self) -> None:
+        """Test merging child timestamp files compacts the whole tree."""
+        (self.TMP_ROOT / "a").mkdir()
+        child = self._treestamps(self.TMP_ROOT / "a")
+        child.set("x", 1.0)
+        child.dumpf()
+        parent = self._treestamps()
+        parent.set("a", 2.0)
+        parent.dumpf()
+
+        parent = self._treestamps(auto_compact=True)
+        parent.dumpf()
+        assert len(parent._timestamps) == 1
+        assert not (self.TMP_ROOT / "a" / child._filename).exists()
+
+    def test_shard(self) -> None:
+        """Test compaction rewrites the shards it changed."""
+        ts = self._treestamps(shard="subdir")
+        for path in FILES:
+            ts.set(path, 1.0)
+        ts.dumpf()
+
+        ts = self._treestamps(shard="subdir", auto_compact=True)
+        ts.set("a/b", 2.0)
+        ts.dumpf()
+        ts = self._treestamps(shard="subdir")
+        ts._load_all_shards()
+        assert dict(ts.dump_dict()).keys() >= {"a/x", "a/y", "a/b"}
+        assert "a/b/z" not in ts.dump_dict()
@@ -0,0 +1,104 @@
+"""Test batched get and set."""
+
+import pytest
+
+from tests import PROGRAM
+from tests.integration.base_test import BaseTestDir
+from treestamps.grove import Grovestamps, GrovestampsConfig
+from treestamps.serializers import FILE_FORMATS
+
+__all__ = ()
+
+PROGRAM_NAME = f"{PROGRAM}-tests"
+PATHS = ("a", "a/b", "a/b/c", "a/d", "e")
+
+
+class TestBatch(BaseTestDir):
+    """Test batched get and set."""
+
+    @pytest.mark.parametrize("file_format", sorted(FILE_FORMATS))
+    def test_set_many(self, file_format: str) -> None:
+        """Test batched sets are written to the WAL at once and recovered."""
+        ts = self._treestamps(file_format=file_format)
+        mtimes = [3.0, 1.0, 2.0, 4.0, 5.0]
+        assert ts.set_many(PATHS, mtimes) == mtimes
+        assert ts.set_many(["a", "/outside/x"], 0.0) == [None, None]
+        assert ts.wal.entries_written == len(PATHS)
+        ts._close_wal()
+
+        ts = self._treestamps(file_format=file_format)
+        assert ts.get_many([*PATHS, "a/b/c/f"]) == [3.0, 3.0, 3.0, 4.0, 5.0, 3.0]
+        assert ts.get_many(PATHS) == [ts.get(path) for path in PATHS]
+
+    def test_set_many_now(self) -> None:
+        """Test batched sets default to now."""
+        ts = self._treestamps()
+        first, second = ts.set_many(("a", "b"))
+        assert first
+        assert first == second
+
+    def test_set_many_mismatch(self) -> None:
+        """Test mismatched lengths raise before anything is set."""
+        ts = self._treestamps()
+        with pytest.raises(ValueError, match="mtimes"):
+            ts.set_many(["x", "y"], [1.0, 2.0, 3.0])
+        assert ts.get("x") is None
+        assert not ts._changed
+
+    def test_grove(self) -> None:
+        """Test grove batches are routed to the deepest tree."""
+        outer = self.TMP_ROOT / "outer"
+        inner = outer / "inner"
+        inner.mkdir(parents=True)
+        config = GrovestampsConfig(PROGRAM_NAME, paths=(outer, inner))
+        gs = Grovestamps(config)
+        paths = (outer / "a", inner / "b", self.TMP_ROOT / "c")
+        assert gs.set_many(paths, [1.0, 2.0, 3.0]) == [1.0, 2.0, None]
+        assert gs[inner].get("b") == 2.0  # noqa: PLR2004
+        assert gs[outer].get("inner/b") is None
+        assert gs.get_many(paths) == [1.0, 2.0, None]
+        with pytest.raises(ValueError, match="mtimes"):
+            gs.set_many(paths, [1.0])
+
+    def test_grove_set(self) -> None:
+        """Test single grove sets and gets find the deepest tree."""
+        outer = self.TMP_ROOT / "outer"
+        inner = outer / "inner"
+        inner.mkdir(parents=True)
+        config = GrovestampsConfig(PROGRAM_NAME, paths=(outer, inner))
+        gs = Grovestamps(config)
+        assert gs.find_tree(inner / "b") is gs[inner]
+        assert gs.find_tree(str(outer / "a")) is gs[outer]
+        assert gs.find_tree(self.TMP_ROOT) is None
+
+        assert gs.set_path(inner / "b", 2.0) == 2.0  # noqa: PLR2004
+        assert gs.set_path(str(outer / "a"), mtime=1.0) == 1.0
+        assert gs.set_path(self.TMP_ROOT / "c", 3.0) is None
+        assert gs.set(outer, outer / "d", 4.0) == 4.0  # noqa: PLR2004
+        assert gs.set(outer, path=outer / "f", mtime=6.0) == 6.0  # noqa: PLR2004
+        assert gs.set(top_path=outer, path=outer / "g") is not None
+        assert gs[inner].get("b") == 2.0  # noqa: PLR2004
+        assert gs.get_timestamp(inner / "b") == 2.0  # noqa: PLR2004
+        assert gs.get_timestamp(outer / "d") == 4.0  # noqa: PLR2004
+        assert gs.get_timestamp(self.TMP_ROOT / "c") is None
+        assert gs.get(inner) is gs[inner]
+
+        gs.load(inner, {**gs[inner]._get_dumpable_program_config(), "e": 5.0})
+        assert gs[inner].get("e") == 5.0  # noqa: PLR2004
+        with pytest.raises(ValueError, match="not relative"):
+            gs.load(self.TMP_ROOT, {"e": 5.0})
+
+    def test_grove_relative_root(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test paths are routed to trees configured with relative roots."""
+        (self.TMP_ROOT / "a" / "sub").mkdir(parents=True)
+        monkeypatch.chdir(self.TMP_ROOT)
+        config = GrovestampsConfig(PROGRAM_NAME, paths=("a",))
+        gs = Grovestamps(config)
+        top_path = next(iter(gs))
+        assert gs.find_tree("a/b") is gs[top_path]
+        assert gs.find_tree(self.TMP_ROOT / "a" / "b") is gs[top_path]
+        assert gs.set_many(["a/b", "c"], 1.0) == [1.0, None]
+        assert gs.get_timestamp(self.TMP_ROOT / "a" / "b") == 1.0
+        assert gs.get_many(["a/b"]) == [1.0]
+        gs.load("a/sub", {**gs[top_path]._get_dumpable_program_config(), "e": 2.0})
+        assert gs.get_timestamp("a/sub/e") == 2.0  # noqa: PLR2004
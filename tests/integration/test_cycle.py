@@ -4,9 +4,13 @@ import shutil
 from pathlib import Path
 from types import MappingProxyType
 
+import pytest
+
 from tests import PROGRAM
 from tests.integration.base_test import BaseTestDir
 from treestamps.grove import Grovestamps, GrovestampsConfig
+from treestamps.tree import Treestamps
+from treestamps.tree.config import TreestampsConfig
 
 __all__ = ()
 
@@ -103,3 +107,10 @@ class TestCycle(BaseTestDir):
         _ = shutil.copy(TS_FILE_SOURCE, root_ts_path)
         print(root_ts_path.read_text())
         self._load(config, subpaths, times)
+
+    def test_dumpf_noop_deprecated(self) -> None:
+        """Test the dumpf(noop) warning points at the caller."""
+        ts = Treestamps(TreestampsConfig(PROGRAM_NAME, path=self.TMP_ROOT))
+        with pytest.warns(DeprecationWarning, match="noop") as record:
+            ts.dumpf(noop=True)
+        assert record[0].filename == __file__
@@ -0,0 +1,165 @@
+"""Test file formats."""
+
+import pytest
+
+from tests import PROGRAM
+from tests.integration.base_test import BaseTestDir
+from treestamps.serializers import FILE_FORMATS, get_serializer
+from treestamps.tree import Treestamps
+from treestamps.tree.config import TreestampsConfig
+
+__all__ = ()
+
+PROGRAM_NAME = f"{PROGRAM}-tests"
+PROGRAM_CONFIG = {"a": (3, 1), "b": frozenset({"x"}), "c": {"d": True}}
+NAMES = ("file", "test: name", "it's", "dir/file", '"quoted"')
+
+
+class TestFormats(BaseTestDir):
+    """Test file formats."""
+
+    def _treestamps(
+        self, file_format: str, *, load: bool = True, **kwargs
+    ) -> Treestamps:
+        config = TreestampsConfig(
+            PROGRAM_NAME,
+            path=self.TMP_ROOT,
+            file_format=file_format,
+            ignore=("*.tmp",),
+            program_config=PROGRAM_CONFIG,
+            program_config_keys=PROGRAM_CONFIG.keys(),
+            **kwargs,
+        )
+        ts = Treestamps(config)
+        if load:
+            ts.loadf_tree()
+        return ts
+
+    def _set(self, ts: Treestamps) -> dict[str, float]:
+        return {name: ts.set(name, float(index)) for index, name in enumerate(NAMES)}  # pyright: ignore[reportReturnType]
+
+    @pytest.mark.parametrize("file_format", sorted(FILE_FORMATS))
+    def test_dump_load(self, file_format: str) -> None:
+        """Test round trip through the dump file."""
+        ts = self._treestamps(file_format)
+        times = self._set(ts)
+        ts.dumpf()
+        assert not (self.TMP_ROOT / ts._wal_filename).exists()
+
+        ts = self._treestamps(file_format)
+        for name, mtime in times.items():
+            assert ts.get(name) == mtime
+
+    @pytest.mark.parametrize("file_format", sorted(FILE_FORMATS))
+    def test_wal_recovery(self, file_format: str) -> None:
+        """Test recovering from the wal without a dump."""
+        ts = self._treestamps(file_format)
+        times = self._set(ts)
+        ts._close_wal()
+        assert (self.TMP_ROOT / ts._wal_filename).exists()
+
+        ts = self._treestamps(file_format)
+        for name, mtime in times.items():
+            assert ts.get(name) == mtime
+
+    @pytest.mark.parametrize("file_format", sorted(FILE_FORMATS))
+    def test_delta_wal_recovery(self, file_format: str) -> None:
+        """Test recovering from a delta wal on top of the snapshot."""
+        ts = self._treestamps(file_format, wal_mode="delta")
+        times = self._set(ts)
+        ts.dumpf()
+        generation = ts._generations[ts.root_dir]
+
+        ts = self._treestamps(file_format, wal_mode="delta")
+        assert ts._generations[ts.root_dir] == generation
+        ts.set("new", 100.0)
+        ts._close_wal()
+        wal_text = (self.TMP_ROOT / ts._wal_filename).read_text()
+        assert generation in wal_text
+        assert "file" not in wal_text
+
+        ts = self._treestamps(file_format, wal_mode="delta")
+        for name, mtime in times.items():
+            assert ts.get(name) == mtime
+        assert ts.get("new") == 100.0  # noqa: PLR2004
+
+    @pytest.mark.parametrize("file_format", sorted(FILE_FORMATS))
+    def test_metadata_names(self, file_format: str) -> None:
+        """Test paths named like metadata keep their timestamps."""
+        ts = self._treestamps(file_format, wal_mode="delta")
+        ts.set("generation", 1.0)
+        ts.set("wal_base", 2.0)
+        ts.dumpf()
+
+        ts = self._treestamps(file_format, wal_mode="delta")
+        assert ts.get("generation") == 1.0
+        assert ts.get("wal_base") == 2.0  # noqa: PLR2004
+        ts.set("wal_base", 3.0)
+        ts._close_wal()
+
+        ts = self._treestamps(file_format, wal_mode="delta")
+        assert ts.get("generation") == 1.0
+        assert ts.get("wal_base") == 3.0  # noqa: PLR2004
+        assert ts._generations[ts.root_dir]
+
+    @pytest.mark.parametrize(
+        "metadata", ["bad", {"generation": 5, "wal_base": ["x"], "other": "y"}]
+    )
+    @pytest.mark.parametrize("file_format", sorted(FILE_FORMATS))
+    def test_invalid_metadata(self, file_format: str, metadata) -> None:
+        """Test metadata of the wrong type is ignored."""
+        ts = self._treestamps(file_format, load=False)
+        yaml = ts._get_dumpable_program_config()
+        yaml["file"] = 1.0
+        yaml[ts._METADATA_TAG] = metadata
+        path = self.TMP_ROOT / ts._filename
+        path.write_text(get_serializer(file_format).dumps(yaml))
+
+        ts = self._treestamps(file_format)
+        assert ts.get("file") == 1.0
+        assert ts.root_dir not in ts._generations
+
+    @pytest.mark.parametrize(
+        ("dump_format", "load_format"), [("jsonl", "yaml"), ("yaml", "jsonl")]
+    )
+    def test_auto_detect(self, dump_format: str, load_format: str) -> None:
+        """Test reading files written in another format."""
+        ts = self._treestamps(dump_format)
+        times = self._set(ts)
+        ts.dumpf()
+
+        ts = self._treestamps(load_format)
+        for name, mtime in times.items():
+            assert ts.get(name) == mtime
+
+    def test_bad_format(self) -> None:
+        """Test unknown formats are rejected."""
+        with pytest.raises(ValueError, match="file_format"):
+            TreestampsConfig(PROGRAM_NAME, file_format="xml")
+
+    @pytest.mark.parametrize("config_first", [True, False])
+    @pytest.mark.parametrize("file_format", sorted(FILE_FORMATS))
+    def test_stream_load(self, file_format: str, *, config_first: bool) -> None:
+        """Test streaming files with the config before or after the entries."""
+        ts = self._treestamps(file_format, load=False)
+        config = ts._get_dumpable_program_config()
+        entries = {name: float(index) for index, name in enumerate(NAMES)}
+        yaml = {**config, **entries} if config_first else {**entries, **config}
+        serializer = get_serializer(file_format)
+        text = serializer.dumps(yaml)
+        text += serializer.WAL_HEADER
+        text += serializer.dump_wal_entries([("file", 10.0), ("new", 11.0)])
+        path = self.TMP_ROOT / ts._filename
+        path.write_text(text)
+
+        ts = self._treestamps(file_format, load=False)
+        ts._LOAD_CHUNK_SIZE = 2
+        ts.loadf(path)
+        assert ts.get("file") == 10.0  # noqa: PLR2004
+        assert ts.get("new") == 11.0  # noqa: PLR2004
+        for name in NAMES[1:]:
+            assert ts.get(name) == entries[name]
+
+        ts = Treestamps(TreestampsConfig(PROGRAM_NAME, path=self.TMP_ROOT))
+        ts.loadf(path)
+        assert not ts._timestamps
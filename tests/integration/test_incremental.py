@@ -0,0 +1,82 @@
+"""Test incremental dumps."""
+
+from tests import PROGRAM
+from tests.integration.base_test import BaseTestDir
+from treestamps.tree import Treestamps
+from treestamps.tree.config import TreestampsConfig
+
+__all__ = ()
+
+PROGRAM_NAME = f"{PROGRAM}-tests"
+
+
+class TestIncremental(BaseTestDir):
+    """Test incremental dumps."""
+
+    def _treestamps(self, **kwargs) -> Treestamps:
+        config = TreestampsConfig(
+            PROGRAM_NAME, path=self.TMP_ROOT, dump_mode="incremental", **kwargs
+        )
+        ts = Treestamps(config)
+        ts.loadf_tree()
+        return ts
+
+    def _segments(self) -> list[str]:
+        return sorted(path.name for path in self.TMP_ROOT.glob("*.delta.yaml"))
+
+    def test_segments(self) -> None:
+        """Test later dumps only write changes to segments."""
+        ts = self._treestamps()
+        ts.set("a", 1.0)
+        ts.dumpf()
+        main_text = ts._dump_path.read_text()
+        assert not self._segments()
+
+        ts.set("b", 2.0)
+        ts.dumpf()
+        ts.dumpf()
+        assert ts._dump_path.read_text() == main_text
+        assert len(self._segments()) == 1
+        assert not ts._wal_path.exists()
+
+        ts = self._treestamps()
+        ts.set("c", 3.0)
+        ts.dumpf()
+        generation = ts._generations[ts.root_dir]
+        assert self._segments() == [
+            ts.get_segment_filename(PROGRAM_NAME, generation, seq) for seq in (0, 1)
+        ]
+
+        ts = self._treestamps()
+        assert (ts.get("a"), ts.get("b"), ts.get("c")) == (1.0, 2.0, 3.0)
+
+    def test_compaction(self) -> None:
+        """Test segments past the limit are compacted into the main file."""
+        ts = self._treestamps(segment_limit=2)
+        ts.set("a", 1.0)
+        ts.dumpf()
+        generation = ts._generations[ts.root_dir]
+        for index in range(3):
+            ts.set(str(index), float(index))
+            ts.dumpf()
+        ts._join_compaction()
+        assert not self._segments()
+        assert ts._generations[ts.root_dir] != generation
+
+        ts = self._treestamps()
+        assert [ts.get(str(index)) for index in range(3)] == [0.0, 1.0, 2.0]
+
+    def test_wal_recovery(self) -> None:
+        """Test a recovered wal is saved before it is removed."""
+        ts = self._treestamps()
+        ts.set("a", 1.0)
+        ts.dumpf()
+        ts.set("b", 2.0)
+        ts._close_wal()
+
+        ts = self._treestamps()
+        ts.dumpf()
+        assert not ts._wal_path.exists()
+
+        ts = self._treestamps()
+        assert ts.get("b") == 2.0  # noqa: PLR2004
@@ -0,0 +1,77 @@
+"""Test loading trees of timestamp files."""
+
+import pytest
+
+from tests.integration.base_test import PROGRAM_NAME, BaseTestDir
+from treestamps.grove import Grovestamps, GrovestampsConfig
+
+__all__ = ()
+
+SUBDIRS = ("a", "a/b", "a/b/c", "d", "d/e", "ignored", "d/ignored")
+
+
+class TestLoadTree(BaseTestDir):
+    """Test loading trees of timestamp files."""
+
+    def _make_tree(self) -> None:
+        for index, subdir in enumerate(SUBDIRS):
+            path = self.TMP_ROOT / subdir
+            path.mkdir(parents=True)
+            (path / "file").touch()
+            ts = self._treestamps(path, ignore=("ignored",))
+            ts.set("file", float(index))
+            ts.dumpf()
+        (self.TMP_ROOT / "link").symlink_to(self.TMP_ROOT / "a")
+
+    @pytest.mark.parametrize("scan_workers", [1, 4])
+    def test_consume_children(self, scan_workers: int) -> None:
+        """Test serial and parallel walks consume the same files."""
+        self._make_tree()
+        ts = self._treestamps(ignore=("ignored",), scan_workers=scan_workers)
+        expected = {
+            self.TMP_ROOT / subdir / ts._filename
+            for subdir in SUBDIRS
+            if "ignored" not in subdir
+        }
+        expected |= {
+            self.TMP_ROOT / "link" / subpath.relative_to(self.TMP_ROOT / "a")
+            for subpath in expected
+            if subpath.is_relative_to(self.TMP_ROOT / "a")
+        }
+        assert ts._consumed_paths == expected
+        for index, subdir in enumerate(SUBDIRS):
+            expected_ts = None if "ignored" in subdir else float(index)
+            assert ts.get(f"{subdir}/file") == expected_ts
+        assert ts.is_ignored(self.TMP_ROOT / "d" / "ignored")
+        assert not ts.is_ignored("d/e")
+
+    @pytest.mark.parametrize("scan_workers", [1, 4])
+    def test_no_symlinks(self, scan_workers: int) -> None:
+        """Test symlinked directories are not walked."""
+        self._make_tree()
+        ts = self._treestamps(
+            ignore=("ignored",), scan_workers=scan_workers, symlinks=False
+        )
+        assert not any(
+            path.is_relative_to(self.TMP_ROOT / "link") for path in ts._consumed_paths
+        )
+
+
+class TestLoadGrove(BaseTestDir):
+    """Test loading groves of trees."""
+
+    @pytest.mark.parametrize("tree_workers", [1, 4])
+    def test_tree_workers(self, tree_workers: int) -> None:
+        """Test serial and parallel loading build the same grove."""
+        roots = [self.TMP_ROOT / name for name in ("c", "a", "b")]
+        for index, root in enumerate(roots):
+            root.mkdir(parents=True)
+            ts = self._treestamps(root)
+            ts.set("file", float(index))
+            ts.dumpf()
+
+        config = GrovestampsConfig(PROGRAM_NAME, paths=roots, tree_workers=tree_workers)
+        gs = Grovestamps(config)
+        assert list(gs) == sorted(roots)
+        for index, root in enumerate(roots):
+            assert gs[root].get("file") == float(index)
@@ -0,0 +1,150 @@
+"""Test many processes writing the same tree."""
+
+from multiprocessing import get_context
+from pathlib import Path
+from threading import Thread, Timer
+
+import pytest
+
+from tests import PROGRAM
+from tests.integration.base_test import BaseTestDir, load_treestamps
+from treestamps.lock import FileLock
+from treestamps.tree import Treestamps
+from treestamps.tree.config import TreestampsConfig
+
+__all__ = ()
+
+PROGRAM_NAME = f"{PROGRAM}-tests"
+NUM_WORKERS = 4
+PATHS_PER_WORKER = 50
+
+
+def _work(root: Path, worker: int) -> None:
+    ts = load_treestamps(root, multi_writer=True)
+    for index in range(PATHS_PER_WORKER):
+        ts.set(f"w{worker}/f{index}", float(worker * PATHS_PER_WORKER + index))
+    ts.dumpf()
+
+
+class TestMultiWriter(BaseTestDir):
+    """Test many processes writing the same tree."""
+
+    def _treestamps(self, path: Path | None = None, **kwargs) -> Treestamps:
+        return super()._treestamps(path, multi_writer=True, **kwargs)
+
+    def _writer_wals(self) -> list[Path]:
+        return sorted(self.TMP_ROOT.glob(f".{PROGRAM_NAME}_treestamps.wal-*.yaml"))
+
+    def test_interleaved(self) -> None:
+        """Test writers keep their own WALs and merge each other's dumps."""
+        a = self._treestamps(writer_id="a")
+        b = self._treestamps(writer_id="b")
+        a.set("x", 1.0)
+        b.set("y", 2.0)
+        assert len(self._writer_wals()) == 2  # noqa: PLR2004
+
+        a.dumpf()
+        assert [path.name for path in self._writer_wals()] == [b._wal_path.name]
+        b.dumpf()
+        assert not self._writer_wals()
+
+        ts = self._treestamps(writer_id="c")
+        assert ts.get("x") == 1.0
+        assert ts.get("y") == 2.0  # noqa: PLR2004
+
+    def test_recover_crashed_writer(self) -> None:
+        """Test a dead writer's WAL is merged and removed by the next dump."""
+        a = self._treestamps(writer_id="a")
+        a.set("x", 1.0)
+        a._close_wal()
+
+        b = self._treestamps(writer_id="b")
+        assert b.get("x") == 1.0
+        b.dumpf()
+        assert not self._writer_wals()
+        assert self._treestamps().get("x") == 1.0
+
+    def test_same_writer_id(self) -> None:
+        """Test two live writers can not share a WAL."""
+        a = self._treestamps(writer_id="a", wal_durability="flush")
+        a.set("x", 1.0)
+        b = self._treestamps(writer_id="a")
+        b.wal._LOCK_WAIT = 0.1
+        with pytest.raises(ValueError, match="in use"):
+            b.set("y", 1.0)
+        a.set("z", 2.0)
+        a._close_wal()
+
+        # The second writer didn't truncate the live WAL.
+        c = self._treestamps(writer_id="c")
+        assert c.get("x") == 1.0
+        assert c.get("z") == 2.0  # noqa: PLR2004
+        assert c.get("y") is None
+
+    def test_load_during_dump(self) -> None:
+        """Test loading waits for a dump and the dump replaces the main file."""
+        b = self._treestamps(writer_id="b")
+        b.set("x", 1.0)
+        b.dumpf()
+        inode = b._dump_path.stat().st_ino
+        b.set("y", 2.0)
+        b.dumpf()
+        assert b._dump_path.stat().st_ino != inode
+
+        # Another writer's dump is in progress and the main file is empty.
+        lock = FileLock(b._lock_path)
+        lock.acquire()
+        text = b._dump_path.read_text()
+        b._dump_path.write_text("")
+        loaded = []
+        thread = Thread(target=lambda: loaded.append(self._treestamps(writer_id="a")))
+        thread.start()
+        thread.join(0.2)
+        assert thread.is_alive()
+        b._dump_path.write_text(text)
+        lock.release()
+        thread.join()
+
+        a = loaded[0]
+        assert a.get("y") == 2.0  # noqa: PLR2004
+        a.set("z", 3.0)
+        a.dumpf()
+        ts = self._treestamps(writer_id="c")
+        assert ts.get("x") == 1.0
+        assert ts.get("y") == 2.0  # noqa: PLR2004
+        assert ts.get("z") == 3.0  # noqa: PLR2004
+
+    def test_wal_probed_by_cleanup(self) -> None:
+        """Test opening a WAL waits out another writer's cleanup probe."""
+        a = self._treestamps(writer_id="a")
+        probe = FileLock(a._wal_path)
+        probe.acquire()
+
+        def cleanup() -> None:
+            a._wal_path.unlink()
+            probe.release()
+
+        Timer(0.1, cleanup).start()
+        a.set("x", 1.0)
+        a._close_wal()
+        assert self._treestamps(writer_id="c").get("x") == 1.0
+
+    def test_processes(self) -> None:
+        """Test worker processes don't lose each other's timestamps."""
+        with get_context("spawn").Pool(NUM_WORKERS) as pool:
+            pool.starmap(
+                _work, [(self.TMP_ROOT, worker) for worker in range(NUM_WORKERS)]
+            )
+        ts = self._treestamps()
+        for worker in range(NUM_WORKERS):
+            for index in range(PATHS_PER_WORKER):
+                expected = float(worker * PATHS_PER_WORKER + index)
+                assert ts.get(f"w{worker}/f{index}") == expected
+        assert not self._writer_wals()
+
+    def test_config(self) -> None:
+        """Test invalid multi writer configs raise."""
+        with pytest.raises(ValueError, match="multi_writer"):
+            TreestampsConfig(PROGRAM_NAME, multi_writer=True, shard="hash")
+        with pytest.raises(ValueError, match="writer_id"):
+            TreestampsConfig(PROGRAM_NAME, writer_id="a/b")
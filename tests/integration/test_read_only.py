@@ -0,0 +1,83 @@
+"""Test read only trees backed by the index."""
+
+from pathlib import Path
+
+import pytest
+
+from tests.integration.base_test import BaseTestDir
+
+__all__ = ()
+
+TIMES = {"a": 1.0, "a/b": 3.0, "a/b/c": 2.0, "d/e": 4.0}
+
+
+class TestReadOnly(BaseTestDir):
+    """Test read only trees backed by the index."""
+
+    def _dump_times(self, path=None, **kwargs) -> None:
+        ts = self._treestamps(path, **kwargs)
+        for name, mtime in TIMES.items():
+            ts.set(name, mtime)
+        ts.dumpf()
+
+    def test_read_only(self) -> None:
+        """Test gets are answered from the mapped index."""
+        self._dump_times(index=True)
+        ts = self._treestamps(read_only=True)
+        assert ts._index is not None
+        assert not ts._timestamps
+        assert ts.get("a/b/c") == 3.0  # noqa: PLR2004
+        assert ts.get("d/e/f") == 4.0  # noqa: PLR2004
+        assert ts.get("x") is None
+        with pytest.raises(ValueError, match="read only"):
+            ts.set("a", 5.0)
+        ts.dumpf()
+        ts.close()
+
+    def test_parent_overlay(self) -> None:
+        """Test parent timestamps apply on top of the index."""
+        sub = self.TMP_ROOT / "sub"
+        sub.mkdir()
+        parent = self._treestamps()
+        parent.set("sub", 10.0)
+        parent.dumpf()
+        self._dump_times(path=sub, index=True)
+        ts = self._treestamps(path=sub, read_only=True)
+        assert ts._index is not None
+        assert ts.get("a") == 10.0  # noqa: PLR2004
+
+    def test_stale_index(self) -> None:
+        """Test read only trees load normally without a current index."""
+        self._dump_times(index=True)
+        ts = self._treestamps()
+        ts.set("new", 5.0)
+        ts.dumpf()
+        assert not ts._index_path.exists()
+
+        ts = self._treestamps(read_only=True)
+        assert ts._index is None
+        assert ts.get("new") == 5.0  # noqa: PLR2004
+
+    def test_no_index_unlink(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test dumps without an index only remove one known to exist."""
+        self._dump_times(index=True)
+        ts = self._treestamps()
+        unlinked = []
+        unlink = Path.unlink
+
+        def _unlink(path: Path, *, missing_ok: bool = False) -> None:
+            unlinked.append(path)
+            unlink(path, missing_ok=missing_ok)
+
+        monkeypatch.setattr(Path, "unlink", _unlink)
+        ts.set("new", 5.0)
+        ts.dumpf()
+        ts.set("new", 6.0)
+        ts.dumpf()
+        assert unlinked.count(ts._index_path) == 1
+        assert not ts._index_path.exists()
+
+        ts = self._treestamps()
+        ts.set("new", 7.0)
+        ts.dumpf()
+        assert unlinked.count(ts._index_path) == 1
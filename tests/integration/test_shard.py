@@ -0,0 +1,106 @@
+"""Test sharded timestamp files."""
+
+import pytest
+
+from tests import PROGRAM
+from tests.integration.base_test import BaseTestDir
+from treestamps.tree import Treestamps
+from treestamps.tree.config import TreestampsConfig
+
+__all__ = ()
+
+PROGRAM_NAME = f"{PROGRAM}-tests"
+TIMES = {"top": 1.0, "a/x": 2.0, "a/b/y": 3.0, "c/z": 4.0}
+
+
+class TestShard(BaseTestDir):
+    """Test sharded timestamp files."""
+
+    def _shard_path(self, key: str):
+        return self.TMP_ROOT / Treestamps.get_shard_filename(PROGRAM_NAME, key)
+
+    def _dump_times(self, **kwargs) -> None:
+        ts = self._treestamps(**kwargs)
+        for path, mtime in TIMES.items():
+            ts.set(path, mtime)
+        ts.dumpf()
+
+    def test_subdir(self) -> None:
+        """Test subdir shards load lazily and only changed shards are written."""
+        self._dump_times(shard="subdir")
+        assert self._shard_path("a").is_file()
+        assert self._shard_path("c").is_file()
+        c_stat = self._shard_path("c").stat()
+
+        ts = self._treestamps(shard="subdir")
+        assert ts._shards_loaded == {""}
+        assert ts.get("top") == TIMES["top"]
+        assert ts.get("a/b/y") == TIMES["a/b/y"]
+        assert ts._shards_loaded == {"", "a"}
+        ts.set("a/new", 5.0)
+        ts.dumpf()
+        assert self._shard_path("c").stat().st_mtime_ns == c_stat.st_mtime_ns
+
+        ts = self._treestamps(shard="subdir")
+        for path, mtime in {**TIMES, "a/new": 5.0}.items():
+            assert ts.get(path) == mtime
+
+    @pytest.mark.parametrize("shard_workers", [1, 4])
+    def test_hash(self, shard_workers: int) -> None:
+        """Test hash shards round trip."""
+        self._dump_times(shard="hash", shard_count=2, shard_workers=shard_workers)
+        assert len(list(self.TMP_ROOT.glob("*.shard-*.yaml"))) <= 2  # noqa: PLR2004
+
+        ts = self._treestamps(shard="hash", shard_count=2)
+        for path, mtime in TIMES.items():
+            assert ts.get(path) == mtime
+
+    def test_change_layout(self) -> None:
+        """Test changing the shard layout rewrites every shard."""
+        self._dump_times()
+        ts = self._treestamps(shard="subdir")
+        ts.set("c/new", 5.0)
+        ts.dumpf()
+        assert self._shard_path("a").is_file()
+
+        self._treestamps().dumpf()
+        assert not self._shard_path("a").exists()
+        ts = self._treestamps()
+        for path, mtime in {**TIMES, "c/new": 5.0}.items():
+            assert ts.get(path) == mtime
+
+    def test_parent_shard(self) -> None:
+        """Test a subtree loads its timestamps from a sharded parent."""
+        self._dump_times(shard="subdir")
+        (self.TMP_ROOT / "a").mkdir()
+        ts = self._treestamps(self.TMP_ROOT / "a")
+        assert ts.get("b/y") == TIMES["a/b/y"]
+
+    def test_shards_name(self) -> None:
+        """Test a path named like the layout metadata keeps its timestamp."""
+        ts = self._treestamps(shard="subdir")
+        ts.set("shards", 1.0)
+        ts.set("shards/x", 2.0)
+        ts.dumpf()
+
+        ts = self._treestamps(shard="subdir")
+        assert ts._shard_layouts[ts.root_dir] == "subdir"
+        assert ts.get("shards") == 1.0
+        assert ts.get("shards/x") == 2.0  # noqa: PLR2004
+
+    def test_invalid_layout(self) -> None:
+        """Test an unknown shard layout is ignored."""
+        ts = self._treestamps(shard="subdir")
+        yaml = ts._get_dumpable_program_config()
+        yaml["top"] = 1.0
+        ts._set_metadata(yaml, ts._SHARDS_TAG, "bogus")
+        ts._serializer.dump(yaml, ts._dump_path)
+
+        ts = self._treestamps(shard="subdir")
+        assert ts.root_dir not in ts._shard_layouts
+        assert ts.get("top") == 1.0
+
+    def test_incremental(self) -> None:
+        """Test shards can not be combined with incremental dumps."""
+        with pytest.raises(ValueError, match="shard"):
+            TreestampsConfig(PROGRAM_NAME, shard="hash", dump_mode="incremental")
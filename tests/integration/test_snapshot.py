@@ -0,0 +1,88 @@
+"""Test sharing loaded timestamps with worker processes."""
+
+import pickle
+from multiprocessing import get_context
+from pathlib import Path
+
+from tests import PROGRAM
+from tests.integration.base_test import BaseTestDir
+from treestamps import Grovestamps, GrovestampsConfig
+from treestamps.grove import GrovestampsSnapshot
+from treestamps.tree import Treestamps
+
+__all__ = ()
+
+PROGRAM_NAME = f"{PROGRAM}-tests"
+TIMES = {"a": 1.0, "a/b": 3.0, "a/b/c": 2.0, "d/e": 4.0}
+NUM_WORKERS = 2
+PATHS_PER_WORKER = 20
+
+
+def _work(snapshot: GrovestampsSnapshot, root: Path, worker: int) -> list:
+    assert snapshot.get(root / "a" / "b" / "c") == 3.0  # noqa: PLR2004
+    for index in range(PATHS_PER_WORKER):
+        snapshot.set(root / f"w{worker}" / f"f{index}", float(index))
+    return snapshot.take_sets()
+
+
+class TestSnapshot(BaseTestDir):
+    """Test sharing loaded timestamps with worker processes."""
+
+    def _grove(self) -> Grovestamps:
+        config = GrovestampsConfig(PROGRAM_NAME, paths=(self.TMP_ROOT,))
+        return Grovestamps(config)
+
+    def _set_times(self, ts: Treestamps) -> None:
+        for name, mtime in TIMES.items():
+            ts.set(name, mtime)
+
+    def test_tree_snapshot(self) -> None:
+        """Test a pickled snapshot answers like the tree."""
+        ts = self._treestamps()
+        self._set_times(ts)
+        snapshot = pickle.loads(pickle.dumps(ts.snapshot()))  # noqa: S301
+        assert len(snapshot) == len(TIMES)
+        for name in (*TIMES, "a/b/c/f", "d/e/f", "x"):
+            assert snapshot.get(name) == ts.get(name)
+        assert snapshot.get("/elsewhere") is None
+
+        assert snapshot.set("a/b/c", 1.0) is None
+        assert snapshot.set("a/b/c", 5.0) == 5.0  # noqa: PLR2004
+        assert snapshot.get("a/b/c/f") == 5.0  # noqa: PLR2004
+        sets = snapshot.take_sets()
+        assert sets == [(str(self.TMP_ROOT / "a/b/c"), 5.0)]
+        assert not snapshot.take_sets()
+
+        ts.apply_sets(sets)
+        assert ts.get("a/b/c/f") == 5.0  # noqa: PLR2004
+
+    def test_read_only_snapshot(self) -> None:
+        """Test a read only tree snapshots its index without loading it."""
+        ts = self._treestamps(index=True)
+        self._set_times(ts)
+        ts.dumpf()
+        ts = self._treestamps(read_only=True)
+        assert not ts._timestamps
+        snapshot = ts.snapshot()
+        assert snapshot.get("a/b/c") == 3.0  # noqa: PLR2004
+        assert snapshot.get("d/e/f") == 4.0  # noqa: PLR2004
+
+    def test_processes(self) -> None:
+        """Test workers get from a grove snapshot and return their sets."""
+        grove = self._grove()
+        self._set_times(grove[self.TMP_ROOT])
+        snapshot = grove.snapshot()
+        with get_context("spawn").Pool(NUM_WORKERS) as pool:
+            results = pool.starmap(
+                _work,
+                [(snapshot, self.TMP_ROOT, worker) for worker in range(NUM_WORKERS)],
+            )
+        for sets in results:
+            grove.apply_sets(sets)
+        grove.dumpf()
+
+        ts = self._treestamps()
+        assert ts.get("a/b/c") == 3.0  # noqa: PLR2004
+        for worker in range(NUM_WORKERS):
+            for index in range(PATHS_PER_WORKER):
+                assert ts.get(f"w{worker}/f{index}") == float(index)
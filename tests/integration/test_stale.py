@@ -0,0 +1,87 @@
+"""Test finding files modified after their timestamps."""
+
+import os
+from pathlib import Path
+
+from tests import PROGRAM
+from tests.integration.base_test import BaseTestDir
+from treestamps import Grovestamps, GrovestampsConfig
+from treestamps.tree import Treestamps
+from treestamps.tree.config import TreestampsConfig
+
+__all__ = ()
+
+PROGRAM_NAME = f"{PROGRAM}-tests"
+MTIME = 1000.0
+
+
+class TestStale(BaseTestDir):
+    """Test finding files modified after their timestamps."""
+
+    def setup_method(self) -> None:
+        """Create files modified at MTIME."""
+        super().setup_method()
+        (self.TMP_ROOT / "d").mkdir()
+        for name in ("a", "b", "d/c", "d/e"):
+            path = self.TMP_ROOT / name
+            path.touch()
+            os.utime(path, (MTIME, MTIME))
+
+    def test_is_stale(self) -> None:
+        """Test files newer than their own or an ancestor's timestamp are stale."""
+        config = TreestampsConfig(PROGRAM_NAME, path=self.TMP_ROOT)
+        ts = Treestamps(config)
+        ts.set("a", MTIME)
+        ts.set("b", MTIME - 1)
+        ts.set("d", MTIME + 1)
+        assert not ts.is_stale(self.TMP_ROOT / "a")
+        assert ts.is_stale(self.TMP_ROOT / "b")
+        assert not ts.is_stale(str(self.TMP_ROOT / "d/c"))
+        assert ts.is_stale("b")
+        assert not ts.is_stale(self.TMP_ROOT / "missing")
+        entries = [
+            entry
+            for entry in os.scandir(self.TMP_ROOT)
+            if entry.is_file() and not entry.name.startswith(".")
+        ]
+        stale = sorted(entry.name for entry in ts.filter_stale(entries))
+        assert stale == ["b"]
+        paths = [self.TMP_ROOT / name for name in ("a", "b", "d/c", "missing")]
+        assert list(ts.filter_stale(paths)) == [paths[1]]
+
+    def test_grove_filter_stale(self) -> None:
+        """Test the grove checks paths against the tree holding them."""
+        config = GrovestampsConfig(PROGRAM_NAME, paths=(self.TMP_ROOT / "d",))
+        grove = Grovestamps(config)
+        grove.set_path(self.TMP_ROOT / "d" / "c", MTIME)
+        paths = [str(self.TMP_ROOT / name) for name in ("a", "d/c", "d/e")]
+        assert list(grove.filter_stale(paths)) == [paths[0], paths[2]]
+        assert not grove.is_stale(paths[1])
+        assert grove.is_stale(paths[2])
+
+    def test_walk_stale(self) -> None:
+        """Test one walk yields only stale files that are not skipped."""
+        (self.TMP_ROOT / "d" / "f").mkdir()
+        (self.TMP_ROOT / "d" / "f" / "g").touch()
+        (self.TMP_ROOT / "h.tmp").touch()
+        (self.TMP_ROOT / "link").symlink_to(self.TMP_ROOT / "a")
+        kwargs = {"ignore": ("*.tmp",), "symlinks": False, "index": True}
+        config = TreestampsConfig(PROGRAM_NAME, path=self.TMP_ROOT, **kwargs)
+        ts = Treestamps(config)
+        ts.set(self.TMP_ROOT / "a", MTIME)
+        ts.set(self.TMP_ROOT / "d", MTIME + 1)
+        ts.set(self.TMP_ROOT / "d" / "e", MTIME - 1)
+        stale = sorted(
+            Path(entry.path).relative_to(self.TMP_ROOT) for entry in ts.walk_stale()
+        )
+        assert stale == [Path("b"), Path("d/f/g")]
+        assert [entry.name for entry in ts.walk_stale(self.TMP_ROOT / "d")] == ["g"]
+
+        ts.dumpf()
+        config = TreestampsConfig(
+            PROGRAM_NAME, path=self.TMP_ROOT, read_only=True, **kwargs
+        )
+        ts = Treestamps(config)
+        ts.loadf_tree()
+        assert ts._index is not None
+        assert sorted(entry.name for entry in ts.walk_stale()) == ["b", "g"]
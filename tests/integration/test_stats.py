@@ -0,0 +1,73 @@
+"""Test load and dump statistics."""
+
+from tests import PROGRAM
+from tests.integration.base_test import BaseTestDir
+from treestamps import Grovestamps, GrovestampsConfig, NullStats, Stats
+from treestamps.tree import Treestamps
+from treestamps.tree.config import TreestampsConfig
+
+__all__ = ()
+
+PROGRAM_NAME = f"{PROGRAM}-tests"
+
+
+class TestStats(BaseTestDir):
+    """Test load and dump statistics."""
+
+    def test_null_stats(self) -> None:
+        """Test stats are off by default."""
+        ts = self._treestamps()
+        assert isinstance(ts.stats, NullStats)
+        ts.set("a", 1.0)
+        ts.dumpf()
+        assert not any(ts.stats.as_dict()["counters"].values())
+        assert not ts.stats.as_dict()["phases"]
+
+    def test_stats(self) -> None:
+        """Test counters and phases are recorded and reported."""
+        reports = []
+        ts = self._treestamps(stats=Stats(reports.append))
+        ts.set_many(["a", "a/b", "c"], [2.0, 1.0, 3.0])
+        ts.set("d", 4.0)
+        ts.dumpf()
+        assert len(reports) == 2  # noqa: PLR2004
+        counters = reports[-1]["counters"]
+        assert counters["wal_entries_written"] == 4  # noqa: PLR2004
+        assert counters["compacted"] == 0
+        phases = reports[-1]["phases"]
+        assert {"load_tree", "dump", "dump_dict", "serialize"} <= phases.keys()
+        assert phases["dump"]["calls"] == 1
+
+        stats = Stats()
+        config = GrovestampsConfig(PROGRAM_NAME, paths=(self.TMP_ROOT,))
+        Grovestamps(config, stats=stats)
+        counters = stats.as_dict()["counters"]
+        assert counters["files_loaded"] == 1
+        assert counters["entries_loaded"] == 3  # noqa: PLR2004
+        assert counters["entries_rejected"] == 1
+        assert counters["bytes_parsed"] == (self.TMP_ROOT / ts._filename).stat().st_size
+        assert {"load_parents", "load_children", "parse", "merge"} <= set(
+            stats.as_dict()["phases"]
+        )
+        stats.reset()
+        assert not any(stats.as_dict()["counters"].values())
+
+    def test_consumed_and_skipped(self) -> None:
+        """Test child files consumed and mismatched configs are counted."""
+        child = self.TMP_ROOT / "child"
+        child.mkdir()
+        config = TreestampsConfig(PROGRAM_NAME, path=child)
+        ts = Treestamps(config)
+        ts.set("a", 1.0)
+        ts.dumpf()
+        config = TreestampsConfig(PROGRAM_NAME, path=child, ignore=("*.tmp",))
+        ts = Treestamps(config)
+        ts.set("b", 1.0)
+        ts._close_wal()
+
+        ts = self._treestamps(stats=Stats())
+        ts.set("child", 2.0, compact=True)
+        counters = ts.stats.as_dict()["counters"]
+        assert counters["files_consumed"] == 2  # noqa: PLR2004
+        assert counters["files_skipped"] == 1
+        assert counters["compacted"] == 1
@@ -2,6 +2,8 @@
 
 from pathlib import Path
 
+import pytest
+
 from treestamps.tree import Treestamps
 from treestamps.tree.config import TreestampsConfig
 
@@ -55,3 +57,47 @@ class TestAbsolutePath:
         test_path = "."
         abs_path = treestamps._get_absolute_path(root, test_path)
         assert abs_path == root
+
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "a/b",
+            "./a//b/",
+            "a/../b",
+            ".",
+            "",
+            "/tmp/subdir/foo/a",  # noqa: S108
+            "/tmp/subdir",  # noqa: S108
+            "/tmp/other",  # noqa: S108
+            "/",
+            "//tmp/subdir/foo/a",
+        ],
+    )
+    def test_absolute_parts_match_pathlib(self, path: str) -> None:
+        """Test splitting strings matches the pathlib implementation."""
+        root = Path("/tmp/subdir/foo")  # noqa: S108
+        config = TreestampsConfig(program_name="test", path=root, verbose=0)
+        treestamps = Treestamps(config=config)
+        abs_parts = treestamps._get_absolute_parts(root, path)
+        assert abs_parts == treestamps._get_absolute_parts(root, Path(path))
+        if abs_parts is not None:
+            abs_path = Path(path).absolute()
+            if not abs_path.is_relative_to(root):
+                abs_path = root / path if not Path(path).is_absolute() else root
+            assert abs_parts == abs_path.parts
+
+    def test_absolute_parts_cache(self, monkeypatch, tmp_path: Path) -> None:
+        """Test the path cache is bounded and keyed by working directory."""
+        config = TreestampsConfig(program_name="test", path=tmp_path)
+        treestamps = Treestamps(config=config)
+        monkeypatch.setattr(treestamps, "_PATH_CACHE_SIZE", 2)
+        for name in ("a", "b", "c"):
+            treestamps._get_absolute_parts(tmp_path, str(tmp_path / name))
+        assert len(treestamps._path_cache) == 2  # noqa: PLR2004
+
+        subdir = tmp_path / "subdir"
+        subdir.mkdir()
+        monkeypatch.chdir(subdir)
+        assert treestamps._get_absolute_parts(tmp_path, "x") == (subdir / "x").parts
+        monkeypatch.chdir(tmp_path.parent)
+        assert treestamps._get_absolute_parts(tmp_path, "x") == (tmp_path / "x").parts
@@ -6,6 +6,7 @@ from types import MappingProxyType
 
 from treestamps.grove import Grovestamps, GrovestampsConfig
 from treestamps.tree import Treestamps
+from treestamps.tree.config import TreestampsConfig
 
 __all__ = ()
 
@@ -86,3 +87,15 @@ class TestClassMethods:
         assert set(cs.keys()) == dirset
         dirs = {ts.root_dir for ts in cs.values()}
         assert dirs == dirset
+
+    def test_positional_config(self) -> None:
+        """Test configs built positionally keep their fields in order."""
+        path = Path("/tmp")  # noqa: S108
+        args = ("Dummy", 1, False, ("*.tmp",), False, None, frozenset())
+        config = TreestampsConfig(*args, path)
+        assert config.path == path
+        assert config.ignore == frozenset({"*.tmp"})
+        assert not config.check_config
+        grove_config = GrovestampsConfig(*args, (path,))
+        assert grove_config.paths == (path,)
+        assert grove_config.verbose == 1
@@ -0,0 +1,68 @@
+"""Test the compiled ignore matcher."""
+
+from pathlib import PurePath
+
+import pytest
+
+from treestamps.tree.ignore import IgnoreMatcher
+
+__all__ = ()
+
+GLOBS = (
+    "*.tmp",
+    ".git",
+    "cache?",
+    "[!a]x",
+    "b/*.jpg",
+    "*/c/d",
+    "/abs/*",
+)
+PATHS = (
+    "a.tmp",
+    "dir/a.tmp",
+    "dir/a.tmp/b",
+    ".git",
+    "x/.git",
+    "cache1",
+    "cache12",
+    "ax",
+    "bx",
+    "b/x.jpg",
+    "a/b/x.jpg",
+    "a/c/x.jpg",
+    "c/d",
+    "a/c/d",
+    "/abs/x",
+    "/abs/x/y",
+    "rel/abs/x",
+    "/",
+    ".",
+    "",
+)
+
+
+class TestIgnoreMatcher:
+    """Test the compiled ignore matcher."""
+
+    @pytest.mark.parametrize("path", PATHS)
+    def test_match_like_pathlib(self, path: str) -> None:
+        """Test the matcher agrees with PurePath.match()."""
+        matcher = IgnoreMatcher(GLOBS)
+        pure_path = PurePath(path)
+        expected = any(pure_path.match(glob) for glob in GLOBS)
+        assert matcher.match(path) == expected
+
+    def test_names_only(self) -> None:
+        """Test single component globs only look at the name."""
+        matcher = IgnoreMatcher(("*.tmp", ".git"))
+        assert matcher.names_only
+        assert matcher.match_name("a.tmp")
+        assert not matcher.match_name("a.jpg")
+        assert not IgnoreMatcher(GLOBS).names_only
+
+    def test_empty(self) -> None:
+        """Test no globs match nothing and empty globs are rejected."""
+        assert not IgnoreMatcher(())
+        assert not IgnoreMatcher(()).match("a")
+        with pytest.raises(ValueError, match="Empty"):
+            IgnoreMatcher(("",))
@@ -0,0 +1,38 @@
+"""Test the memory mapped index."""
+
+from pathlib import Path
+
+from treestamps.tree.index import TimestampIndex, get_config_fingerprint
+
+__all__ = ()
+
+FINGERPRINT = get_config_fingerprint({"config": {"a": frozenset({"y", "x"})}})
+
+
+class TestTimestampIndex:
+    """Test the memory mapped index."""
+
+    def test_lookup(self, tmp_path: Path) -> None:
+        """Test binary search and ancestor max."""
+        path = tmp_path / "index.idx"
+        items = [(".", 1.0), ("a", 3.0), ("a/b", 2.0), ("a/b/c", 4.0), ("a", 0.0)]
+        assert TimestampIndex.write(path, items, FINGERPRINT, 5) == 4  # noqa: PLR2004
+        index = TimestampIndex.open(path, FINGERPRINT, 5)
+        assert index is not None
+        assert len(index) == 4  # noqa: PLR2004
+        assert index.get("a") == 3.0  # noqa: PLR2004
+        assert index.get("missing") is None
+        assert index.get_max(("a", "b")) == 3.0  # noqa: PLR2004
+        assert index.get_max(("a", "b", "c", "d")) == 4.0  # noqa: PLR2004
+        assert index.get_max(("x",)) == 1.0
+        index.close()
+
+    def test_stale(self, tmp_path: Path) -> None:
+        """Test indexes for another config or source file are not opened."""
+        path = tmp_path / "index.idx"
+        TimestampIndex.write(path, [("a", 1.0)], FINGERPRINT, 5)
+        assert TimestampIndex.open(path, FINGERPRINT + 1, 5) is None
+        assert TimestampIndex.open(path, FINGERPRINT, 6) is None
+        assert TimestampIndex.open(tmp_path / "missing.idx", FINGERPRINT, 5) is None
+        fingerprint = get_config_fingerprint({"config": {"a": frozenset({"x", "y"})}})
+        assert fingerprint == FINGERPRINT
@@ -0,0 +1,35 @@
+"""Test path helpers."""
+
+from pathlib import Path
+
+from treestamps.tree.paths import RootIndex, get_absolute_parts
+
+__all__ = ()
+
+
+class TestRootIndex:
+    """Test finding the deepest root of a path."""
+
+    def test_find(self) -> None:
+        """Test nested roots resolve to the deepest match."""
+        roots = RootIndex(
+            [(("/", "a"), "a"), (("/", "a", "b", "c"), "abc"), (("/", "x"), "x")]
+        )
+        assert roots.find(("/", "a")) == "a"
+        assert roots.find(("/", "a", "b")) == "a"
+        assert roots.find(("/", "a", "b", "c", "d")) == "abc"
+        assert roots.find(("/", "x", "y")) == "x"
+        assert roots.find(("/", "b")) is None
+        assert roots.find(("/",)) is None
+
+    def test_many_roots(self) -> None:
+        """Test hundreds of roots."""
+        roots = RootIndex((("/", "r", str(index)), index) for index in range(500))
+        for index in range(500):
+            assert roots.find(("/", "r", str(index), "f")) == index
+        assert roots.find(("/", "r", "500")) is None
+
+    def test_absolute_parts(self) -> None:
+        """Test absolute parts match pathlib."""
+        for path in ("a/b", "/a/./b", "./a", Path("a") / "b"):
+            assert get_absolute_parts(path) == Path(path).absolute().parts
@@ -0,0 +1,60 @@
+"""Test printing messages."""
+
+from pathlib import Path
+
+import pytest
+
+from treestamps.printer import Printer
+
+__all__ = ()
+
+
+class Unprintable:
+    """Fail if formatted."""
+
+    def __str__(self) -> str:
+        """Fail."""
+        reason = "formatted"
+        raise AssertionError(reason)
+
+
+class TestPrinter:
+    """Test printing messages."""
+
+    def test_quiet(self, capsys: pytest.CaptureFixture) -> None:
+        """Test nothing is formatted or printed when not verbose."""
+        printer = Printer(0)
+        printer.skip("outside %s", Path("a"), Unprintable())
+        printer.compact("under", Unprintable(), timestamp=1.0)
+        printer.warn("warning")
+        printer.flush()
+        assert not capsys.readouterr().out
+
+    def test_progress(self, capsys: pytest.CaptureFixture) -> None:
+        """Test progress counts are rendered at most every interval."""
+        printer = Printer(1)
+        printer._PROGRESS_INTERVAL = 3600.0
+        printer.skip("outside %s", Path("a"), Unprintable())
+        for _ in range(9):
+            printer.skip("outside %s", Path("a"), Unprintable())
+        printer.save("Saved", ("/", "b"))
+        out = capsys.readouterr().out
+        assert out.count("\r") == 1
+        assert "skipped 1" in out
+        printer.flush()
+        out = capsys.readouterr().out
+        assert "saved 1" in out
+        assert "skipped 10" in out
+        printer.flush()
+        assert not capsys.readouterr().out
+        printer.warn("warning")
+        assert capsys.readouterr().out.startswith("\n")
+
+    def test_verbose(self, capsys: pytest.CaptureFixture) -> None:
+        """Test messages are formatted when printed."""
+        printer = Printer(2)
+        printer.compact("Compacted %d under", ("/", "a", "b"), 3, timestamp=1.5)
+        printer.skip("outside %s's tree", "c", Path("/a"))
+        out = capsys.readouterr().out
+        assert "Compacted 3 under: /a/b: 1.5" in out
+        assert "Skip: outside /a's tree: c" in out
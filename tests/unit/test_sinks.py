@@ -0,0 +1,139 @@
+"""Test printer event sinks."""
+
+import json
+import logging
+import subprocess
+import sys
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+from treestamps import (
+    BackgroundSink,
+    Grovestamps,
+    GrovestampsConfig,
+    JSONLinesSink,
+    LoggingSink,
+    Printer,
+    PrinterEvent,
+    PrinterSink,
+    TerminalSink,
+)
+
+__all__ = ()
+
+EVENTS = 10
+
+
+class TestSinks:
+    """Test printer event sinks."""
+
+    def test_json_lines(self) -> None:
+        """Test events are written as JSON Lines in batches."""
+        file = StringIO()
+        printer = Printer(2, JSONLinesSink(file, batch_size=4))
+        for index in range(EVENTS):
+            printer.skip("outside %s", ("/", "a"), index)
+        assert len(file.getvalue().splitlines()) == 8  # noqa: PLR2004
+        printer.warn("warning", ValueError("bad"))
+        printer.flush()
+        events = [json.loads(line) for line in file.getvalue().splitlines()]
+        assert len(events) == EVENTS + 1
+        assert events[3]["event"] == "skip"
+        assert events[3]["message"] == "outside 3"
+        assert events[3]["path"] == "/a"
+        assert events[-1]["event"] == "warn"
+        assert events[-1]["exc"] == "bad"
+        assert "path" not in events[-1]
+
+    def test_logging(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Test events are logged at their levels."""
+        printer = Printer(2, LoggingSink("treestamps.test"))
+        with caplog.at_level(logging.INFO, logger="treestamps.test"):
+            printer.skip("not logged", "a")
+            printer.save("Saved timestamps for", Path("/b"))
+            printer.error("failed")
+        assert [record.levelno for record in caplog.records] == [
+            logging.INFO,
+            logging.ERROR,
+        ]
+        assert caplog.records[0].getMessage() == "Saved timestamps for /b"
+        assert caplog.records[0].treestamps["path"] == "/b"  # pyright: ignore[reportAttributeAccessIssue]
+
+    def test_background(self) -> None:
+        """Test events are written in order on a background thread."""
+        file = StringIO()
+        sink = BackgroundSink(JSONLinesSink(file))
+        printer = Printer(2, sink)
+        for index in range(EVENTS):
+            printer.load("Read %d from", "a", index)
+        printer.flush()
+        messages = [
+            json.loads(line)["message"] for line in file.getvalue().splitlines()
+        ]
+        assert messages == [f"Read {index} from" for index in range(EVENTS)]
+        sink.close()
+        sink.flush()
+
+    def test_background_exit(self, tmp_path: Path) -> None:
+        """Test queued events are written when the process exits without close."""
+        path = tmp_path / "events.jsonl"
+        code = (
+            "from treestamps import BackgroundSink, JSONLinesSink, Printer\n"
+            f"file = open({str(path)!r}, 'w')\n"
+            "printer = Printer(2, BackgroundSink(JSONLinesSink(file)))\n"
+            f"for index in range({EVENTS}):\n"
+            "    printer.load('Read %d from', 'a', index)\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)  # noqa: S603
+        assert len(path.read_text().splitlines()) == EVENTS
+
+    def test_background_error(self, capsys: pytest.CaptureFixture) -> None:
+        """Test a failing sink is reported and stops accepting events."""
+
+        class FailingSink(JSONLinesSink):
+            def write(self, events) -> None:  # noqa: ARG002
+                reason = "disk full"
+                raise OSError(reason)
+
+        sink = BackgroundSink(FailingSink(StringIO()))
+        printer = Printer(2, sink)
+        printer.load("Read from", "a")
+        printer.flush()
+        assert "FailingSink failed, dropping printer events: disk full" in (
+            capsys.readouterr().err
+        )
+        size = sink._queue.qsize()
+        printer.load("Read from", "b")
+        assert sink._queue.qsize() == size
+        sink.close()
+
+    def test_abstract_sink(self) -> None:
+        """Test sinks must implement emit()."""
+        with pytest.raises(TypeError):
+            PrinterSink()  # pyright: ignore[reportAbstractUsage]
+
+    def test_terminal(self) -> None:
+        """Test a batch is one write with a newline after the progress line."""
+        file = StringIO()
+        sink = TerminalSink(file)
+        sink.progress({"skip": 2})
+        sink.write(
+            (PrinterEvent("compact", "under", "/a", 1.0), PrinterEvent("error", "x"))
+        )
+        lines = file.getvalue().split("\n")
+        assert "skipped 2" in lines[0]
+        assert "under: /a: 1.0" in lines[1]
+        assert "ERROR: x" in lines[2]
+
+    def test_grove_printer(self, tmp_path: Path) -> None:
+        """Test a grove sends its trees' events to its printer."""
+        file = StringIO()
+        config = GrovestampsConfig("test", paths=(tmp_path,), verbose=2)
+        grove = Grovestamps(config, printer=Printer(2, JSONLinesSink(file)))
+        grove.set_path(tmp_path / "a", 1.0)
+        grove.set_path(tmp_path.parent / "b", 1.0)
+        grove.dumpf()
+        events = [json.loads(line)["event"] for line in file.getvalue().splitlines()]
+        assert events == ["skip", "save"]
@@ -0,0 +1,139 @@
+"""Test timestamp stores."""
+
+from pathlib import Path
+
+from treestamps.tree.store import TimestampTrie
+
+__all__ = ()
+
+ROOT = Path("/tmp/root")  # noqa: S108
+
+
+class TestTimestampTrie:
+    """Test the trie store."""
+
+    def test_mapping(self) -> None:
+        """Test dict like behavior."""
+        trie = TimestampTrie()
+        trie[ROOT / "a"] = 1.0
+        trie[ROOT / "a" / "b"] = 2.0
+        trie[ROOT / "a"] = 3.0
+        assert len(trie) == 2  # noqa: PLR2004
+        assert trie[ROOT / "a"] == 3.0  # noqa: PLR2004
+        assert trie.get(ROOT) is None
+        assert ROOT / "a" / "b" in trie
+        assert dict(trie.items()) == {ROOT / "a": 3.0, ROOT / "a" / "b": 2.0}
+        assert list(trie) == [ROOT / "a", ROOT / "a" / "b"]
+
+    def test_delete_prunes(self) -> None:
+        """Test deleting prunes empty branches."""
+        trie = TimestampTrie()
+        trie[ROOT / "a" / "b" / "c"] = 1.0
+        del trie[ROOT / "a" / "b" / "c"]
+        assert not trie
+        assert trie._find(ROOT.parts) is None
+
+    def test_get_max(self) -> None:
+        """Test ancestor max lookup."""
+        trie = TimestampTrie()
+        trie[ROOT] = 2.0
+        trie[ROOT / "a"] = 1.0
+        trie[ROOT / "a" / "b"] = 3.0
+        assert trie.get_max((ROOT / "a").parts) == 2.0  # noqa: PLR2004
+        assert trie.get_max((ROOT / "a" / "b" / "c").parts) == 3.0  # noqa: PLR2004
+        assert trie.get_max((ROOT / "x" / "y").parts) == 2.0  # noqa: PLR2004
+        assert trie.get_max(ROOT.parent.parts) is None
+
+    def test_compact_below(self) -> None:
+        """Test compaction only removes older entries in the subtree."""
+        trie = TimestampTrie()
+        trie[ROOT / "a"] = 2.0
+        trie[ROOT / "a" / "old"] = 1.0
+        trie[ROOT / "a" / "new"] = 3.0
+        trie[ROOT / "a" / "x" / "old"] = 1.0
+        trie[ROOT / "b"] = 1.0
+        assert trie.compact_below((ROOT / "a").parts) == 2  # noqa: PLR2004
+        assert dict(trie.items()) == {
+            ROOT / "a": 2.0,
+            ROOT / "a" / "new": 3.0,
+            ROOT / "b": 1.0,
+        }
+        assert len(trie) == 3  # noqa: PLR2004
+        assert trie.compact_below((ROOT / "c").parts) == 0
+
+    def test_compact_many(self) -> None:
+        """Test compacting many subtrees removes entries older than any ancestor."""
+        trie = TimestampTrie()
+        trie[ROOT] = 2.0
+        trie[ROOT / "a"] = 1.0
+        trie[ROOT / "a" / "b"] = 3.0
+        trie[ROOT / "a" / "b" / "old"] = 2.5
+        trie[ROOT / "a" / "b" / "new"] = 4.0
+        trie[ROOT / "c" / "old"] = 1.0
+        trie[ROOT / "d" / "new"] = 5.0
+        parts_list = [(ROOT / "a").parts, (ROOT / "a" / "b").parts, (ROOT / "c").parts]
+        assert trie.compact_many(parts_list) == 2  # noqa: PLR2004
+        assert dict(trie.items()) == {
+            ROOT: 2.0,
+            ROOT / "a": 1.0,
+            ROOT / "a" / "b": 3.0,
+            ROOT / "a" / "b" / "new": 4.0,
+            ROOT / "d" / "new": 5.0,
+        }
+        assert len(trie) == 5  # noqa: PLR2004
+        assert trie.compact_many([(ROOT / "x").parts]) == 0
+
+    def test_merge_max(self) -> None:
+        """Test bulk merging only keeps entries newer than their ancestors."""
+        trie = TimestampTrie()
+        trie[ROOT / "a"] = 5.0
+        items = [
+            ((ROOT / "a" / "b" / "old").parts, 4.0),
+            ((ROOT / "a" / "b" / "new").parts, 6.0),
+            ((ROOT / "a" / "b").parts, 7.0),
+            ((ROOT / "c" / "d").parts, 1.0),
+            ((ROOT / "c").parts, 2.0),
+            ((ROOT / "c").parts, 1.5),
+            ((ROOT / "a").parts, 3.0),
+        ]
+        assert trie.merge_max(items) == 2  # noqa: PLR2004
+        assert dict(trie.items()) == {
+            ROOT / "a": 5.0,
+            ROOT / "a" / "b": 7.0,
+            ROOT / "c": 2.0,
+        }
+        assert len(trie) == 3  # noqa: PLR2004
+        assert trie._find((ROOT / "a" / "b" / "old").parts) is None
+
+    def test_items_below(self) -> None:
+        """Test subtree iteration and child names."""
+        trie = TimestampTrie()
+        trie[ROOT / "a"] = 1.0
+        trie[ROOT / "a" / "b"] = 2.0
+        trie[ROOT / "a" / "c" / "d"] = 3.0
+        trie[ROOT / "e"] = 4.0
+        assert dict(trie.items_below((ROOT / "a").parts)) == {
+            ROOT / "a" / "b": 2.0,
+            ROOT / "a" / "c" / "d": 3.0,
+        }
+        assert trie.child_names(ROOT.parts) == ("a", "e")
+        assert trie.child_names((ROOT / "x").parts) == ()
+        assert trie.child_count((ROOT / "a").parts) == 2  # noqa: PLR2004
+        assert trie.child_count((ROOT / "x").parts) == 0
+
+    def test_get_max_many(self) -> None:
+        """Test batched ancestor max lookup matches single lookups."""
+        trie = TimestampTrie()
+        trie[ROOT] = 2.0
+        trie[ROOT / "a"] = 1.0
+        trie[ROOT / "a" / "b"] = 3.0
+        parts_list = [
+            (ROOT / "a" / "b" / "c").parts,
+            (ROOT / "x" / "y").parts,
+            (ROOT / "a").parts,
+            (ROOT / "a" / "b" / "d").parts,
+            ROOT.parent.parts,
+        ]
+        assert trie.get_max_many(parts_list) == [
+            trie.get_max(parts) for parts in parts_list
+        ]
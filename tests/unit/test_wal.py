@@ -0,0 +1,57 @@
+"""Test the write ahead log writer."""
+
+from pathlib import Path
+
+import pytest
+
+from treestamps.wal import (
+    WAL_DURABILITY_FLUSH,
+    WAL_DURABILITY_FSYNC,
+    WAL_DURABILITY_NONE,
+    WriteAheadLog,
+)
+
+__all__ = ()
+
+ENTRIES = 10
+
+
+class TestWriteAheadLog:
+    """Test the write ahead log writer."""
+
+    @pytest.mark.parametrize(
+        ("durability", "flush_entries", "flushes", "syncs"),
+        [
+            (WAL_DURABILITY_NONE, 0, 0, 0),
+            (WAL_DURABILITY_FLUSH, 0, ENTRIES, 0),
+            (WAL_DURABILITY_FLUSH, 4, 3, 0),
+            (WAL_DURABILITY_FSYNC, 5, 2, 2),
+        ],
+    )
+    def test_policy(
+        self,
+        tmp_path: Path,
+        durability: str,
+        flush_entries: int,
+        flushes: int,
+        syncs: int,
+    ) -> None:
+        """Test group commits per durability policy."""
+        path = tmp_path / "wal"
+        wal = WriteAheadLog(path, durability, flush_entries=flush_entries)
+        wal.open("wal:\n")
+        for index in range(ENTRIES):
+            wal.write(f"- {index}: {index}\n")
+        wal.close()
+        assert wal.get_counters() == {
+            "entries_written": ENTRIES,
+            "flushes": flushes,
+            "syncs": syncs,
+        }
+        assert len(path.read_text().splitlines()) == ENTRIES + 1
+
+    def test_write_closed(self, tmp_path: Path) -> None:
+        """Test writing to a closed log raises."""
+        wal = WriteAheadLog(tmp_path / "wal")
+        with pytest.raises(ValueError, match="not open"):
+            wal.write("- a: 1\n")
@@ -1,7 +1,33 @@
 """Main package."""
 
 from treestamps.grove import Grovestamps, GrovestampsConfig
+from treestamps.printer import Printer
+from treestamps.sinks import (
+    BackgroundSink,
+    JSONLinesSink,
+    LoggingSink,
+    PrinterEvent,
+    PrinterSink,
+    TerminalSink,
+)
+from treestamps.stats import NullStats, Stats
 from treestamps.tree import Treestamps
 from treestamps.tree.config import TreestampsConfig
+from treestamps.tree.ignore import IgnoreMatcher
 
-__all__ = ("Grovestamps", "GrovestampsConfig", "Treestamps", "TreestampsConfig")
+__all__ = (
+    "BackgroundSink",
+    "Grovestamps",
+    "GrovestampsConfig",
+    "IgnoreMatcher",
+    "JSONLinesSink",
+    "LoggingSink",
+    "NullStats",
+    "Printer",
+    "PrinterEvent",
+    "PrinterSink",
+    "Stats",
+    "TerminalSink",
+    "Treestamps",
+    "TreestampsConfig",
+)
@@ -0,0 +1,164 @@
+"""Asyncio facade for Grovestamps."""
+
+import asyncio
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from functools import partial
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from threading import Lock
+from types import TracebackType
+from typing import Any
+
+from typing_extensions import Self
+
+from treestamps.grove import Grovestamps, GrovestampsConfig
+from treestamps.printer import Printer
+
+# path, mtime, compact, future
+_SetRequest = tuple[Path | str, float | None, bool, asyncio.Future]
+
+
+class AsyncGrovestamps:
+    """
+    Asyncio facade over Grovestamps.
+
+    Loading, WAL appends and dumps run in order on one worker thread so they
+    never block the event loop or race each other. set() requests are queued
+    and applied in batches with one WAL write per batch. get() reads the
+    loaded timestamps directly on the event loop without waiting for queued
+    sets. It shares a lock with the worker thread, because both sides update
+    the path caches and compaction prunes the timestamps get() walks, so it
+    waits for a batch or dump that is already running.
+    """
+
+    _BATCH_SIZE: int = 1024
+
+    def __init__(
+        self, config: GrovestampsConfig, printer: Printer | None = None
+    ) -> None:
+        """Create the worker thread. Await load_tree() before use."""
+        self._config: GrovestampsConfig = config
+        self._printer: Printer | None = printer
+        self._grove: Grovestamps | None = None
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="treestamps-async"
+        )
+        self._queue: asyncio.Queue[_SetRequest] | None = None
+        self._writer: asyncio.Task | None = None
+        self._lock: Lock = Lock()
+
+    @property
+    def grove(self) -> Grovestamps:
+        """Return the loaded Grovestamps."""
+        if self._grove is None:
+            reason = "AsyncGrovestamps.load_tree() has not been awaited"
+            raise ValueError(reason)
+        return self._grove
+
+    def _locked(self, func: Callable, *args: Any) -> Any:
+        """Call a function while holding the grove lock."""
+        with self._lock:
+            return func(*args)
+
+    async def _run(self, func: Callable, *args: Any) -> Any:
+        """Run a function on the worker thread holding the grove lock."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(self._locked, func, *args)
+        )
+
+    async def load_tree(self) -> None:
+        """Load every tree in the grove."""
+        self._grove = await self._run(Grovestamps, self._config, None, self._printer)
+
+    def get(self, path: Path | str) -> float | None:
+        """Get a timestamp without waiting for queued sets."""
+        grove = self.grove
+        with self._lock:
+            return grove.get_timestamp(path)
+
+    def get_many(self, paths: Iterable[Path | str]) -> list[float | None]:
+        """Get many timestamps without waiting for queued sets."""
+        grove = self.grove
+        with self._lock:
+            return grove.get_many(paths)
+
+    def _set_batch(self, batch: list[_SetRequest]) -> list[float | None]:
+        """Apply a batch of set requests with one WAL write per tree and flag."""
+        results = []
+        for compact, requests in groupby(batch, key=itemgetter(2)):
+            paths, mtimes, _, _ = zip(*requests, strict=True)
+            results += self.grove.set_many(paths, mtimes, compact=compact)
+        return results
+
+    async def _write_sets(self, queue: asyncio.Queue[_SetRequest]) -> None:
+        """Apply queued set requests in order, batching whatever has queued up."""
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self._BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                results = await self._run(self._set_batch, batch)
+                for (*_, future), result in zip(batch, results, strict=True):
+                    if not future.done():
+                        future.set_result(result)
+            except Exception as exc:
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def set(
+        self,
+        path: Path | str,
+        mtime: float | None = None,
+        *,
+        compact: bool = False,
+    ) -> float | None:
+        """Queue setting a timestamp and wait until it is in the WAL."""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._writer = asyncio.create_task(self._write_sets(self._queue))
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((path, mtime, compact, future))
+        return await future
+
+    async def _join(self) -> None:
+        """Wait for queued sets to be applied."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def dump(self) -> None:
+        """Apply queued sets and dump all trees."""
+        await self._join()
+        await self._run(self.grove.dumpf)
+
+    async def aclose(self) -> None:
+        """Apply queued sets and stop the writer and the worker thread."""
+        await self._join()
+        if self._writer is not None:
+            self._writer.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._writer
+        self._writer = None
+        self._queue = None
+        self._executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> Self:
+        """Load the grove."""
+        await self.load_tree()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close without dumping."""
+        await self.aclose()
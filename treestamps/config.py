@@ -1,13 +1,31 @@
 """Treestamps Config methods."""
 
+import re
 from abc import ABC
 from collections.abc import Iterable, Mapping
-from dataclasses import dataclass
+from dataclasses import KW_ONLY, dataclass
 from types import MappingProxyType
 from typing import Any
 
 from ruamel.yaml.comments import CommentedMap, CommentedSet
 
+from treestamps.serializers import FILE_FORMATS, YAML_FORMAT
+from treestamps.wal import (
+    WAL_DURABILITIES,
+    WAL_DURABILITY_NONE,
+    WAL_MODE_SNAPSHOT,
+    WAL_MODES,
+)
+
+DUMP_MODE_FULL = "full"
+DUMP_MODE_INCREMENTAL = "incremental"
+DUMP_MODES = frozenset({DUMP_MODE_FULL, DUMP_MODE_INCREMENTAL})
+SHARD_NONE = "none"
+SHARD_SUBDIR = "subdir"
+SHARD_HASH = "hash"
+SHARDS = frozenset({SHARD_HASH, SHARD_NONE, SHARD_SUBDIR})
+_WRITER_ID_RE = re.compile(r"[\w.-]*")
+
 
 @dataclass
 class CommonConfig(ABC):
@@ -20,6 +38,25 @@ class CommonConfig(ABC):
     check_config: bool = True
     program_config: Mapping[str, Any] | None = None
     program_config_keys: Iterable[str] = frozenset()
+    # Newer options are keyword only so subclass fields keep their positions.
+    _: KW_ONLY
+    file_format: str = YAML_FORMAT
+    scan_workers: int = 1
+    wal_durability: str = WAL_DURABILITY_NONE
+    wal_flush_entries: int = 0
+    wal_flush_ms: float = 0.0
+    wal_mode: str = WAL_MODE_SNAPSHOT
+    dump_mode: str = DUMP_MODE_FULL
+    segment_limit: int = 8
+    shard: str = SHARD_NONE
+    shard_count: int = 16
+    shard_workers: int = 1
+    index: bool = False
+    read_only: bool = False
+    auto_compact: bool = False
+    compact_threshold: int = 0
+    multi_writer: bool = False
+    writer_id: str = ""
 
     @classmethod
     def normalize_config(cls, value: Any) -> Any:
@@ -39,10 +76,46 @@ class CommonConfig(ABC):
             value = frozenset(cls.normalize_config(e) for e in value)
         return value
 
+    def _check_choice(self, attr: str, choices: frozenset[str]) -> None:
+        """Raise if a string option is not one of its choices."""
+        value = getattr(self, attr)
+        if value not in choices:
+            reason = f"{attr} must be one of {sorted(choices)}, not {value!r}"
+            raise ValueError(reason)
+
     def __post_init__(self) -> None:
         """Fix types and normalize program config dict."""
         self.ignore = frozenset(self.ignore)
         self.program_config_keys = frozenset(self.program_config_keys)
+        self._check_choice("file_format", FILE_FORMATS)
+        self._check_choice("wal_durability", WAL_DURABILITIES)
+        self._check_choice("wal_mode", WAL_MODES)
+        self._check_choice("dump_mode", DUMP_MODES)
+        self._check_choice("shard", SHARDS)
+        if self.shard != SHARD_NONE and self.dump_mode == DUMP_MODE_INCREMENTAL:
+            reason = "shard can not be combined with dump_mode incremental"
+            raise ValueError(reason)
+        if self.shard != SHARD_NONE and self.index:
+            reason = "shard can not be combined with index"
+            raise ValueError(reason)
+        if self.shard_count < 1:
+            reason = f"shard_count must be positive, not {self.shard_count}"
+            raise ValueError(reason)
+        if self.multi_writer and (
+            self.shard != SHARD_NONE or self.dump_mode == DUMP_MODE_INCREMENTAL
+        ):
+            reason = (
+                "multi_writer can not be combined with shard or dump_mode incremental"
+            )
+            raise ValueError(reason)
+        if not _WRITER_ID_RE.fullmatch(self.writer_id):
+            reason = f"writer_id may only hold letters, digits, '.', '_' and '-', not {self.writer_id!r}"
+            raise ValueError(reason)
+        if self.compact_threshold < 0:
+            reason = (
+                f"compact_threshold can not be negative, not {self.compact_threshold}"
+            )
+            raise ValueError(reason)
 
         # Filter dict by keys
         if self.program_config is not None:
@@ -1,8 +1,9 @@
 """A dict of Treestamps."""
 
-from collections.abc import Collection, Iterable, Mapping
+from collections.abc import Collection, Iterable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from copy import copy
-from dataclasses import asdict, dataclass
+from dataclasses import KW_ONLY, asdict, dataclass
 from pathlib import Path
 from typing import Any, overload
 from warnings import warn
@@ -11,8 +12,14 @@ from typing_extensions import deprecated
 
 from treestamps.config import CommonConfig
 from treestamps.printer import Printer
+from treestamps.stale import StatPath, get_mtime, get_stat_path, is_newer, iter_stale
+from treestamps.stats import NullStats, Stats
 from treestamps.tree import Treestamps
 from treestamps.tree.config import TreestampsConfig
+from treestamps.tree.ignore import IgnoreMatcher
+from treestamps.tree.paths import RootIndex, get_absolute_parts
+from treestamps.tree.snapshot import TimestampSnapshot
+from treestamps.tree.store import Parts
 
 
 @dataclass
@@ -20,6 +27,8 @@ class GrovestampsConfig(CommonConfig):
     """Grovestamps config."""
 
     paths: Iterable[str | Path] = ()
+    _: KW_ONLY
+    tree_workers: int = 1
 
     def __post_init__(self) -> None:
         """
@@ -48,53 +57,135 @@ class GrovestampsConfig(CommonConfig):
             config.program_config = dict(config.program_config)
         config_dict = asdict(config)
         config_dict.pop("paths", None)
+        config_dict.pop("tree_workers", None)
         return config_dict
 
 
+class GrovestampsSnapshot:
+    """
+    Compact picklable copy of a grove's timestamps for worker processes.
+
+    Pass it to workers with the pool initializer or task arguments. Workers
+    get() and set() like Grovestamps and return take_sets() to the parent,
+    which applies them with Grovestamps.apply_sets().
+    """
+
+    def __init__(self, snapshots: Iterable[TimestampSnapshot]) -> None:
+        """Index tree snapshots by root for routing."""
+        self._snapshots: tuple[TimestampSnapshot, ...] = tuple(snapshots)
+        self._roots: RootIndex[TimestampSnapshot] = RootIndex(
+            (snapshot.root_dir.parts, snapshot) for snapshot in self._snapshots
+        )
+
+    def __len__(self) -> int:
+        """Return the number of packed timestamps."""
+        return sum(len(snapshot) for snapshot in self._snapshots)
+
+    def _route(self, path: Path | str) -> tuple[TimestampSnapshot | None, Parts]:
+        """Return the snapshot of the deepest tree containing a path."""
+        abs_parts = get_absolute_parts(path)
+        return self._roots.find(abs_parts), abs_parts
+
+    def get(self, path: Path | str) -> float | None:
+        """Get the timestamp of a path from the tree that holds it."""
+        snapshot, abs_parts = self._route(path)
+        return None if snapshot is None else snapshot._get_parts(abs_parts)  # noqa: SLF001
+
+    def set(self, path: Path | str, mtime: float | None = None) -> float | None:
+        """Record a timestamp to send back with take_sets()."""
+        snapshot, abs_parts = self._route(path)
+        return None if snapshot is None else snapshot._set_parts(abs_parts, mtime)  # noqa: SLF001
+
+    def take_sets(self) -> list[tuple[str, float]]:
+        """Return and forget the absolute paths and timestamps set so far."""
+        return [item for snapshot in self._snapshots for item in snapshot.take_sets()]
+
+
 class Grovestamps(dict[Path, Treestamps]):
     """A path keyed dict of Treestamps."""
 
-    def __init__(self, config: GrovestampsConfig) -> None:
+    def __init__(
+        self,
+        config: GrovestampsConfig,
+        stats: Stats | None = None,
+        printer: Printer | None = None,
+    ) -> None:
         """Create a dictionary of Treestamps keyed with paths."""
         super().__init__()
         self._config: GrovestampsConfig = config
-        self._printer: Printer = Printer(config.verbose)
+        self._printer: Printer = printer or Printer(config.verbose)
+        self._stats: Stats = stats if stats is not None else NullStats()
+        self._ignore: IgnoreMatcher = IgnoreMatcher(config.ignore)
 
         treestamps_config_dict = self._config.get_treestamps_config_dict()
 
+        trees: dict[Path, Treestamps] = {}
         for top_path in self._config.paths:
             root_dir = Treestamps.get_dir(top_path)
-            if root_dir in self:
+            if root_dir in trees:
                 continue
             tree_config = TreestampsConfig(
                 **treestamps_config_dict, path=Path(top_path)
             )
-            ts = Treestamps(tree_config, self._printer)
-            ts.loadf_tree()
-            self[root_dir] = ts
+            trees[root_dir] = Treestamps(tree_config, self._printer, self._stats)
+        if self._config.tree_workers > 1:
+            self._loadf_trees_parallel(trees)
+        else:
+            for ts in trees.values():
+                ts.loadf_tree()
+        # Insert in config order regardless of load completion order.
+        self.update(trees)
+        # Keys may be relative, lookups are absolute.
+        self._roots: RootIndex[Path] = RootIndex(
+            (ts.root_dir.parts, top_path) for top_path, ts in self.items()
+        )
 
         self.filename: str = Treestamps.get_filename(self._config.program_name)
         self.wal_filename: str = Treestamps.get_wal_filename(self._config.program_name)
 
+    @property
+    def stats(self) -> Stats:
+        """Return the load and dump statistics shared by every tree."""
+        return self._stats
+
+    @property
+    def printer(self) -> Printer:
+        """Return the printer shared by every tree."""
+        return self._printer
+
+    def _loadf_trees_parallel(self, trees: Mapping[Path, Treestamps]) -> None:
+        """Load trees concurrently, reporting errors per tree."""
+        with ThreadPoolExecutor(
+            max_workers=self._config.tree_workers,
+            thread_name_prefix="treestamps-tree",
+        ) as executor:
+            futures = {
+                root_dir: executor.submit(ts.loadf_tree)
+                for root_dir, ts in trees.items()
+            }
+            for root_dir, future in futures.items():
+                try:
+                    future.result()
+                except Exception as exc:
+                    self._printer.error(f"Loading timestamps for {root_dir}", exc)
+
     def load(self, path: str | Path, yaml: Mapping | str | bytes | Path) -> None:
         """Load a timestamp yaml dict into the correct treestamps."""
         path = Path(path)
         if not path.is_dir():
             path = path.parent
-        for top_path in self:
-            if path.is_relative_to(top_path):
-                treestamps = self[top_path]
-                match yaml:
-                    case Mapping():
-                        treestamps.load_map(path, yaml)
-                    case str() | bytes():
-                        treestamps.loads(path, yaml)
-                    case Path():
-                        treestamps.loadf(path)
-                break
-        else:
+        top_path = self._roots.find(get_absolute_parts(path))
+        if top_path is None:
             reason = f"load dict to {path} is not relative to any Grovetamps path: {tuple(self.keys())}"
             raise ValueError(reason)
+        treestamps = self[top_path]
+        match yaml:
+            case Mapping():
+                treestamps.load_map(path, yaml)
+            case str() | bytes():
+                treestamps.loads(path, yaml)
+            case Path():
+                treestamps.loadf(path)
 
     def load_map(self, grove: Mapping[Path, Mapping | str | bytes | Path]) -> None:
         """Load a grove of treestamps from a mapping."""
@@ -148,17 +239,116 @@ class Grovestamps(dict[Path, Treestamps]):
         warn("replaced by Grovestamps.dumpf()", PendingDeprecationWarning, stacklevel=2)
         self.dumpf()
 
+    def find_tree(self, path: Path | str) -> Treestamps | None:
+        """Return the tree with the deepest root containing a path."""
+        top_path = self._roots.find(get_absolute_parts(path))
+        return None if top_path is None else self[top_path]
+
+    def get_timestamp(self, path: Path | str) -> float | None:
+        """Get the timestamp of a path from the tree that holds it."""
+        treestamps = self.find_tree(path)
+        return None if treestamps is None else treestamps.get(path)
+
+    def is_stale(self, path: StatPath) -> bool:
+        """Return if a file was modified after its timestamp or has none."""
+        mtime = get_mtime(path)
+        return mtime is not None and is_newer(
+            mtime, self.get_timestamp(get_stat_path(path))
+        )
+
+    def filter_stale(self, paths: Iterable[StatPath]) -> Iterator[StatPath]:
+        """Yield the files modified after their timestamps or without one."""
+        return iter_stale(paths, self.get_many)
+
     def set(
         self,
         top_path: Path,
-        path: Path,
+        path: Path | str,
         mtime: float | None = None,
         *,
         compact: bool = False,
-    ) -> None:
+    ) -> float | None:
         """Set timestamp in tree."""
-        self[top_path].set(path, mtime, compact=compact)
+        return self[Path(top_path)].set(path, mtime, compact=compact)
+
+    def set_path(
+        self, path: Path | str, mtime: float | None = None, *, compact: bool = False
+    ) -> float | None:
+        """Set timestamp in the tree that holds a path."""
+        treestamps = self.find_tree(path)
+        if treestamps is None:
+            self._printer.skip("Timestamp outside all trees, ignored", path)
+            return None
+        return treestamps.set(path, mtime, compact=compact)
 
     def compact(self, top_path: Path, path: Path):
         """Compact timestamps in tree."""
         self[top_path].compact(path)
+
+    def is_ignored(self, path: Path | str) -> bool:
+        """Return if a path matches the ignore globs."""
+        return self._ignore.match(path)
+
+    def snapshot(self) -> GrovestampsSnapshot:
+        """Return a compact picklable copy of every tree for worker processes."""
+        return GrovestampsSnapshot(ts.snapshot() for ts in self.values())
+
+    def apply_sets(
+        self, sets: Iterable[tuple[Path | str, float]]
+    ) -> list[float | None]:
+        """Apply a batch of paths and timestamps set by workers."""
+        sets = tuple(sets)
+        return self.set_many([path for path, _ in sets], [mtime for _, mtime in sets])
+
+    def _route_paths(
+        self, paths: Iterable[Path | str]
+    ) -> tuple[int, dict[Path, list[tuple[int, Path | str]]]]:
+        """Group paths by the deepest tree root containing them."""
+        routes: dict[Path, list[tuple[int, Path | str]]] = {}
+        num_paths = 0
+        for index, path in enumerate(paths):
+            num_paths += 1
+            abs_parts = get_absolute_parts(path)
+            top_path = self._roots.find(abs_parts)
+            if top_path is None:
+                self._printer.skip("Timestamp outside all trees, ignored", abs_parts)
+            else:
+                routes.setdefault(top_path, []).append((index, path))
+        return num_paths, routes
+
+    def get_many(self, paths: Iterable[Path | str]) -> list[float | None]:
+        """Get the timestamps of many paths from the trees that hold them."""
+        num_paths, routes = self._route_paths(paths)
+        results: list[float | None] = [None] * num_paths
+        for top_path, indexed_paths in routes.items():
+            indexes, tree_paths = zip(*indexed_paths, strict=True)
+            tree_results = self[top_path].get_many(tree_paths)
+            for index, result in zip(indexes, tree_results, strict=True):
+                results[index] = result
+        return results
+
+    def set_many(
+        self,
+        paths: Iterable[Path | str],
+        mtimes: Iterable[float | None] | float | None = None,
+        *,
+        compact: bool = False,
+    ) -> list[float | None]:
+        """Set the timestamps of many paths in the trees that hold them."""
+        num_paths, routes = self._route_paths(paths)
+        if mtimes is None or isinstance(mtimes, int | float):
+            mtimes = [mtimes] * num_paths
+        else:
+            mtimes = list(mtimes)
+            if len(mtimes) != num_paths:
+                reason = f"{len(mtimes)} mtimes for {num_paths} paths"
+                raise ValueError(reason)
+        results: list[float | None] = [None] * num_paths
+        for top_path, indexed_paths in routes.items():
+            indexes, tree_paths = zip(*indexed_paths, strict=True)
+            tree_results = self[top_path].set_many(
+                tree_paths, [mtimes[index] for index in indexes], compact=compact
+            )
+            for index, result in zip(indexes, tree_results, strict=True):
+                results[index] = result
+        return results
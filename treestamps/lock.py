@@ -0,0 +1,71 @@
+"""Advisory file locks."""
+
+from pathlib import Path
+from types import TracebackType
+from typing import IO
+
+from typing_extensions import Self
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+def _check_supported() -> None:
+    """Raise if the platform has no advisory file locks."""
+    if fcntl is None:  # pragma: no cover
+        reason = "Advisory file locks are not supported on this platform"
+        raise ValueError(reason)
+
+
+def lock_file(file: IO, *, blocking: bool = True, shared: bool = False) -> bool:
+    """Take an exclusive or shared lock on an open file. Return if it was taken."""
+    _check_supported()
+    flags = fcntl.LOCK_SH if shared else fcntl.LOCK_EX  # pyright: ignore[reportOptionalMemberAccess]
+    if not blocking:
+        flags |= fcntl.LOCK_NB  # pyright: ignore[reportOptionalMemberAccess]
+    try:
+        fcntl.flock(file.fileno(), flags)  # pyright: ignore[reportOptionalMemberAccess]
+    except BlockingIOError:
+        return False
+    return True
+
+
+class FileLock:
+    """Exclusive or shared advisory lock on a file, held until released."""
+
+    def __init__(self, path: Path, *, shared: bool = False) -> None:
+        """Initialize an unheld lock."""
+        self.path: Path = path
+        self._shared: bool = shared
+        self._file: IO | None = None
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        """Open the file and lock it. Return if the lock was taken."""
+        file = self.path.open("a")
+        if not lock_file(file, blocking=blocking, shared=self._shared):
+            file.close()
+            return False
+        self._file = file
+        return True
+
+    def release(self) -> None:
+        """Release the lock by closing the file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> Self:
+        """Block until the lock is taken."""
+        self.acquire()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Release the lock."""
+        self.release()
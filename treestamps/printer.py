@@ -1,73 +1,134 @@
 """Print Messages."""
 
+import os
 from pathlib import Path
+from time import monotonic
 
-from termcolor import cprint
+from treestamps.sinks import (
+    EVENT_COMPACT,
+    EVENT_ERROR,
+    EVENT_LOAD,
+    EVENT_SAVE,
+    EVENT_SKIP,
+    EVENT_WARN,
+    PrinterEvent,
+    PrinterSink,
+    TerminalSink,
+)
+
+PrintablePath = Path | str | tuple[str, ...]
 
 
 class Printer:
-    """Printing messages."""
+    """
+    Printing messages.
+
+    verbose 0 prints nothing, 1 a progress line of event counts and warnings
+    and errors, 2 or more every event. Messages take %-style args and paths as
+    paths, strings or path parts so nothing is formatted unless it is printed.
+    Events go to the sink, colored lines on stdout by default.
+    """
 
-    def __init__(self, verbose: int) -> None:
-        """Initialize verbosity and flags."""
+    _PROGRESS_INTERVAL: float = 0.1
+
+    def __init__(self, verbose: int, sink: PrinterSink | None = None) -> None:
+        """Initialize verbosity, sink and progress counts."""
         self._verbose: int = verbose
-        self._after_newline: bool = True
+        self._sink: PrinterSink = sink if sink is not None else TerminalSink()
+        self._progress: dict[str, int] = dict.fromkeys(
+            (EVENT_LOAD, EVENT_SAVE, EVENT_SKIP, EVENT_COMPACT), 0
+        )
+        self._progress_pending: bool = False
+        self._next_progress: float = 0.0
+
+    @property
+    def sink(self) -> PrinterSink:
+        """Return the event sink."""
+        return self._sink
+
+    @staticmethod
+    def _format(message: str, args: tuple[object, ...]) -> str:
+        return message % args if args else message
+
+    @staticmethod
+    def _format_path(path: PrintablePath) -> str:
+        if isinstance(path, tuple):
+            return os.path.join(*path)  # noqa: PTH118
+        return str(path)
+
+    def _render_progress(self, now: float) -> None:
+        """Send the current counts to the sink."""
+        self._sink.progress(self._progress)
+        self._progress_pending = False
+        self._next_progress = now + self._PROGRESS_INTERVAL
+
+    def _tick(self, kind: str) -> None:
+        """Count a progress event, rendering at most every interval."""
+        self._progress[kind] += 1
+        self._progress_pending = True
+        now = monotonic()
+        if now >= self._next_progress:
+            self._render_progress(now)
 
-    def _message(
+    def _event(
         self,
-        reason: str,
-        color: str = "white",
-        attrs: list[str] | None = None,
-        *,
-        force_verbose: bool = False,
-        end: str = "\n",
+        kind: str,
+        message: str,
+        path: PrintablePath,
+        args: tuple[object, ...],
+        timestamp: float | None = None,
     ) -> None:
-        """Print a dot or skip message."""
-        if self._verbose < 1:
+        """Count the event at verbose 1 or emit it above."""
+        if self._verbose == 1:
+            self._tick(kind)
             return
-        if (self._verbose == 1 and not force_verbose) or not reason:
-            cprint(".", color, attrs=attrs, end="", flush=True)
-            self._after_newline = False
+        event = PrinterEvent(
+            kind, self._format(message, args), self._format_path(path), timestamp
+        )
+        self._sink.emit(event)
+
+    def flush(self) -> None:
+        """Render progress counted since the last render and flush the sink."""
+        if self._verbose < 1:
             return
-        if not self._after_newline:
-            reason = "\n" + reason
-        attrs = attrs or []
-        cprint(reason, color, attrs=attrs, end=end, flush=True)
-        if end:
-            self._after_newline = True
-
-    def skip(self, message: str, path: Path) -> None:
+        if self._progress_pending:
+            self._render_progress(monotonic())
+        self._sink.flush()
+
+    def skip(self, message: str, path: PrintablePath, *args: object) -> None:
         """Skip Message."""
-        parts = ["Skip", message, str(path)]
-        message = ": ".join(parts)
-        self._message(message, color="dark_grey")
+        if self._verbose >= 1:
+            self._event(EVENT_SKIP, message, path, args)
 
-    def load(self, message: str, path: Path) -> None:
-        """Save timestamps."""
-        message = f"{message} {path}"
-        self._message(message, color="cyan")
+    def load(self, message: str, path: PrintablePath, *args: object) -> None:
+        """Load timestamps."""
+        if self._verbose >= 1:
+            self._event(EVENT_LOAD, message, path, args)
 
-    def save(self, message: str, path: Path) -> None:
+    def save(self, message: str, path: PrintablePath, *args: object) -> None:
         """Save timestamps."""
-        message = f"{message} {path}"
-        self._message(message, color="green", attrs=["bold"])
+        if self._verbose >= 1:
+            self._event(EVENT_SAVE, message, path, args)
 
-    def compact(self, message: str, path: Path, timestamp: float) -> None:
+    def compact(
+        self,
+        message: str,
+        path: PrintablePath,
+        *args: object,
+        timestamp: float | None = None,
+    ) -> None:
         """Compact timestamps."""
-        message = ": ".join((message, str(path), str(timestamp)))
-        self._message(message, color="dark_grey", attrs=["dark"])
+        if self._verbose >= 1:
+            self._event(EVENT_COMPACT, message, path, args, timestamp)
 
     def warn(self, message: str, exc: Exception | None = None) -> None:
         """Warning."""
-        message = "WARNING: " + message
-        if exc:
-            message += f": {exc}"
-        self._after_newline = False
-        self._message(message, color="light_yellow", force_verbose=True)
+        if self._verbose >= 1:
+            exc_str = None if exc is None else str(exc)
+            self._sink.emit(PrinterEvent(EVENT_WARN, message, exc=exc_str))
 
     def error(self, message: str, exc: Exception | None = None) -> None:
         """Error."""
-        message = "ERROR: " + message
-        if exc:
-            message += f": {exc}"
-        self._message(message, color="light_red", force_verbose=True)
+        if self._verbose >= 1:
+            exc_str = None if exc is None else str(exc)
+            self._sink.emit(PrinterEvent(EVENT_ERROR, message, exc=exc_str))
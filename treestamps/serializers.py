@@ -0,0 +1,274 @@
+"""Timestamp file serializers."""
+
+import json
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator, Mapping
+from io import StringIO
+from itertools import islice
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, TextIO
+
+from ruamel.yaml import YAML, MappingNode, RoundTripRepresenter
+from ruamel.yaml.comments import CommentedMap, CommentedSet
+from ruamel.yaml.events import (
+    MappingEndEvent,
+    MappingStartEvent,
+    SequenceEndEvent,
+    SequenceStartEvent,
+    StreamEndEvent,
+)
+from ruamel.yaml.parser import Parser
+from ruamel.yaml.representer import SafeRepresenter
+
+YAML_FORMAT = "yaml"
+YAML_SAFE_FORMAT = "yaml_safe"
+JSONL_FORMAT = "jsonl"
+FILE_FORMATS = frozenset({JSONL_FORMAT, YAML_FORMAT, YAML_SAFE_FORMAT})
+
+
+def represent_frozenset(dumper: RoundTripRepresenter, data: frozenset) -> MappingNode:
+    """Represent frozenset as a CommentedSet."""
+    return dumper.represent_set(CommentedSet(data))
+
+
+def represent_mapping(dumper, data: Mapping):
+    """Represent Mappings as Mappings."""
+    return dumper.represent_dict(CommentedMap(data))
+
+
+class Serializer(ABC):
+    """Load and dump timestamp mappings."""
+
+    WAL_HEADER: str = ""
+    WAL_KEY: str = "wal"
+
+    @abstractmethod
+    def loads(self, text: str) -> Mapping | None:
+        """Load a mapping from a string."""
+
+    @abstractmethod
+    def dumps(self, data: Mapping) -> str:
+        """Dump a mapping to a string."""
+
+    @abstractmethod
+    def dump_wal_entry(self, path_str: str, mtime: float) -> str:
+        """Format a single appendable write ahead log entry."""
+
+    def dump_wal_entries(self, items: Iterable[tuple[str, float]]) -> str:
+        """Format many write ahead log entries for one write."""
+        return "".join(
+            self.dump_wal_entry(path_str, mtime) for path_str, mtime in items
+        )
+
+    def load(self, path: Path) -> Mapping | None:
+        """Load a mapping from a file."""
+        return self.loads(path.read_text(encoding="utf-8"))
+
+    def iter_load(self, file: TextIO) -> Iterator[tuple[Any, Any]]:
+        """
+        Iterate over the top level items of a mapping in a file.
+
+        Streaming serializers parse one item at a time and yield each write
+        ahead log entry as its own one entry list so the whole document is
+        never held in memory.
+        """
+        data = self.loads(file.read())
+        if data:
+            yield from data.items()
+
+    def dump(self, data: Mapping, path: Path) -> None:
+        """Dump a mapping to a file."""
+        path.write_text(self.dumps(data), encoding="utf-8")
+
+
+class YAMLSerializer(Serializer):
+    """Round trip YAML serializer. Slow but preserves the original format."""
+
+    WAL_HEADER: str = "wal:\n"
+
+    def __init__(self) -> None:
+        """Configure the YAML instance."""
+        self._yaml: YAML = self._create_yaml()
+
+    @staticmethod
+    def _create_yaml() -> YAML:
+        yaml = YAML(typ="rt")
+        yaml.allow_duplicate_keys = True
+        yaml.indent(offset=2)  # Conform to Prettier
+        yaml.representer.add_representer(frozenset, represent_frozenset)
+        yaml.representer.add_representer(Mapping, represent_mapping)
+        yaml.representer.add_representer(MappingProxyType, represent_mapping)
+        return yaml
+
+    def loads(self, text: str) -> Mapping | None:
+        """Load a mapping from a string."""
+        return self._yaml.load(text)
+
+    def dumps(self, data: Mapping) -> str:
+        """Dump a mapping to a string."""
+        with StringIO() as buf:
+            self._yaml.dump(data, buf)
+            return buf.getvalue()
+
+    def dump(self, data: Mapping, path: Path) -> None:
+        """Dump a mapping to a file."""
+        self._yaml.dump(data, path)
+
+    def iter_load(self, file: TextIO) -> Iterator[tuple[Any, Any]]:
+        """Compose and construct one top level item at a time."""
+        yaml = self._yaml
+        constructor, parser = yaml.get_constructor_parser(file)
+        composer = yaml.composer
+        composer.anchors = {}
+
+        def construct_next() -> Any:
+            return constructor.construct_document(composer.compose_node(None, None))
+
+        try:
+            parser.get_event()  # Stream start
+            if parser.check_event(StreamEndEvent):
+                return
+            parser.get_event()  # Document start
+            if not parser.check_event(MappingStartEvent):
+                reason = "timestamps document is not a mapping"
+                raise ValueError(reason)
+            parser.get_event()
+            while not parser.check_event(MappingEndEvent):
+                key = construct_next()
+                if key == self.WAL_KEY and parser.check_event(SequenceStartEvent):
+                    parser.get_event()
+                    while not parser.check_event(SequenceEndEvent):
+                        yield key, [construct_next()]
+                    parser.get_event()
+                else:
+                    yield key, construct_next()
+        finally:
+            parser.dispose()
+            yaml.reader.reset_reader()
+            yaml.scanner.reset_scanner()
+
+    def dump_wal_entry(self, path_str: str, mtime: float) -> str:
+        """Manually construct yaml dict list item."""
+        # JSON strings are valid YAML double quoted scalars.
+        path_str = json.dumps(path_str, ensure_ascii=False)
+        return f"- {path_str}: {mtime}\n"
+
+
+class YAMLSafeSerializer(YAMLSerializer):
+    """Safe YAML serializer. Uses libyaml if ruamel.yaml.clib is installed."""
+
+    @staticmethod
+    def _create_yaml() -> YAML:
+        yaml = YAML(typ="safe")
+        yaml.allow_duplicate_keys = True
+        yaml.default_flow_style = False
+        representer = yaml.representer
+        representer.add_representer(frozenset, SafeRepresenter.represent_set)
+        representer.add_representer(tuple, SafeRepresenter.represent_list)
+        representer.add_representer(MappingProxyType, SafeRepresenter.represent_dict)
+        return yaml
+
+    def iter_load(self, file: TextIO) -> Iterator[tuple[Any, Any]]:
+        """Stream with the pure parser, libyaml can only load whole documents."""
+        if self._yaml.Parser is Parser:
+            yield from super().iter_load(file)
+        else:
+            yield from Serializer.iter_load(self, file)
+
+
+class JSONLinesSerializer(Serializer):
+    """
+    JSON Lines serializer.
+
+    Every line is a JSON object that updates the document so dumps stream
+    and write ahead log entries may be appended.
+    """
+
+    _SET_TAG: str = "!!set"
+    _CHUNK_SIZE: int = 1024
+
+    @classmethod
+    def _encode(cls, value: Any) -> Any:
+        """Encode types json does not know."""
+        if isinstance(value, set | frozenset):
+            return {cls._SET_TAG: sorted(value, key=str)}
+        if isinstance(value, Mapping):
+            return dict(value)
+        reason = f"{type(value).__name__} is not JSON serializable"
+        raise TypeError(reason)
+
+    @classmethod
+    def _decode(cls, obj: dict) -> Any:
+        """Decode tagged sets."""
+        if len(obj) == 1 and cls._SET_TAG in obj:
+            return set(obj[cls._SET_TAG])
+        return obj
+
+    def loads(self, text: str) -> Mapping | None:
+        """Load a mapping from a string."""
+        lines = iter(text.splitlines())
+        header = next(lines, None)
+        if header is None:
+            return None
+        data = json.loads(header, object_hook=self._decode)
+        for line in lines:
+            if line:
+                data.update(json.loads(line))
+        return data
+
+    def iter_load(self, file: TextIO) -> Iterator[tuple[Any, Any]]:
+        """Parse one line at a time."""
+        header = file.readline()
+        if not header:
+            return
+        yield from json.loads(header, object_hook=self._decode).items()
+        for line in file:
+            if line.strip():
+                yield from json.loads(line).items()
+
+    def dumps(self, data: Mapping) -> str:
+        """Dump a header line of the config and lines of timestamp chunks."""
+        header = {}
+        entries = {}
+        for key, value in data.items():
+            if isinstance(value, int | float):
+                entries[key] = value
+            else:
+                header[key] = value
+        lines = [json.dumps(header, default=self._encode)]
+        items = iter(entries.items())
+        while chunk := dict(islice(items, self._CHUNK_SIZE)):
+            lines.append(json.dumps(chunk))
+        return "\n".join(lines) + "\n"
+
+    def dump_wal_entry(self, path_str: str, mtime: float) -> str:
+        """Format a single entry line."""
+        return json.dumps({path_str: mtime}) + "\n"
+
+    def dump_wal_entries(self, items: Iterable[tuple[str, float]]) -> str:
+        """Format entries as chunked lines."""
+        items = iter(items)
+        lines = []
+        while chunk := dict(islice(items, self._CHUNK_SIZE)):
+            lines.append(json.dumps(chunk) + "\n")
+        return "".join(lines)
+
+
+_SERIALIZERS: MappingProxyType[str, type[Serializer]] = MappingProxyType(
+    {
+        JSONL_FORMAT: JSONLinesSerializer,
+        YAML_FORMAT: YAMLSerializer,
+        YAML_SAFE_FORMAT: YAMLSafeSerializer,
+    }
+)
+
+
+def get_serializer(file_format: str) -> Serializer:
+    """Create a serializer for a file format."""
+    return _SERIALIZERS[file_format]()
+
+
+def is_jsonl(text: str) -> bool:
+    """Sniff if text is JSON lines rather than YAML."""
+    return text.lstrip()[:1] == "{"
@@ -0,0 +1,288 @@
+"""Destinations for printer events."""
+
+import atexit
+import json
+import logging
+import sys
+from abc import ABC, abstractmethod
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from queue import SimpleQueue
+from threading import Event, Thread
+from time import time
+from typing import TextIO
+
+from termcolor import colored
+
+EVENT_SKIP = "skip"
+EVENT_LOAD = "load"
+EVENT_SAVE = "save"
+EVENT_COMPACT = "compact"
+EVENT_WARN = "warn"
+EVENT_ERROR = "error"
+
+
+@dataclass(slots=True)
+class PrinterEvent:
+    """A message for a sink."""
+
+    kind: str
+    message: str
+    path: str | None = None
+    timestamp: float | None = None
+    exc: str | None = None
+    time: float = field(default_factory=time)
+
+    def text(self) -> str:
+        """Return the event as one line of text."""
+        match self.kind:
+            case "skip":
+                return f"Skip: {self.message}: {self.path}"
+            case "load" | "save":
+                return f"{self.message} {self.path}"
+            case "compact":
+                parts = [self.message, str(self.path)]
+                if self.timestamp is not None:
+                    parts.append(str(self.timestamp))
+                return ": ".join(parts)
+        text = ("WARNING: " if self.kind == EVENT_WARN else "ERROR: ") + self.message
+        if self.exc:
+            text += f": {self.exc}"
+        return text
+
+    def as_dict(self) -> dict:
+        """Return the event as a dict without empty fields."""
+        event = {"event": self.kind, "time": self.time, "message": self.message}
+        if self.path is not None:
+            event["path"] = self.path
+        if self.timestamp is not None:
+            event["timestamp"] = self.timestamp
+        if self.exc is not None:
+            event["exc"] = self.exc
+        return event
+
+
+class PrinterSink(ABC):
+    """
+    A destination for printer events.
+
+    Printers call emit() for each event, progress() with event counts at
+    verbose 1 and flush() after each load and dump. Sinks that buffer write
+    their events out on flush().
+    """
+
+    @abstractmethod
+    def emit(self, event: PrinterEvent) -> None:
+        """Write an event."""
+
+    def write(self, events: Sequence[PrinterEvent]) -> None:
+        """Write a batch of events."""
+        for event in events:
+            self.emit(event)
+
+    def progress(self, counts: Mapping[str, int]) -> None:  # noqa: B027
+        """Show counts of the events not emitted."""
+
+    def flush(self) -> None:  # noqa: B027
+        """Write out buffered events."""
+
+    def close(self) -> None:
+        """Write out buffered events and release resources."""
+        self.flush()
+
+
+class TerminalSink(PrinterSink):
+    """Colored lines and a progress line on stdout."""
+
+    _COLORS: Mapping[str, tuple[str, tuple[str, ...]]] = {
+        EVENT_SKIP: ("dark_grey", ()),
+        EVENT_LOAD: ("cyan", ()),
+        EVENT_SAVE: ("green", ("bold",)),
+        EVENT_COMPACT: ("dark_grey", ("dark",)),
+        EVENT_WARN: ("light_yellow", ()),
+        EVENT_ERROR: ("light_red", ()),
+    }
+    _PROGRESS_LABELS: Mapping[str, str] = {
+        EVENT_LOAD: "loaded",
+        EVENT_SAVE: "saved",
+        EVENT_SKIP: "skipped",
+        EVENT_COMPACT: "compacted",
+    }
+
+    def __init__(self, file: TextIO | None = None) -> None:
+        """Initialize the stream and line state."""
+        self._file: TextIO | None = file
+        self._after_newline: bool = True
+
+    def _line(self, event: PrinterEvent) -> str:
+        color, attrs = self._COLORS[event.kind]
+        line = colored(event.text(), color, attrs=attrs)
+        if not self._after_newline or event.kind == EVENT_WARN:
+            line = "\n" + line
+        self._after_newline = True
+        return line + "\n"
+
+    def _print(self, text: str) -> None:
+        file = self._file or sys.stdout
+        file.write(text)
+        file.flush()
+
+    def emit(self, event: PrinterEvent) -> None:
+        """Print an event on its own line."""
+        self._print(self._line(event))
+
+    def write(self, events: Sequence[PrinterEvent]) -> None:
+        """Print a batch of events with one write."""
+        self._print("".join(self._line(event) for event in events))
+
+    def progress(self, counts: Mapping[str, int]) -> None:
+        """Overwrite the progress line with the current counts."""
+        line = ", ".join(
+            colored(f"{label} {counts[kind]}", self._COLORS[kind][0])
+            for kind, label in self._PROGRESS_LABELS.items()
+            if counts.get(kind)
+        )
+        self._print("\r" + line)
+        self._after_newline = False
+
+
+class LoggingSink(PrinterSink):
+    """Log events to a stdlib logger."""
+
+    _LEVELS: Mapping[str, int] = {
+        EVENT_SKIP: logging.DEBUG,
+        EVENT_COMPACT: logging.DEBUG,
+        EVENT_LOAD: logging.INFO,
+        EVENT_SAVE: logging.INFO,
+        EVENT_WARN: logging.WARNING,
+        EVENT_ERROR: logging.ERROR,
+    }
+
+    def __init__(self, logger: logging.Logger | str = "treestamps") -> None:
+        """Initialize the logger."""
+        self._logger: logging.Logger = (
+            logger if isinstance(logger, logging.Logger) else logging.getLogger(logger)
+        )
+
+    def emit(self, event: PrinterEvent) -> None:
+        """Log an event at its level with the event in extra."""
+        level = self._LEVELS[event.kind]
+        if self._logger.isEnabledFor(level):
+            self._logger.log(
+                level, "%s", event.text(), extra={"treestamps": event.as_dict()}
+            )
+
+
+class JSONLinesSink(PrinterSink):
+    """Write events as JSON Lines, batch_size lines at a time."""
+
+    def __init__(self, file: TextIO, batch_size: int = 256) -> None:
+        """Initialize the stream and buffer."""
+        self._file: TextIO = file
+        self._batch_size: int = batch_size
+        self._lines: list[str] = []
+
+    def emit(self, event: PrinterEvent) -> None:
+        """Buffer an event."""
+        self._lines.append(json.dumps(event.as_dict()) + "\n")
+        if len(self._lines) >= self._batch_size:
+            self._write_lines()
+
+    def _write_lines(self) -> None:
+        if self._lines:
+            self._file.write("".join(self._lines))
+            self._lines = []
+
+    def flush(self) -> None:
+        """Write out buffered events."""
+        self._write_lines()
+        self._file.flush()
+
+
+class BackgroundSink(PrinterSink):
+    """
+    Hand events to another sink on a background thread.
+
+    emit() only queues, so printing never blocks the caller on I/O, like an
+    asyncio event loop. The thread writes whatever has queued up as one
+    batch. flush() waits until everything queued is written. Sinks that are
+    not closed are closed at exit so queued events are not lost. If the sink
+    fails, the error is printed on stderr and later events are dropped.
+    """
+
+    _STOP: object = object()
+    _FLUSH_POLL: float = 0.1
+
+    def __init__(self, sink: PrinterSink, batch_size: int = 1024) -> None:
+        """Start the writer thread."""
+        self._sink: PrinterSink = sink
+        self._batch_size: int = batch_size
+        self._queue: SimpleQueue = SimpleQueue()
+        self._closed: bool = False
+        self._thread: Thread = Thread(
+            target=self._run, name="treestamps-sink", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _write_batch(self, batch: list[PrinterEvent]) -> None:
+        if batch:
+            self._sink.write(batch)
+            batch.clear()
+
+    def _consume(self) -> None:
+        batch: list[PrinterEvent] = []
+        while True:
+            item = self._queue.get()
+            if isinstance(item, PrinterEvent):
+                batch.append(item)
+                if len(batch) >= self._batch_size or self._queue.empty():
+                    self._write_batch(batch)
+                continue
+            self._write_batch(batch)
+            if item is self._STOP:
+                self._sink.close()
+                return
+            if isinstance(item, Event):
+                self._sink.flush()
+                item.set()
+            else:
+                self._sink.progress(item)
+
+    def _run(self) -> None:
+        try:
+            self._consume()
+        except Exception as exc:
+            # Don't queue events for a thread that is gone.
+            self._closed = True
+            sys.stderr.write(
+                f"ERROR: {type(self._sink).__name__} failed, "
+                f"dropping printer events: {exc}\n"
+            )
+
+    def emit(self, event: PrinterEvent) -> None:
+        """Queue an event."""
+        if not self._closed:
+            self._queue.put(event)
+
+    def progress(self, counts: Mapping[str, int]) -> None:
+        """Queue a copy of the counts."""
+        if not self._closed:
+            self._queue.put(dict(counts))
+
+    def flush(self) -> None:
+        """Wait for queued events to be written and flushed."""
+        if not self._thread.is_alive():
+            return
+        done = Event()
+        self._queue.put(done)
+        while not done.wait(self._FLUSH_POLL) and self._thread.is_alive():
+            pass
+
+    def close(self) -> None:
+        """Write queued events, close the sink and stop the thread."""
+        atexit.unregister(self.close)
+        self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
@@ -0,0 +1,48 @@
+"""Compare file modification times to timestamps."""
+
+import os
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+from pathlib import Path
+
+StatPath = Path | str | os.DirEntry
+GetMany = Callable[[list[Path | str]], list[float | None]]
+
+_CHUNK_SIZE = 4096
+
+
+def get_mtime(path: StatPath) -> float | None:
+    """Return a file's modification time or None if it can not be read."""
+    try:
+        # DirEntry caches its stat, so walks that already called it pay once.
+        stat = path.stat() if isinstance(path, os.DirEntry) else os.stat(path)  # noqa: PTH116
+    except OSError:
+        return None
+    return stat.st_mtime
+
+
+def get_stat_path(path: StatPath) -> Path | str:
+    """Return the path of a path or a DirEntry."""
+    return path.path if isinstance(path, os.DirEntry) else path
+
+
+def is_newer(mtime: float | None, timestamp: float | None) -> bool:
+    """Return if a file that exists was modified after its timestamp."""
+    return mtime is not None and (timestamp is None or mtime > timestamp)
+
+
+def iter_stale(
+    paths: Iterable[StatPath],
+    get_many: GetMany,
+    resolve: Callable[[StatPath], StatPath] | None = None,
+) -> Iterator[StatPath]:
+    """Yield the paths modified after their timestamps, in chunks of lookups."""
+    paths = iter(paths)
+    while chunk := tuple(islice(paths, _CHUNK_SIZE)):
+        stat_paths = tuple(map(resolve, chunk)) if resolve else chunk
+        timestamps = get_many([get_stat_path(path) for path in stat_paths])
+        for path, stat_path, timestamp in zip(
+            chunk, stat_paths, timestamps, strict=True
+        ):
+            if is_newer(get_mtime(stat_path), timestamp):
+                yield path
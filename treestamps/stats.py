@@ -0,0 +1,113 @@
+"""Load and dump statistics."""
+
+from collections.abc import Callable, Generator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from threading import Lock
+from time import perf_counter
+from typing import Any
+
+StatsCallback = Callable[[dict[str, Any]], None]
+
+COUNTERS = (
+    "files_loaded",
+    "files_consumed",
+    "files_skipped",
+    "bytes_parsed",
+    "entries_loaded",
+    "entries_rejected",
+    "wal_entries_written",
+    "compacted",
+)
+
+
+class Stats:
+    """
+    Counters and per phase timers for loading and dumping.
+
+    Counters:
+        files_loaded: timestamp files and strings read.
+        files_consumed: child timestamp files merged into the tree.
+        files_skipped: files skipped because their config did not match.
+        bytes_parsed: size of the files and strings read.
+        entries_loaded: timestamps accepted into the cache.
+        entries_rejected: invalid timestamps and those older than an ancestor.
+        wal_entries_written: entries appended to the WAL.
+        compacted: timestamps removed by compaction.
+
+    Phases accumulate seconds and calls, summed across threads:
+        load_tree, load_parents, load_children, parse, merge, dump,
+        dump_dict, serialize, cleanup, compact.
+
+    The callback is called with as_dict() after each tree loads or dumps.
+    Share one Stats between trees to total them.
+    """
+
+    enabled: bool = True
+
+    def __init__(self, callback: StatsCallback | None = None) -> None:
+        """Initialize empty counters and timers."""
+        self._callback: StatsCallback | None = callback
+        self._lock: Lock = Lock()
+        self.counters: dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self.seconds: dict[str, float] = {}
+        self.calls: dict[str, int] = {}
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Add to a counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextmanager
+    def _timer(self, phase: str) -> Generator[None, None, None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - start
+            with self._lock:
+                self.seconds[phase] = self.seconds.get(phase, 0.0) + elapsed
+                self.calls[phase] = self.calls.get(phase, 0) + 1
+
+    def timer(self, phase: str) -> AbstractContextManager:
+        """Time a phase."""
+        return self._timer(phase)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters and phase timings as a dict."""
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "phases": {
+                    phase: {"seconds": seconds, "calls": self.calls[phase]}
+                    for phase, seconds in self.seconds.items()
+                },
+            }
+
+    def reset(self) -> None:
+        """Zero the counters and timers."""
+        with self._lock:
+            self.counters = dict.fromkeys(COUNTERS, 0)
+            self.seconds = {}
+            self.calls = {}
+
+    def report(self) -> None:
+        """Send the stats to the callback."""
+        if self._callback:
+            self._callback(self.as_dict())
+
+
+class NullStats(Stats):
+    """Stats that record nothing, the default."""
+
+    enabled: bool = False
+    _NULL_TIMER: AbstractContextManager = nullcontext()
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Do nothing."""
+
+    def timer(self, phase: str) -> AbstractContextManager:  # noqa: ARG002
+        """Return a reusable context that does nothing."""
+        return self._NULL_TIMER
+
+    def report(self) -> None:
+        """Do nothing."""
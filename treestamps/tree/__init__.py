@@ -1,9 +1,44 @@
 """Timestamp writer for keeping track of bulk optimizations."""
 
-from treestamps.tree.dump import TreestampsDump
-from treestamps.tree.load import TreestampLoad
-from treestamps.tree.set import TreestampsSet
+from typing import overload
+from warnings import warn
 
+from typing_extensions import deprecated
 
-class Treestamps(TreestampsSet, TreestampLoad, TreestampsDump):
+from treestamps.tree.writers import TreestampsWriters
+
+
+class Treestamps(TreestampsWriters):
     """Treestamps object to hold settings and caches."""
+
+    def loadf_tree(self) -> None:
+        """Load the timestamp files of this tree and report progress and stats."""
+        with self._stats.timer("load_tree"):
+            super().loadf_tree()
+        self._printer.flush()
+        self._stats.report()
+
+    @overload
+    def dumpf(self) -> None:
+        pass
+
+    @deprecated("Treestamps.dumpf(noop) is deprecated, Use dumpf() instead")
+    @overload
+    def dumpf(self, *, noop: bool) -> None:
+        pass
+
+    def dumpf(self, *, noop: bool | None = None) -> None:
+        """Serialize timestamps, dump to file and report progress and stats."""
+        if noop is not None:
+            warn(
+                (
+                    "Treestamps.dumpf(noop) is deprecated; Treestamps now tracks changes "
+                    "internally. Stop calling set() on unchanged files instead."
+                ),
+                DeprecationWarning,
+                stacklevel=2,
+            )
+        with self._stats.timer("dump"):
+            super().dumpf()
+        self._printer.flush()
+        self._stats.report()
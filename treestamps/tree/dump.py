@@ -1,14 +1,16 @@
 """Dump Methods."""
 
-from contextlib import suppress
+import os
+from collections.abc import Iterable
 from pathlib import Path
-from typing import TextIO, overload
+from threading import Thread
+from uuid import uuid4
 from warnings import warn
 
-from ruamel.yaml import StringIO
-from typing_extensions import deprecated
-
+from treestamps.serializers import get_serializer
 from treestamps.tree.init import TreestampsInit
+from treestamps.tree.store import Parts
+from treestamps.wal import WAL_MODE_DELTA
 
 
 class TreestampsDump(TreestampsInit):
@@ -18,6 +20,15 @@ class TreestampsDump(TreestampsInit):
         """Get the path string relative to the root_dir."""
         return str(abs_path.relative_to(self.root_dir))
 
+    def _get_relative_parts_str(self, abs_parts: Parts) -> str:
+        """Get the path string of absolute path parts relative to the root_dir."""
+        root_parts = self.root_dir.parts
+        depth = len(root_parts)
+        if abs_parts[:depth] != root_parts:
+            reason = f"{Path(*abs_parts)} is not in the subpath of {self.root_dir}"
+            raise ValueError(reason)
+        return os.sep.join(abs_parts[depth:]) or "."  # noqa: PTH118
+
     def _get_dumpable_program_config(self) -> dict:
         """Set the config tag in the yaml to be dumped."""
         # NOTE: Treestamps symlinks & ignore options should be represented in
@@ -33,23 +44,19 @@ class TreestampsDump(TreestampsInit):
 
     def _close_wal(self) -> None:
         """Close the write ahead log."""
-        if self._wal is None:
-            return
-        with suppress(AttributeError):
-            self._wal.close()
-        self._wal: None | TextIO = None
+        self._wal.close()
 
     def dump_dict(self) -> dict:
         """Serialize timestamps and dump to a dict."""
-        yaml = {}
-        for abs_path, timestamp in self._timestamps.items():
-            try:
-                rel_path_str = self._get_relative_path_str(abs_path)
-                yaml[rel_path_str] = timestamp
-            except Exception as exc:
-                self._printer.warn(f"Serializing {abs_path}", exc)
-        config_yaml = self._get_dumpable_program_config()
-        yaml.update(config_yaml)
+        # Config first so loaders can stream entries straight into the cache.
+        yaml = self._get_dumpable_program_config()
+        with self._stats.timer("dump_dict"):
+            for abs_parts, timestamp in self._timestamps.iter_parts():
+                try:
+                    rel_path_str = self._get_relative_parts_str(abs_parts)
+                    yaml[rel_path_str] = timestamp
+                except Exception as exc:
+                    self._printer.warn(f"Serializing {Path(*abs_parts)}", exc)
         self._close_wal()
         return yaml
 
@@ -58,71 +65,188 @@ class TreestampsDump(TreestampsInit):
         if not self._consumed_paths:
             return
         self._consumed_paths.discard(self._dump_path)
-        for path in self._consumed_paths:
-            try:
-                path.unlink(missing_ok=True)
-            except Exception as exc:
-                self._printer.warn(f"Removing old timestamp {path}", exc)
+        with self._stats.timer("cleanup"):
+            for path in self._consumed_paths:
+                try:
+                    path.unlink(missing_ok=True)
+                except Exception as exc:
+                    self._printer.warn(f"Removing old timestamp {path}", exc)
         self._consumed_paths: set[Path] = set()
 
     def dumps(self) -> str:
         """Dump to string."""
         # NOTE Does not cleanup old timestamps from disk
         yaml = self.dump_dict()
-        with StringIO() as buf:
-            self._YAML.dump(yaml, buf)
-            return buf.getvalue()
+        return self._serializer.dumps(yaml)
+
+    def _is_wal_delta(self) -> bool:
+        """Return if a new WAL only records timestamps set after it opens."""
+        return self._config.wal_mode == WAL_MODE_DELTA or self._can_dumpf_segment()
 
     def _dumpf_init_wal(self) -> None:
         """Write a new wal file to disk."""
-        yaml = self.dump_dict()
-        self._YAML.dump(yaml, self._wal_path)
+        if self._is_wal_delta():
+            # Only record deltas on top of the root snapshot.
+            yaml = self._get_dumpable_program_config()
+            generation = self._generations.get(self.root_dir)
+            self._set_metadata(yaml, self._WAL_BASE_TAG, generation)
+        else:
+            yaml = self.dump_dict()
+        self._serializer.dump(yaml, self._wal_path)
 
     def _were_child_timestamps_consumed(self) -> bool:
         root_consumed_paths = frozenset({self._dump_path, self._wal_path})
         child_consumed_paths = frozenset(self._consumed_paths - root_consumed_paths)
         return bool(child_consumed_paths)
 
-    @overload
-    def dumpf(self) -> None:
-        pass
+    def _can_dumpf_segment(self) -> bool:
+        """Return if only the changes since the last dump need writing."""
+        return (
+            self._is_incremental()
+            and not self._wal_recovered
+            and self.root_dir in self._generations
+            and self._dump_path.exists()
+            and not self._were_child_timestamps_consumed()
+        )
+
+    def _compact_parts(self, parts_list: Iterable[Parts]) -> int:
+        """Compact below many paths in one pass. Return the deleted count."""
+        with self._stats.timer("compact"):
+            deleted = self._timestamps.compact_many(parts_list)
+        self._stats.count("compacted", deleted)
+        return deleted
+
+    def _auto_compact(self) -> None:
+        """Compact below the paths set since the last dump."""
+        if not self._config.auto_compact:
+            return
+        if self._wal_recovered or self._were_child_timestamps_consumed():
+            # Merged files may hold entries older than any ancestor.
+            self._compact_pending = {self.root_dir.parts}
+        if not self._compact_pending:
+            return
+        deleted = self._compact_parts(self._compact_pending)
+        self._compact_pending = set()
+        if deleted:
+            self._printer.compact(
+                "Compacted %d timestamps under", self.root_dir, deleted
+            )
+
+    def _join_compaction(self) -> None:
+        """Wait for a background compaction to finish."""
+        if self._compaction_thread:
+            self._compaction_thread.join()
+            self._compaction_thread = None
+
+    def _write_snapshot(self, yaml: dict, old_segments: list[Path]) -> None:
+        """Atomically replace the main file and remove the segments it covers."""
+        try:
+            # Serializers are not thread safe, so use a private one.
+            serializer = get_serializer(self._config.file_format)
+            tmp_path = self._dump_path.with_name(self._dump_path.name + ".tmp")
+            with self._stats.timer("serialize"):
+                serializer.dump(yaml, tmp_path)
+            tmp_path.replace(self._dump_path)
+            for path in old_segments:
+                path.unlink(missing_ok=True)
+            self._printer.save("Compacted timestamp segments for", self.root_dir)
+        except Exception as exc:
+            self._printer.error(
+                f"Compacting timestamp segments for {self.root_dir}", exc
+            )
 
-    @deprecated("Treestamps.dumpf(noop) is deprecated, Use dumpf() instead")
-    @overload
-    def dumpf(self, *, noop: bool) -> None:
-        pass
+    def _write_dump_file(self, yaml: dict) -> None:
+        """Write the main file."""
+        with self._stats.timer("serialize"):
+            self._serializer.dump(yaml, self._dump_path)
 
-    def dumpf(self, *, noop: bool | None = None) -> None:
+    def _dumpf_full(self, *, background: bool = False) -> None:
+        """Write every timestamp to the main file."""
+        self._join_compaction()
+        yaml = self.dump_dict()
+        if self._uses_generations():
+            generation = uuid4().hex
+            self._set_metadata(yaml, self._GENERATION_TAG, generation)
+            self._generations[self.root_dir] = generation
+            self._segment_seq = 0
+        old_segments = self._segment_paths
+        self._segment_paths = []
+        self._dirty = {}
+        if background:
+            self._compaction_thread = Thread(
+                target=self._write_snapshot,
+                args=(yaml, old_segments),
+                name="treestamps-compact",
+            )
+            self._compaction_thread.start()
+            return
+        self._write_dump_file(yaml)
+        for path in old_segments:
+            try:
+                path.unlink(missing_ok=True)
+            except Exception as exc:
+                self._printer.warn(f"Removing old timestamp segment {path}", exc)
+        self._printer.save("Saved timestamps for", self.root_dir)
+
+    def _dumpf_segment(self) -> None:
+        """Write only the timestamps set since the last dump to a new segment."""
+        yaml = self._get_dumpable_program_config()
+        for abs_parts, timestamp in self._dirty.items():
+            try:
+                yaml[self._get_relative_parts_str(abs_parts)] = timestamp
+            except Exception as exc:
+                self._printer.warn(f"Serializing {Path(*abs_parts)}", exc)
+        generation = self._generations[self.root_dir]
+        self._set_metadata(yaml, self._WAL_BASE_TAG, generation)
+        filename = self.get_segment_filename(
+            self._config.program_name, generation, self._segment_seq
+        )
+        segment_path = self.root_dir / filename
+        with self._stats.timer("serialize"):
+            self._serializer.dump(yaml, segment_path)
+        self._segment_seq += 1
+        self._segment_paths.append(segment_path)
+        self._dirty = {}
+        self._close_wal()
+        self._printer.save("Saved timestamp changes for", self.root_dir)
+        if len(self._segment_paths) > self._config.segment_limit:
+            self._dumpf_full(background=True)
+
+    def dumpf(self) -> None:
         """
         Serialize timestamps and dump to file.
 
         Treestamps decides if the dump write to disk needs to happened by whether
         set() has been called since the last dump the file does not exist or we ate
         child timestamp files.
+
+        With auto_compact, timestamps older than an ancestor are first removed
+        below every path set since the last dump, or below the root if child
+        timestamp files were merged.
+
+        With dump_mode incremental, only timestamps set since the last dump are
+        written to a small segment file beside the main file. Once there are more
+        than segment_limit segments they are compacted into the main file in a
+        background thread.
         """
-        if noop is not None:
-            warn(
-                (
-                    "Treestamps.dumpf(noop) is deprecated; Treestamps now tracks changes "
-                    "internally. Stop calling set() on unchanged files instead."
-                ),
-                DeprecationWarning,
-                stacklevel=2,
-            )
         changed = (
             self._changed
+            or self._wal_recovered
             or not self._dump_path.exists()
             or self._were_child_timestamps_consumed()
         )
-        if changed:
-            yaml = self.dump_dict()
-            self._YAML.dump(yaml, self._dump_path)
-            self._printer.save("Saved timestamps for", self.root_dir)
-        else:
+        if not changed:
             self._close_wal()
             self._printer.skip("updating timestamps for", self.root_dir)
+        else:
+            self._auto_compact()
+            if self._can_dumpf_segment():
+                self._dumpf_segment()
+            else:
+                self._dumpf_full()
         self.cleanup_old_timestamps()
         self._changed = False
+        self._wal_recovered = False
 
     def dump(self) -> None:
         """Compatibility alias for dumpf()."""
@@ -1,7 +1,10 @@
 """Get Methods."""
 
+import os
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
+from treestamps.stale import StatPath, get_mtime, get_stat_path, is_newer, iter_stale
 from treestamps.tree.init import TreestampsInit
 
 
@@ -15,14 +18,35 @@ class TreestampsGet(TreestampsInit):
 
     def get(self, path: Path | str) -> float | None:
         """Get the timestamps up the directory tree. All the way to root."""
-        mtime: float | None = None
-        abs_path = self._get_absolute_path(self.root_dir, path)
-        if not abs_path:
-            return mtime
-
-        # Walk up the tree to get the maximum time.
-        while abs_path != abs_path.parent:
-            mtime = self.max_none(mtime, self._timestamps.get(abs_path))
-            abs_path = abs_path.parent
-
-        return mtime
+        abs_parts = self._get_absolute_parts(self.root_dir, path)
+        if abs_parts is None:
+            return None
+        self._load_parts((abs_parts,))
+
+        # Walk down the tree to get the maximum time.
+        return self._timestamps.get_max(abs_parts)
+
+    def get_many(self, paths: Iterable[Path | str]) -> list[float | None]:
+        """Get the timestamps of many paths, sharing lookups among siblings."""
+        parts_list = [self._get_absolute_parts(self.root_dir, path) for path in paths]
+        found = [parts for parts in parts_list if parts is not None]
+        self._load_parts(found)
+        maxes = iter(self._timestamps.get_max_many(found))
+        return [None if parts is None else next(maxes) for parts in parts_list]
+
+    def _resolve_stat_path(self, path: StatPath) -> StatPath:
+        """Return the file a relative path's timestamp refers to."""
+        if isinstance(path, os.DirEntry) or os.path.isabs(path):  # noqa: PTH117
+            return path
+        abs_parts = self._get_absolute_parts(self.root_dir, path)
+        return path if abs_parts is None else os.path.join(*abs_parts)  # noqa: PTH118
+
+    def is_stale(self, path: StatPath) -> bool:
+        """Return if a file was modified after its timestamp or has none."""
+        path = self._resolve_stat_path(path)
+        mtime = get_mtime(path)
+        return mtime is not None and is_newer(mtime, self.get(get_stat_path(path)))
+
+    def filter_stale(self, paths: Iterable[StatPath]) -> Iterator[StatPath]:
+        """Yield the files modified after their timestamps or without one."""
+        return iter_stale(paths, self.get_many, self._resolve_stat_path)
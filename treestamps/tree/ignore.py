@@ -0,0 +1,95 @@
+"""Compiled ignore glob matching."""
+
+import os
+import re
+from collections.abc import Iterable
+from fnmatch import translate
+from pathlib import PurePath
+
+from treestamps.tree.store import Parts
+
+# Skip normalizing case where paths are case sensitive like pathlib does.
+_CASE_SENSITIVE = os.path.normcase("A") == "A"
+
+
+def _normcase(name: str) -> str:
+    return name if _CASE_SENSITIVE else os.path.normcase(name)
+
+
+class IgnoreMatcher:
+    """
+    Match paths against ignore globs with the semantics of PurePath.match().
+
+    Globs are compiled once. Single component globs like "*.tmp" or ".git"
+    are joined into one regex that only looks at the path's name. Relative
+    multi component globs match the end of the path and absolute globs match
+    the whole path, one component at a time.
+    """
+
+    def __init__(self, globs: Iterable[str]) -> None:
+        """Compile the globs."""
+        name_regexes = []
+        self._part_globs: list[tuple[bool, tuple[re.Pattern, ...]]] = []
+        for glob in sorted(globs):
+            pure_glob = PurePath(os.path.normcase(glob))
+            if not pure_glob.parts:
+                reason = f"Empty ignore glob {glob!r}"
+                raise ValueError(reason)
+            anchored = bool(pure_glob.drive or pure_glob.root)
+            if not anchored and len(pure_glob.parts) == 1:
+                name_regexes.append(translate(pure_glob.parts[0]))
+                continue
+            regexes = tuple(
+                re.compile(
+                    re.escape(part) if anchored and not index else translate(part)
+                )
+                for index, part in enumerate(pure_glob.parts)
+            )
+            self._part_globs.append((anchored, regexes))
+        self._name_re: re.Pattern | None = (
+            re.compile("|".join(name_regexes)) if name_regexes else None
+        )
+
+    def __bool__(self) -> bool:
+        """Return if there are any globs."""
+        return bool(self._name_re or self._part_globs)
+
+    @property
+    def names_only(self) -> bool:
+        """Return if every glob only looks at the path's name."""
+        return not self._part_globs
+
+    def match_name(self, name: str) -> bool:
+        """Return if a path's name matches a single component glob."""
+        return bool(self._name_re and self._name_re.match(_normcase(name)))
+
+    def match_parts(self, parts: Parts) -> bool:
+        """Return if path parts match any glob."""
+        if not parts:
+            return False
+        if self.match_name(parts[-1]):
+            return True
+        for anchored, regexes in self._part_globs:
+            depth = len(regexes)
+            if (anchored and len(parts) != depth) or len(parts) < depth:
+                continue
+            if all(
+                regex.match(_normcase(part))
+                for regex, part in zip(regexes, parts[-depth:], strict=True)
+            ):
+                return True
+        return False
+
+    def match(self, path: PurePath | str) -> bool:
+        """Return if a path matches any glob."""
+        if not self:
+            return False
+        if not isinstance(path, PurePath):
+            path = PurePath(path)
+        return self.match_parts(path.parts)
+
+    def match_entry(self, entry: os.DirEntry) -> bool:
+        """Return if a scanned directory entry matches any glob."""
+        if self.names_only:
+            return self.match_name(entry.name)
+        return self.match(entry.path)
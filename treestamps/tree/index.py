@@ -0,0 +1,172 @@
+"""Memory mapped read only timestamp index."""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Mapping
+from hashlib import blake2b
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+from treestamps.tree.store import Parts
+
+
+def _canonical(value: Any) -> Any:
+    """Convert config values json can't encode to stable equivalents."""
+    if isinstance(value, MappingProxyType):
+        return dict(value)
+    if isinstance(value, set | frozenset):
+        return sorted(value, key=repr)
+    return repr(value)
+
+
+def get_config_fingerprint(config: Mapping) -> int:
+    """Return a stable 64 bit fingerprint of a config mapping."""
+    text = json.dumps(config, default=_canonical, sort_keys=True)
+    return int.from_bytes(blake2b(text.encode(), digest_size=8).digest(), "little")
+
+
+class TimestampIndex:
+    """
+    Sorted array of relative path hashes and timestamps backed by an mmap.
+
+    The file is a header followed by count uint64 path hashes in ascending
+    order and count float64 timestamps in the same order, in native byte
+    order. Opening it only maps the file, so startup time does not depend on
+    the number of timestamps. Hashes are 64 bits so collisions are ignored.
+    The same bytes can be held in memory instead of mapped from a file.
+    """
+
+    _MAGIC: bytes = b"TSIDX1" + sys.byteorder[0].encode() + b"\0"
+    # magic, config fingerprint, source file mtime_ns, count
+    _HEADER: struct.Struct = struct.Struct("=8sQqQ")
+
+    def __init__(
+        self, path: Path | None, buffer: mmap.mmap | bytes, count: int
+    ) -> None:
+        """Create views over the mapped or in memory arrays."""
+        self.path: Path | None = path
+        self._buffer: mmap.mmap | bytes = buffer
+        self._count: int = count
+        view = memoryview(buffer)
+        offset = self._HEADER.size
+        self._view: memoryview = view
+        self._hashes: memoryview = view[offset : offset + 8 * count].cast("Q")
+        offset += 8 * count
+        self._timestamps: memoryview = view[offset : offset + 8 * count].cast("d")
+
+    @staticmethod
+    def hash_path(rel_path_str: str) -> int:
+        """Hash a relative path string to 64 bits."""
+        digest = blake2b(rel_path_str.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "little")
+
+    @classmethod
+    def pack(
+        cls,
+        items: Iterable[tuple[str, float]],
+        fingerprint: int = 0,
+        source_mtime_ns: int = 0,
+    ) -> bytes:
+        """Pack relative path strings and timestamps into index bytes."""
+        entries: dict[int, float] = {}
+        for rel_path_str, timestamp in items:
+            key = cls.hash_path(rel_path_str)
+            old_timestamp = entries.get(key)
+            if old_timestamp is None or timestamp > old_timestamp:
+                entries[key] = timestamp
+        keys = sorted(entries)
+        hashes = array("Q", keys)
+        timestamps = array("d", (entries[key] for key in keys))
+        header = cls._HEADER.pack(cls._MAGIC, fingerprint, source_mtime_ns, len(keys))
+        return header + hashes.tobytes() + timestamps.tobytes()
+
+    @classmethod
+    def write(
+        cls,
+        path: Path,
+        items: Iterable[tuple[str, float]],
+        fingerprint: int,
+        source_mtime_ns: int,
+    ) -> int:
+        """Atomically write an index of relative path strings. Return its size."""
+        data = cls.pack(items, fingerprint, source_mtime_ns)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+        return (len(data) - cls._HEADER.size) // 16
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TimestampIndex":
+        """Create an index over packed bytes held in memory."""
+        magic, _, _, count = cls._HEADER.unpack_from(data)
+        if magic != cls._MAGIC or len(data) != cls._HEADER.size + 16 * count:
+            reason = "Not timestamp index bytes for this platform"
+            raise ValueError(reason)
+        return cls(None, data, count)
+
+    def to_bytes(self) -> bytes:
+        """Return a copy of the packed index."""
+        return bytes(self._view)
+
+    @classmethod
+    def open(
+        cls, path: Path, fingerprint: int, source_mtime_ns: int
+    ) -> "TimestampIndex | None":
+        """Map an index if it matches the config and source file."""
+        try:
+            with path.open("rb") as index_file:
+                size = os.fstat(index_file.fileno()).st_size
+                if size < cls._HEADER.size:
+                    return None
+                mapped = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+        magic, index_fingerprint, index_mtime_ns, count = cls._HEADER.unpack_from(
+            mapped
+        )
+        if (
+            magic != cls._MAGIC
+            or index_fingerprint != fingerprint
+            or index_mtime_ns != source_mtime_ns
+            or size != cls._HEADER.size + 16 * count
+        ):
+            mapped.close()
+            return None
+        return cls(path, mapped, count)
+
+    def __len__(self) -> int:
+        """Return the number of timestamps."""
+        return self._count
+
+    def get(self, rel_path_str: str) -> float | None:
+        """Binary search for one relative path's timestamp."""
+        key = self.hash_path(rel_path_str)
+        index = bisect_left(self._hashes, key)
+        if index < self._count and self._hashes[index] == key:
+            return self._timestamps[index]
+        return None
+
+    def get_max(self, rel_parts: Parts) -> float | None:
+        """Return the max timestamp of the root and each relative ancestor."""
+        result = self.get(".")
+        rel_path_str = ""
+        for part in rel_parts:
+            rel_path_str = f"{rel_path_str}{os.sep}{part}" if rel_path_str else part
+            timestamp = self.get(rel_path_str)
+            if timestamp is not None and (result is None or timestamp > result):
+                result = timestamp
+        return result
+
+    def close(self) -> None:
+        """Release the views and unmap the file."""
+        self._hashes.release()
+        self._timestamps.release()
+        self._view.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
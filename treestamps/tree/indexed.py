@@ -0,0 +1,176 @@
+"""Memory mapped index methods."""
+
+import os
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from treestamps.tree.index import TimestampIndex, get_config_fingerprint
+from treestamps.tree.shard import TreestampsShard
+from treestamps.tree.snapshot import TimestampSnapshot
+from treestamps.tree.store import Parts
+
+
+class TreestampsIndexed(TreestampsShard):
+    """
+    Write a memory mapped index beside the main file and read from it.
+
+    With read_only, get() answers from the index and an overlay of parent
+    timestamps instead of loading every entry. Child timestamp files are not
+    walked. Without a current index read_only trees load as usual.
+    """
+
+    def _get_index_fingerprint(self) -> int:
+        """Return the fingerprint of the config the index is valid for."""
+        return get_config_fingerprint(self._get_dumpable_program_config())
+
+    def _dumpf_index(self) -> None:
+        """Write the index of every timestamp in the tree."""
+        try:
+            root_parts = self.root_dir.parts
+            items = (
+                (self._get_relative_parts_str(abs_parts), timestamp)
+                for abs_parts, timestamp in self._timestamps.iter_parts()
+                if abs_parts[: len(root_parts)] == root_parts
+            )
+            TimestampIndex.write(
+                self._index_path,
+                items,
+                self._get_index_fingerprint(),
+                self._dump_path.stat().st_mtime_ns,
+            )
+            self._index_on_disk = True
+            self._printer.save("Saved timestamp index for", self.root_dir)
+        except Exception as exc:
+            self._printer.error(f"Writing timestamp index {self._index_path}", exc)
+
+    def _remove_index(self) -> None:
+        """Remove a stale index if one was loaded or written."""
+        if self._index_on_disk:
+            self._index_path.unlink(missing_ok=True)
+            self._index_on_disk = False
+
+    def _dumpf_full(self, *, background: bool = False) -> None:
+        """Write the index after the main file."""
+        super()._dumpf_full(background=background)
+        if self._config.index and not background:
+            self._dumpf_index()
+        else:
+            # A background compaction changes the main file later.
+            self._remove_index()
+
+    def _dumpf_segment(self) -> None:
+        """Invalidate the index, it does not cover segments."""
+        self._remove_index()
+        super()._dumpf_segment()
+
+    def cleanup_old_timestamps(self) -> None:
+        """Remove the indexes of consumed child timestamp files too."""
+        for path in self._consumed_paths:
+            if path.name == self._filename:
+                index_path = path.parent / self._index_path.name
+                try:
+                    index_path.unlink(missing_ok=True)
+                except Exception as exc:
+                    self._printer.warn(
+                        f"Removing old timestamp index {index_path}", exc
+                    )
+        super().cleanup_old_timestamps()
+
+    def _open_index(self) -> TimestampIndex | None:
+        """Map the index if it is current."""
+        try:
+            if self._wal_path.exists():
+                # Recover the WAL with a full load.
+                return None
+            return TimestampIndex.open(
+                self._index_path,
+                self._get_index_fingerprint(),
+                self._dump_path.stat().st_mtime_ns,
+            )
+        except Exception as exc:
+            self._printer.warn(f"Opening timestamp index {self._index_path}", exc)
+            return None
+
+    def loadf_tree(self) -> None:
+        """Map the index instead of loading the tree if read only."""
+        self._index_on_disk = self._index_path.exists()
+        if self._config.read_only and (index := self._open_index()):
+            self._index = index
+            self._printer.load("Mapped timestamps from", index.path)
+            self._load_parent_timestamps(self.root_dir)
+            return
+        super().loadf_tree()
+
+    def get(self, path: Path | str) -> float | None:
+        """Get the timestamp from the index and the parent overlay."""
+        if self._index is None:
+            return super().get(path)
+        abs_parts = self._get_absolute_parts(self.root_dir, path)
+        if abs_parts is None:
+            return None
+        rel_parts = abs_parts[len(self.root_dir.parts) :]
+        return self.max_none(
+            self._timestamps.get_max(abs_parts), self._index.get_max(rel_parts)
+        )
+
+    def walk_stale(self, path: Path | str | None = None) -> Iterator[os.DirEntry]:
+        """Walk the tree once, comparing files to the index if mapped."""
+        if self._index is None:
+            return super().walk_stale(path)
+        top_parts = (
+            self.root_dir.parts
+            if path is None
+            else self._get_absolute_parts(self.root_dir, path)
+        )
+        if top_parts is None:
+            return iter(())
+        entries = (entry for entry, _ in self._walk(top_parts, lookup=False))
+        return self.filter_stale(entries)
+
+    def get_many(self, paths: Iterable[Path | str]) -> list[float | None]:
+        """Get many timestamps from the index and the parent overlay."""
+        if self._index is None:
+            return super().get_many(paths)
+        return [self.get(path) for path in paths]
+
+    def _set_timestamp(
+        self, abs_parts: Parts, mtime: float, *, compact: bool
+    ) -> float | None:
+        """Refuse to set timestamps on read only trees."""
+        if self._config.read_only:
+            reason = f"Timestamps for {self.root_dir} are read only"
+            raise ValueError(reason)
+        return super()._set_timestamp(abs_parts, mtime, compact=compact)
+
+    def snapshot(self) -> TimestampSnapshot:
+        """Return a compact picklable copy of the timestamps for workers."""
+        if self._index is not None:
+            return TimestampSnapshot(
+                self.root_dir,
+                self._index.to_bytes(),
+                tuple(self._timestamps.iter_parts()),
+            )
+        if self._shard_layout:
+            self._load_all_shards()
+        root_parts = self.root_dir.parts
+        items = []
+        extra = []
+        for abs_parts, timestamp in self._timestamps.iter_parts():
+            if abs_parts[: len(root_parts)] == root_parts:
+                items.append((self._get_relative_parts_str(abs_parts), timestamp))
+            else:
+                extra.append((abs_parts, timestamp))
+        return TimestampSnapshot(self.root_dir, TimestampIndex.pack(items), extra)
+
+    def dumpf(self) -> None:
+        """Never write read only trees."""
+        if self._config.read_only:
+            self._printer.skip("updating read only timestamps for", self.root_dir)
+            return
+        super().dumpf()
+
+    def close(self) -> None:
+        """Unmap the index."""
+        if self._index is not None:
+            self._index.close()
+            self._index = None
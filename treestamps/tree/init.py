@@ -1,24 +1,40 @@
 """Common methods."""
 
-from collections.abc import Mapping
+import json
+import os
+import re
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
 from pathlib import Path
-from typing import TextIO
-
-from ruamel.yaml import YAML, MappingNode, RoundTripRepresenter
-from ruamel.yaml.comments import CommentedOrderedMap, CommentedSet
+from typing import TYPE_CHECKING, Any, TextIO
+from zlib import crc32
 
+from treestamps.config import (
+    DUMP_MODE_INCREMENTAL,
+    SHARD_HASH,
+    SHARD_NONE,
+    SHARD_SUBDIR,
+)
 from treestamps.printer import Printer
+from treestamps.serializers import (
+    JSONLinesSerializer,
+    Serializer,
+    YAMLSafeSerializer,
+    YAMLSerializer,
+    get_serializer,
+    is_jsonl,
+)
+from treestamps.stats import NullStats, Stats
 from treestamps.tree.config import TreestampsConfig
+from treestamps.tree.ignore import IgnoreMatcher
+from treestamps.tree.paths import normalize_parts
+from treestamps.tree.store import Parts, TimestampStore, TimestampTrie
+from treestamps.wal import WAL_MODE_DELTA, WriteAheadLog
 
+if TYPE_CHECKING:
+    from threading import Thread
 
-def represent_frozenset(dumper: RoundTripRepresenter, data: frozenset) -> MappingNode:
-    """Represent frozenset as a CommentedSet."""
-    return dumper.represent_set(CommentedSet(data))
-
-
-def represent_mapping(dumper, data: Mapping):
-    """Represent Mappings as Mappings."""
-    return dumper.represent_mapping(CommentedOrderedMap(data))
+    from treestamps.tree.index import TimestampIndex
 
 
 class TreestampsInit:
@@ -27,8 +43,27 @@ class TreestampsInit:
     _CONFIG_TAG: str = "config"
     _TREESTAMPS_CONFIG_TAG: str = "treestamps_config"
     _WAL_TAG: str = "wal"
+    _METADATA_TAG: str = "treestamps_metadata"
+    # Nested under the metadata tag so they can't collide with path names.
+    _GENERATION_TAG: str = "generation"
+    _WAL_BASE_TAG: str = "wal_base"
+    _SHARDS_TAG: str = "shards"
+    _METADATA_TAGS: frozenset[str] = frozenset(
+        {_CONFIG_TAG, _TREESTAMPS_CONFIG_TAG, _METADATA_TAG}
+    )
     _FILENAME_TEMPLATE: str = ".{program_name}_treestamps.yaml"
     _WAL_FILENAME_TEMPLATE: str = ".{program_name}_treestamps.wal.yaml"
+    _WRITER_WAL_FILENAME_TEMPLATE: str = (
+        ".{program_name}_treestamps.wal-{writer_id}.yaml"
+    )
+    _LOCK_FILENAME_TEMPLATE: str = ".{program_name}_treestamps.lock"
+    _SEGMENT_FILENAME_TEMPLATE: str = (
+        ".{program_name}_treestamps.{generation}.{seq:06d}.delta.yaml"
+    )
+    _INDEX_FILENAME_TEMPLATE: str = ".{program_name}_treestamps.idx"
+    _SHARD_FILENAME_TEMPLATE: str = ".{program_name}_treestamps.shard-{key}.yaml"
+    _STORE_CLASS: type[TimestampStore] = TimestampTrie
+    _PATH_CACHE_SIZE: int = 4096
 
     @staticmethod
     def get_dir(path: Path | str) -> Path:
@@ -46,41 +81,170 @@ class TreestampsInit:
         """Return the write ahead log filename for the program."""
         return cls._WAL_FILENAME_TEMPLATE.format(program_name=program_name)
 
+    @classmethod
+    def get_writer_wal_filename(cls, program_name: str, writer_id: str) -> str:
+        """Return the write ahead log filename for one of many writers."""
+        return cls._WRITER_WAL_FILENAME_TEMPLATE.format(
+            program_name=program_name, writer_id=writer_id
+        )
+
+    @staticmethod
+    def _get_writer_wal_re(program_name: str) -> re.Pattern:
+        """Return a regex that matches writer WAL filenames for the program."""
+        prefix = re.escape(f".{program_name}_treestamps.wal-")
+        return re.compile(prefix + r"(?P<writer_id>[\w.-]+)\.yaml")
+
+    @classmethod
+    def get_lock_filename(cls, program_name: str) -> str:
+        """Return the multi writer lock filename for the program."""
+        return cls._LOCK_FILENAME_TEMPLATE.format(program_name=program_name)
+
+    @classmethod
+    def get_index_filename(cls, program_name: str) -> str:
+        """Return the memory mapped index filename for the program."""
+        return cls._INDEX_FILENAME_TEMPLATE.format(program_name=program_name)
+
     @classmethod
     def get_filenames(cls, program_name: str) -> tuple[str, str]:
         """Get all filenames produced by treestamps."""
         return (cls.get_filename(program_name), cls.get_wal_filename(program_name))
 
-    def _get_absolute_path(self, root_dir: Path, path: Path | str) -> Path | None:
-        """Convert paths to relevant absolute paths."""
-        # Do not normalize with resolve() to keep symlink paths.
-        path = Path(path)
+    @classmethod
+    def get_segment_filename(cls, program_name: str, generation: str, seq: int) -> str:
+        """Return the incremental dump segment filename for the program."""
+        return cls._SEGMENT_FILENAME_TEMPLATE.format(
+            program_name=program_name, generation=generation, seq=seq
+        )
+
+    @staticmethod
+    def _get_segment_re(program_name: str) -> re.Pattern:
+        """Return a regex that matches segment filenames for the program."""
+        prefix = re.escape(f".{program_name}_treestamps.")
+        return re.compile(prefix + r"(?P<generation>\w+)\.(?P<seq>\d+)\.delta\.yaml")
+
+    @classmethod
+    def get_shard_filename(cls, program_name: str, key: str) -> str:
+        """Return the shard filename for the program."""
+        return cls._SHARD_FILENAME_TEMPLATE.format(program_name=program_name, key=key)
+
+    @staticmethod
+    def _get_shard_re(program_name: str) -> re.Pattern:
+        """Return a regex that matches shard filenames for the program."""
+        prefix = re.escape(f".{program_name}_treestamps.shard-")
+        return re.compile(prefix + r"(?P<key>.+)\.yaml")
+
+    @staticmethod
+    def _get_shard_layout(shard: str, shard_count: int) -> str | None:
+        """Return the shard layout recorded in the main file."""
+        if shard == SHARD_NONE:
+            return None
+        if shard == SHARD_HASH:
+            return f"{SHARD_HASH}-{shard_count}"
+        return shard
+
+    @staticmethod
+    def _get_subtree_shard_key(layout: str, name: str) -> str:
+        """Return the shard key for everything below a top level path."""
+        if layout == SHARD_SUBDIR:
+            return name
+        shard_count = int(layout.removeprefix(f"{SHARD_HASH}-"))
+        return f"{crc32(name.encode()) % shard_count:x}"
+
+    @classmethod
+    def _get_shard_key(cls, layout: str, rel_parts: Parts) -> str:
+        """Return the shard key for a path relative to root. The main file is ''."""
+        if not rel_parts or (layout == SHARD_SUBDIR and len(rel_parts) == 1):
+            return ""
+        return cls._get_subtree_shard_key(layout, rel_parts[0])
 
-        abs_path = path.absolute()
-        if abs_path.is_relative_to(root_dir):
-            # absolute path under the root, return the absolute path
-            return abs_path
+    @classmethod
+    def _set_metadata(cls, yaml: dict, key: str, value: str | None) -> None:
+        """Set a nested treestamps metadata value in the yaml to be dumped."""
+        yaml.setdefault(cls._METADATA_TAG, {})[key] = value
+
+    def _is_incremental(self) -> bool:
+        """Return if dumps only write changes."""
+        return self._config.dump_mode == DUMP_MODE_INCREMENTAL
+
+    def _uses_generations(self) -> bool:
+        """Return if snapshots are identified by generation."""
+        return (
+            self._is_incremental()
+            or self._config.wal_mode == WAL_MODE_DELTA
+            or self._shard_layout is not None
+        )
 
-        if not path.is_absolute():
-            return (root_dir / path).absolute()
+    @property
+    def wal(self) -> WriteAheadLog:
+        """Return the write ahead log writer and its counters."""
+        return self._wal
 
-        if root_dir.is_relative_to(path):
-            # path is above the root dir. use the root dir.
-            return root_dir
+    def _get_absolute_parts(
+        self, root_dir: Path, path: Path | str, *, cache: bool = True
+    ) -> Parts | None:
+        """Convert paths to the parts of relevant absolute paths."""
+        if cache:
+            # Relative paths depend on the working directory.
+            key = (
+                (root_dir, path)
+                if os.path.isabs(path)  # noqa: PTH117
+                else (root_dir, path, os.getcwd())  # noqa: PTH109
+            )
+            try:
+                abs_parts = self._path_cache[key]
+                self._path_cache.move_to_end(key)
+            except KeyError:
+                abs_parts = normalize_parts(root_dir.parts, path)
+                self._path_cache[key] = abs_parts
+                if len(self._path_cache) > self._PATH_CACHE_SIZE:
+                    self._path_cache.popitem(last=False)
+        else:
+            abs_parts = normalize_parts(root_dir.parts, path)
+        if abs_parts is None:
+            self._printer.skip("Timestamp outside %s's tree, ignored", path, root_dir)
+        return abs_parts
 
-        # path is outside our jurisdiction.
-        self._printer.skip(f"Timestamp outside {root_dir}'s tree, ignored", path)
-        return None
+    def _get_absolute_path(self, root_dir: Path, path: Path | str) -> Path | None:
+        """Convert paths to relevant absolute paths."""
+        abs_parts = self._get_absolute_parts(root_dir, path)
+        return None if abs_parts is None else Path(*abs_parts)
 
-    def _config_yaml(self) -> None:
-        self._YAML: YAML = YAML(typ="rt")
-        self._YAML.allow_duplicate_keys = True
-        self._YAML.indent(offset=2)  # Conform to Prettier
-        self._YAML.representer.add_representer(frozenset, represent_frozenset)
-        self._YAML.representer.add_representer(Mapping, represent_mapping)
+    def _load_parts(self, parts_list: Iterable[Parts]) -> None:
+        """Load any lazily stored timestamps for paths before they are used."""
+
+    def _config_serializers(self) -> None:
+        """Create the dump serializer and the auto detecting loaders."""
+        serializer = get_serializer(self._config.file_format)
+        self._serializer: Serializer = serializer
+        self._jsonl_loader: Serializer = (
+            serializer
+            if isinstance(serializer, JSONLinesSerializer)
+            else JSONLinesSerializer()
+        )
+        self._yaml_loader: Serializer = (
+            serializer
+            if isinstance(serializer, YAMLSerializer)
+            else YAMLSafeSerializer()
+        )
+
+    def _iter_deserialize(self, file: TextIO) -> Iterator[tuple[Any, Any]]:
+        """Stream the top level items of a file in any supported format."""
+        header = file.readline()
+        file.seek(0)
+        if is_jsonl(header):
+            try:
+                json.loads(header)
+                return self._jsonl_loader.iter_load(file)
+            except ValueError:
+                # Not json lines, maybe a flow style yaml mapping.
+                pass
+        return self._yaml_loader.iter_load(file)
 
     def __init__(
-        self, config: TreestampsConfig, printer: Printer | None = None
+        self,
+        config: TreestampsConfig,
+        printer: Printer | None = None,
+        stats: Stats | None = None,
     ) -> None:
         """Initialize instance variables."""
         # config
@@ -90,13 +254,67 @@ class TreestampsInit:
         # Do not normalize root_dir because symlinks behave weird.
         root_dir = self.get_dir(self._config.path).absolute()
         self.root_dir: Path = root_dir
-        self._config_yaml()
+        self._config_serializers()
         self._filename: str = self.get_filename(self._config.program_name)
         self._wal_filename: str = self.get_wal_filename(self._config.program_name)
         self._dump_path: Path = self.root_dir / self._filename
         self._wal_path: Path = self.root_dir / self._wal_filename
-        self._wal: TextIO | None = None
+        self._writer_wal_re: re.Pattern = self._get_writer_wal_re(
+            self._config.program_name
+        )
+        if config.multi_writer:
+            writer_id = config.writer_id or str(os.getpid())
+            self._wal_path = self.root_dir / self.get_writer_wal_filename(
+                self._config.program_name, writer_id
+            )
+        self._lock_path: Path = self.root_dir / self.get_lock_filename(
+            self._config.program_name
+        )
+        self._dump_mtime_ns: int | None = None
+        self._index_path: Path = self.root_dir / self.get_index_filename(
+            self._config.program_name
+        )
+        self._index: TimestampIndex | None = None
+        # Unknown until loaded, so a dump without a load still removes it.
+        self._index_on_disk: bool = True
+        self._wal: WriteAheadLog = WriteAheadLog(
+            self._wal_path,
+            durability=config.wal_durability,
+            flush_entries=config.wal_flush_entries,
+            flush_ms=config.wal_flush_ms,
+            locked=config.multi_writer,
+        )
         self._consumed_paths: set[Path] = set()
-        self._timestamps: dict[Path, float] = {}
+        self._generations: dict[Path, str] = {}
+        self._segment_re: re.Pattern = self._get_segment_re(self._config.program_name)
+        self._segment_paths: list[Path] = []
+        self._segment_seq: int = 0
+        self._dirty: dict[Parts, float] = {}
+        self._wal_recovered: bool = False
+        self._compaction_thread: Thread | None = None
+        self._shard_re: re.Pattern = self._get_shard_re(self._config.program_name)
+        self._shard_layout: str | None = self._get_shard_layout(
+            config.shard, config.shard_count
+        )
+        self._shard_layouts: dict[Path, str] = {}
+        self._shard_paths: dict[str, Path] = {}
+        self._shards_loaded: set[str] = {""}
+        self._dirty_shards: set[str] = set()
+        self._compact_pending: set[Parts] = set()
+        self._compacted_child_counts: dict[Parts, int] = {}
+        self._ignore: IgnoreMatcher = IgnoreMatcher(config.ignore)
+        self._timestamps: TimestampStore = self._STORE_CLASS()
+        self._path_cache: OrderedDict[tuple, Parts | None] = OrderedDict()
         self._changed: bool = False
         self._printer: Printer = printer or Printer(config.verbose)
+        self._stats: Stats = stats if stats is not None else NullStats()
+
+    @property
+    def stats(self) -> Stats:
+        """Return the load and dump statistics."""
+        return self._stats
+
+    @property
+    def printer(self) -> Printer:
+        """Return the printer."""
+        return self._printer
@@ -1,22 +1,53 @@
 """Load methods."""
 
-from collections.abc import Mapping
+import gc
+import os
+from collections.abc import Generator, Iterable, Iterator, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from io import StringIO
 from pathlib import Path
+from typing import Any, TextIO
 from warnings import warn
 
 from ruamel.yaml.comments import CommentedMap
 
+from treestamps.config import SHARD_HASH, SHARD_SUBDIR
+from treestamps.stale import get_mtime, is_newer
 from treestamps.tree.config import TreestampsConfig
 from treestamps.tree.get import TreestampsGet
+from treestamps.tree.store import Parts
+
+
+@contextmanager
+def _gc_paused() -> Generator[None, None, None]:
+    """Pause cyclic garbage collection while allocating many acyclic objects."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
 
 
 class TreestampLoad(TreestampsGet):
     """Load methods."""
 
-    def _is_path_skipped(self, path: Path) -> bool:
+    _LOAD_CHUNK_SIZE: int = 65536
+
+    def is_ignored(self, path: Path | str) -> bool:
+        """Return if a path matches the ignore globs."""
+        return self._ignore.match(path)
+
+    def _is_path_skipped(self, path: Path, entry: os.DirEntry | None = None) -> bool:
         """Return if path is ignored or not allowed because symlink."""
-        return any(path.match(ignore_glob) for ignore_glob in self._config.ignore) or (
-            not self._config.symlinks and path.is_symlink()
+        # DirEntry caches its type from scandir() so is_symlink() is free.
+        return (
+            self._ignore.match_entry(entry) if entry else self._ignore.match(path)
+        ) or (
+            not self._config.symlinks
+            and (entry.is_symlink() if entry else path.is_symlink())
         )
 
     @classmethod
@@ -42,101 +73,384 @@ class TreestampLoad(TreestampsGet):
             )
         )
 
-    def _load_timestamp_entry(
-        self, timestamps_root: Path, path_str: str, ts: float
-    ) -> None:
-        """Load a single timestamp entry into the cache."""
-        try:
-            if abs_path := self._get_absolute_path(timestamps_root, path_str):
-                old_ts = self.get(abs_path)
-                if old_ts is None or ts > old_ts:
-                    self._timestamps[abs_path] = ts
-        except Exception as exc:
-            self._printer.warn(f"Invalid timestamp for {path_str}: {ts}", exc)
+    def _is_valid_metadata(self, key: Any, value: Any) -> bool:
+        """Return if a nested metadata value has the right type."""
+        if key == self._SHARDS_TAG:
+            return value in (SHARD_SUBDIR, SHARD_HASH)
+        if key == self._WAL_BASE_TAG:
+            return value is None or isinstance(value, str)
+        return key == self._GENERATION_TAG and isinstance(value, str)
 
-    def load_map(self, timestamps_root: Path, yaml: Mapping) -> None:
-        """Load timestamps from a dict."""
-        if not yaml:
-            return
+    def _pop_metadata(self, timestamps_root: Path, metadata: dict) -> dict:
+        """Pop the nested treestamps metadata, dropping invalid values."""
+        tags = metadata.pop(self._METADATA_TAG, None)
+        if tags is None:
+            return {}
+        if not isinstance(tags, Mapping):
+            self._printer.warn(
+                f"Ignoring invalid treestamps metadata in {timestamps_root}: {tags}"
+            )
+            return {}
+        valid = {}
+        for key, value in tags.items():
+            if self._is_valid_metadata(key, value):
+                valid[key] = value
+            else:
+                self._printer.warn(
+                    f"Ignoring invalid treestamps metadata in {timestamps_root}: "
+                    f"{key}: {value}"
+                )
+        return valid
 
-        yaml = dict(yaml)
-        # Pop off config entries and compare configs.
-        if not self._load_pop_config_matches(yaml):
-            return
-        # Pop off the WAL
-        wal = yaml.pop(self._WAL_TAG, ())
+    def _load_metadata(self, timestamps_root: Path, metadata: dict) -> None:
+        """Record the snapshot generation and shard layout and check the WAL base."""
+        tags = self._pop_metadata(timestamps_root, metadata)
+        if generation := tags.get(self._GENERATION_TAG):
+            self._generations[timestamps_root] = generation
+        if layout := tags.get(self._SHARDS_TAG):
+            self._shard_layouts[timestamps_root] = layout
+        if self._WAL_BASE_TAG in tags:
+            wal_base = tags[self._WAL_BASE_TAG]
+            if wal_base != self._generations.get(timestamps_root):
+                self._printer.warn(
+                    f"WAL in {timestamps_root} was written on top of a missing "
+                    "snapshot, older timestamps may be lost. Replaying anyway."
+                )
 
-        # What's left are timestamp entries
-        entries = yaml
+    def _merge_entries(self, entries: list[tuple[Parts, float]]) -> None:
+        """Merge parsed entries into the cache and count them."""
+        with self._stats.timer("merge"):
+            accepted = self._timestamps.merge_max(entries)
+        self._stats.count("entries_loaded", accepted)
+        self._stats.count("entries_rejected", len(entries) - accepted)
 
-        # Update entries with WAL entries
-        for wal_entry in wal:
-            try:
-                entries.update(wal_entry)
-            except Exception as exc:
-                self._printer.warn(f"loading WAL entry: {wal_entry}", exc)
+    def _iter_timestamp_entries(
+        self, items: Iterable[tuple[Any, Any]], metadata: dict
+    ) -> Iterator[tuple[Any, Any]]:
+        """Collect metadata items and yield timestamp entries, flattening WALs."""
+        for key, value in items:
+            if key == self._WAL_TAG and isinstance(value, list | tuple):
+                for wal_entry in value:
+                    try:
+                        yield from tuple(wal_entry.items())
+                    except Exception as exc:
+                        self._printer.warn(f"loading WAL entry: {wal_entry}", exc)
+            elif key in self._METADATA_TAGS:
+                metadata[key] = value
+            else:
+                yield key, value
 
-        for path_str, ts in entries.items():
-            self._load_timestamp_entry(timestamps_root, path_str, ts)
+    def _load_items(
+        self, timestamps_root: Path, items: Iterable[tuple[Any, Any]]
+    ) -> None:
+        """
+        Load top level items of a timestamps file into the cache.
+
+        Once the config is read and matches, entries are merged in chunks as
+        they stream in. Entries before the config are held as path parts until
+        it is read.
+        """
+        # Entries are stored by absolute parts.
+        timestamps_root = Path(timestamps_root).absolute()
+        metadata = {}
+        entries: list[tuple[Parts, float]] = []
+        matches: bool | None = None
+        chunk_size = self._LOAD_CHUNK_SIZE
+        with _gc_paused():
+            for path_str, ts in self._iter_timestamp_entries(items, metadata):
+                if matches is None and self._TREESTAMPS_CONFIG_TAG in metadata:
+                    # Pop off config entries and compare configs.
+                    matches = self._load_pop_config_matches(metadata)
+                    if not matches:
+                        self._stats.count("files_skipped")
+                        return
+                try:
+                    if not isinstance(ts, int | float):
+                        reason = f"{type(ts).__name__} is not a timestamp"
+                        raise TypeError(reason)  # noqa: TRY301
+                    abs_parts = self._get_absolute_parts(
+                        timestamps_root, path_str, cache=False
+                    )
+                    if abs_parts is not None:
+                        entries.append((abs_parts, ts))
+                except Exception as exc:
+                    self._stats.count("entries_rejected")
+                    self._printer.warn(f"Invalid timestamp for {path_str}: {ts}", exc)
+                if matches and len(entries) >= chunk_size:
+                    self._merge_entries(entries)
+                    entries = []
+            if matches is None and not self._load_pop_config_matches(metadata):
+                self._stats.count("files_skipped")
+                return
+            self._load_metadata(timestamps_root, metadata)
+            self._merge_entries(entries)
+
+    def load_map(self, timestamps_root: Path, yaml: Mapping) -> None:
+        """Load timestamps from a dict."""
+        if yaml:
+            self._load_items(timestamps_root, yaml.items())
 
     def loads(self, timestamps_root: Path, yaml: str | bytes) -> None:
         """Load timestamps from a string."""
         try:
+            self._stats.count("bytes_parsed", len(yaml))
             if isinstance(yaml, bytes):
                 yaml = yaml.decode("utf-8")
-            yaml_dict = self._YAML.load(yaml)
-            self.load_map(timestamps_root, yaml_dict)
+            with self._stats.timer("parse"), StringIO(yaml) as file:
+                self._load_items(timestamps_root, self._iter_deserialize(file))
+            self._stats.count("files_loaded")
         except Exception as exc:
             self._printer.error("parsing timestamps yaml string", exc)
 
+    def _opened_timestamps_file(self, path: Path, file: TextIO) -> None:
+        """Inspect a timestamps file opened for loading."""
+
     def loadf(self, timestamps_path: Path | str) -> None:
-        """Load timestamps from a file."""
+        """Load timestamps from a file, streaming entries into the cache."""
         try:
             timestamps_path = Path(timestamps_path)
-            yaml_dict = self._YAML.load(timestamps_path)
-            self.load_map(timestamps_path.parent, yaml_dict)
+            with (
+                self._stats.timer("parse"),
+                timestamps_path.open(encoding="utf-8") as file,
+            ):
+                if self._stats.enabled:
+                    self._stats.count("bytes_parsed", os.fstat(file.fileno()).st_size)
+                self._opened_timestamps_file(timestamps_path, file)
+                self._load_items(timestamps_path.parent, self._iter_deserialize(file))
+            self._stats.count("files_loaded")
             self._printer.load("Read timestamps from", timestamps_path)
         except Exception as exc:
             self._printer.error(f"Parsing timestamps file: {timestamps_path}", exc)
 
+    def _add_root_segment(self, path: Path) -> None:
+        """Track a root segment so new segments continue its sequence."""
+        self._segment_paths.append(path)
+        match = self._segment_re.fullmatch(path.name)
+        if match and match.group("generation") == self._generations.get(self.root_dir):
+            self._segment_seq = max(self._segment_seq, int(match.group("seq")) + 1)
+
+    def _is_timestamps_filename(self, name: str) -> bool:
+        """Return if the filename is a timestamps, segment, shard or wal file."""
+        return name in (self._filename, self._wal_filename) or bool(
+            self._segment_re.fullmatch(name)
+            or self._shard_re.fullmatch(name)
+            or self._writer_wal_re.fullmatch(name)
+        )
+
+    def _is_wal_filename(self, name: str) -> bool:
+        """Return if the filename is the WAL or a writer's WAL."""
+        return name == self._wal_filename or bool(self._writer_wal_re.fullmatch(name))
+
+    def _get_load_rank(self, path: Path) -> tuple[Path, int, str]:
+        """Sort snapshots, then their segments and shards, then their WALs."""
+        if path.name == self._filename:
+            rank = 0
+        elif self._is_wal_filename(path.name):
+            rank = 2
+        else:
+            rank = 1
+        return (path.parent, rank, path.name)
+
     def _consume_child_timestamps(self, path: Path) -> None:
         """Consume a child timestamp and add its values to our root."""
         try:
-            if not path.is_file():
-                return
             self.loadf(path)
-            if path != self._dump_path:
-                self._consumed_paths.add(path)
+            if path == self._dump_path:
+                return
+            if path.parent == self.root_dir and self._segment_re.fullmatch(path.name):
+                self._add_root_segment(path)
+                return
+            if path == self._wal_path:
+                self._wal_recovered = True
+            self._consumed_paths.add(path)
+            self._stats.count("files_consumed")
         except Exception as exc:
             self._printer.warn(f"Reading child timestamps from {path}", exc)
 
+    def _scan_dir(self, path: Path) -> tuple[list[Path], list[Path]]:
+        """Scan one directory for timestamp files and subdirectories to scan."""
+        timestamp_paths = []
+        subdirs = []
+        try:
+            with os.scandir(path) as dir_entries:
+                for entry in dir_entries:
+                    if self._is_timestamps_filename(entry.name):
+                        if entry.is_file():
+                            timestamp_paths.append(Path(entry.path))
+                    elif entry.is_dir():
+                        subdir = Path(entry.path)
+                        if not self._is_path_skipped(subdir, entry):
+                            subdirs.append(subdir)
+        except Exception as exc:
+            self._printer.warn(f"Reading all child timestamps in {path}", exc)
+        return timestamp_paths, subdirs
+
+    def _find_child_timestamps_serial(self, path: Path) -> list[Path]:
+        """Walk the tree depth first in this thread."""
+        timestamp_paths = []
+        dirs = [path]
+        while dirs:
+            found_paths, subdirs = self._scan_dir(dirs.pop())
+            timestamp_paths.extend(found_paths)
+            dirs.extend(subdirs)
+        return timestamp_paths
+
+    def _find_child_timestamps_parallel(self, path: Path) -> list[Path]:
+        """Fan directory scans out across a bounded thread pool."""
+        timestamp_paths = []
+        with ThreadPoolExecutor(
+            max_workers=self._config.scan_workers,
+            thread_name_prefix="treestamps-scan",
+        ) as executor:
+            pending: set[Future] = {executor.submit(self._scan_dir, path)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    found_paths, subdirs = future.result()
+                    timestamp_paths.extend(found_paths)
+                    pending.update(
+                        executor.submit(self._scan_dir, subdir) for subdir in subdirs
+                    )
+        return timestamp_paths
+
+    def _is_entry_skipped(self, entry: os.DirEntry) -> bool:
+        """Return if a walked entry is ignored, a disallowed symlink or ours."""
+        return (
+            self._is_timestamps_filename(entry.name)
+            or entry.name in (self._index_path.name, self._lock_path.name)
+            or self._ignore.match_entry(entry)
+            or (not self._config.symlinks and entry.is_symlink())
+        )
+
+    def _walk(
+        self, top_parts: Parts, *, lookup: bool = True
+    ) -> Iterator[tuple[os.DirEntry, float | None]]:
+        """
+        Walk the files under a directory with their timestamps.
+
+        Each directory's timestamp is looked up once and handed down. Only
+        entries with their own timestamps below them are looked up, so
+        compacted subtrees are walked without any lookups.
+        """
+        root_depth = len(self.root_dir.parts)
+        stamp = self._timestamps.get_max(top_parts) if lookup else None
+        # Directory parts, timestamp and if anything below has its own.
+        dirs: list[tuple[Parts, float | None, bool]] = [(top_parts, stamp, lookup)]
+        while dirs:
+            dir_parts, dir_stamp, dir_lookup = dirs.pop()
+            try:
+                with os.scandir(os.path.join(*dir_parts)) as dir_entries:  # noqa: PTH118
+                    entries = [
+                        entry
+                        for entry in dir_entries
+                        if not self._is_entry_skipped(entry)
+                    ]
+            except OSError as exc:
+                self._printer.warn(f"Walking {os.path.join(*dir_parts)}", exc)  # noqa: PTH118
+                continue
+            if dir_lookup and len(dir_parts) == root_depth:
+                # Shards are keyed by the top level names.
+                self._load_parts((*dir_parts, entry.name) for entry in entries)
+            names = (
+                frozenset(self._timestamps.child_names(dir_parts))
+                if dir_lookup
+                else frozenset()
+            )
+            for entry in entries:
+                stamp = dir_stamp
+                has_stamps = entry.name in names
+                if has_stamps:
+                    entry_parts = (*dir_parts, entry.name)
+                    stamp = self.max_none(
+                        stamp, self._timestamps.get_parts(entry_parts)
+                    )
+                if entry.is_dir():
+                    dirs.append(((*dir_parts, entry.name), stamp, has_stamps))
+                else:
+                    yield entry, stamp
+
+    def walk_stale(self, path: Path | str | None = None) -> Iterator[os.DirEntry]:
+        """
+        Walk the tree once, yielding files modified after their timestamps.
+
+        Honors ignore and symlinks and skips timestamp files. Files are
+        yielded as DirEntries with their stat cached.
+        """
+        top_parts = (
+            self.root_dir.parts
+            if path is None
+            else self._get_absolute_parts(self.root_dir, path)
+        )
+        if top_parts is None:
+            return
+        self._load_parts((top_parts,))
+        for entry, stamp in self._walk(top_parts):
+            if is_newer(get_mtime(entry), stamp):
+                yield entry
+
     def _consume_all_child_timestamps(self, path: Path) -> None:
-        """Recursively consume all timestamps and wal files."""
+        """Find and consume all timestamps and wal files in the tree."""
         try:
             if not path.is_dir() or self._is_path_skipped(path):
                 return
-            for name in (self._filename, self._wal_filename):
-                self._consume_child_timestamps(path / name)
-            for dir_entry in path.iterdir():
-                self._consume_all_child_timestamps(dir_entry)
+            if self._config.scan_workers > 1:
+                timestamp_paths = self._find_child_timestamps_parallel(path)
+            else:
+                timestamp_paths = self._find_child_timestamps_serial(path)
         except Exception as exc:
             self._printer.warn("Reading all child timestamps", exc)
+            return
+        # Load in a stable order regardless of how the tree was walked.
+        # Snapshots before their segments and WALs so they replay on top.
+        timestamp_paths.sort(key=self._get_load_rank)
+        for timestamp_path in timestamp_paths:
+            self._consume_child_timestamps(timestamp_path)
+
+    def _load_writer_wals(self, path: Path) -> None:
+        """Load the WALs of every writer in a directory."""
+        try:
+            with os.scandir(path) as dir_entries:
+                names = sorted(
+                    entry.name
+                    for entry in dir_entries
+                    if self._writer_wal_re.fullmatch(entry.name)
+                )
+        except Exception as exc:
+            self._printer.warn(f"Reading writer WALs in {path}", exc)
+            return
+        for name in names:
+            self.loadf(path / name)
 
     def _load_parent_timestamps(self, path: Path) -> None:
         """Recursively load timestamps from all parents."""
         if path.parent == path.parent.parent or self._is_path_skipped(path):
             return
         parent = path.parent
-        timestamp_paths = (parent / self._filename, parent / self._wal_filename)
-        for timestamp_path in timestamp_paths:
-            if timestamp_path.is_file():
-                self.loadf(timestamp_path)
+        timestamp_path = parent / self._filename
+        if timestamp_path.is_file():
+            self.loadf(timestamp_path)
+        if generation := self._generations.get(parent):
+            # Segments are numbered contiguously from the snapshot.
+            seq = 0
+            while (
+                segment_path := parent
+                / self.get_segment_filename(self._config.program_name, generation, seq)
+            ).is_file():
+                self.loadf(segment_path)
+                seq += 1
+        wal_path = parent / self._wal_filename
+        if wal_path.is_file():
+            self.loadf(wal_path)
+        if self._config.multi_writer:
+            self._load_writer_wals(parent)
         self._load_parent_timestamps(parent)
 
     def loadf_tree(self) -> None:
         """Load all timestamp files up and down this tree."""
-        self._load_parent_timestamps(self.root_dir)
-        self._consume_all_child_timestamps(self.root_dir)
+        with self._stats.timer("load_parents"):
+            self._load_parent_timestamps(self.root_dir)
+        with self._stats.timer("load_children"):
+            self._consume_all_child_timestamps(self.root_dir)
 
     def load(self) -> None:
         """Alias for Load all timestamps."""
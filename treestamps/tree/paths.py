@@ -0,0 +1,111 @@
+"""Path normalization without pathlib."""
+
+import os
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Generic, TypeVar
+
+from treestamps.tree.store import Parts
+
+T = TypeVar("T")
+
+# Path strings can be split without pathlib.
+_POSIX_PATHS = os.sep == "/" and os.altsep is None
+# The last working directory and its parts.
+_cwd: tuple[str, Parts] = ("", ())
+
+
+def split_path(path: Path | str) -> tuple[bool, Parts]:
+    """Return if a path is absolute and its parts like pathlib would."""
+    if isinstance(path, str) and _POSIX_PATHS and not path.startswith("//"):
+        parts = tuple(part for part in path.split("/") if part and part != ".")
+        if path.startswith("/"):
+            return True, ("/", *parts)
+        return False, parts
+    path = Path(path)
+    return path.is_absolute(), path.parts
+
+
+def get_cwd_parts() -> Parts:
+    """Return the parts of the current working directory."""
+    global _cwd  # noqa: PLW0603
+    cwd, cwd_parts = _cwd
+    if (new_cwd := os.getcwd()) != cwd:  # noqa: PTH109
+        cwd_parts = split_path(new_cwd)[1]
+        _cwd = (new_cwd, cwd_parts)
+    return cwd_parts
+
+
+def get_absolute_parts(path: Path | str) -> Parts:
+    """Return the absolute parts of a path like Path.absolute() would."""
+    is_absolute, parts = split_path(path)
+    return parts if is_absolute else (*get_cwd_parts(), *parts)
+
+
+def normalize_parts(root_parts: Parts, path: Path | str) -> Parts | None:
+    """Convert a path to the absolute parts of a path in the tree under root."""
+    # Do not normalize with resolve() to keep symlink paths.
+    is_absolute, parts = split_path(path)
+    abs_parts = parts if is_absolute else (*get_cwd_parts(), *parts)
+    depth = len(root_parts)
+    if abs_parts[:depth] == root_parts:
+        # absolute path under the root, return the absolute path
+        return abs_parts
+
+    if not is_absolute:
+        return (*root_parts, *parts)
+
+    if root_parts[: len(abs_parts)] == abs_parts:
+        # path is above the root dir. use the root dir.
+        return root_parts
+
+    # path is outside our jurisdiction.
+    return None
+
+
+class _RootNode(Generic[T]):
+    """Root index node for one path component."""
+
+    __slots__ = ("children", "value")
+
+    def __init__(self) -> None:
+        """Initialize empty node."""
+        self.children: dict[str, _RootNode[T]] = {}
+        self.value: T | None = None
+
+
+class RootIndex(Generic[T]):
+    """
+    Path component trie of root directories.
+
+    Finds the deepest root containing a path in one walk down its parts, so
+    routing costs the path depth, not the number of roots.
+    """
+
+    def __init__(self, roots: Iterable[tuple[Parts, T]] = ()) -> None:
+        """Index roots by their absolute parts."""
+        self._root: _RootNode[T] = _RootNode()
+        for parts, value in roots:
+            self.add(parts, value)
+
+    def add(self, parts: Parts, value: T) -> None:
+        """Add a root by its absolute parts."""
+        node = self._root
+        for part in parts:
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = _RootNode()
+            node = child
+        node.value = value
+
+    def find(self, abs_parts: Parts) -> T | None:
+        """Return the value of the deepest root containing absolute path parts."""
+        result = self._root.value
+        node = self._root
+        for part in abs_parts:
+            node = node.children.get(part)
+            if node is None:
+                break
+            if node.value is not None:
+                result = node.value
+        return result
@@ -1,17 +1,16 @@
 """Set Methods."""
 
+from collections.abc import Iterable
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import TextIO
 
 from treestamps.tree.dump import TreestampsDump
+from treestamps.tree.store import Parts
 
 
 class TreestampsSet(TreestampsDump):
     """Set Methods."""
 
-    _WAL_HEADER: str = "wal:\n"
-
     def _compact_timestamps_below(self, abs_root_path: Path) -> None:
         """Compact the timestamp cache below a particular path."""
         if not abs_root_path.is_dir():
@@ -19,35 +18,101 @@ class TreestampsSet(TreestampsDump):
         root_timestamp = self._timestamps.get(abs_root_path)
         if root_timestamp is None:
             return
-        delete_paths = {
-            abs_path
-            for abs_path, timestamp in self._timestamps.items()
-            if abs_path.is_relative_to(abs_root_path) and timestamp < root_timestamp
-        }
-        for del_path in delete_paths:
-            del self._timestamps[del_path]
+        with self._stats.timer("compact"):
+            deleted = self._timestamps.compact_below(abs_root_path.parts)
+        self._stats.count("compacted", deleted)
         self._printer.compact(
-            "Compacted timestamps under", abs_root_path, root_timestamp
+            "Compacted timestamps under", abs_root_path, timestamp=root_timestamp
         )
 
-    def _write_ahead_log(self, abs_path: Path, mtime: float) -> None:
+    def _open_wal(self) -> None:
+        """Write a new WAL file and open it for appending."""
+        # Init wall
+        self._dumpf_init_wal()
+        self._consumed_paths.add(self._wal_path)
+        self._wal.open(self._serializer.WAL_HEADER)
+
+    def _write_ahead_log(self, abs_parts: Parts, mtime: float) -> None:
         """Write to the WAL."""
-        if not self._wal:
-            # Init wall
-            self._dumpf_init_wal()
-            self._consumed_paths.add(self._wal_path)
-            self._wal: TextIO | None = self._wal_path.open("a")
-            _ = self._wal.write(self._WAL_HEADER)
-
-        # Manually construct yaml dict list item.
-        path_str = self._get_relative_path_str(abs_path)
-        if ":" in path_str:
-            # Safe wal strings. Handled automatically by yaml dumper.
-            # https://github.com/commx/ruamel-yaml/blob/master/util.py#L211
-            path_str = "'" + path_str.replace("'", "''") + "'"
-        wal_entry = f"- {path_str}: {mtime}\n"
-
-        _ = self._wal.write(wal_entry)
+        if not self._wal.is_open:
+            self._open_wal()
+
+        path_str = self._get_relative_parts_str(abs_parts)
+        wal_entry = self._serializer.dump_wal_entry(path_str, mtime)
+
+        self._wal.write(wal_entry)
+        self._stats.count("wal_entries_written")
+
+    def _write_ahead_log_many(self, items: list[tuple[Parts, float]]) -> None:
+        """Write many entries to the WAL in one write."""
+        if not items:
+            return
+        if not self._wal.is_open:
+            self._open_wal()
+        wal_entries = self._serializer.dump_wal_entries(
+            (self._get_relative_parts_str(abs_parts), mtime)
+            for abs_parts, mtime in items
+        )
+        self._wal.write(wal_entries, entries=len(items))
+        self._stats.count("wal_entries_written", len(items))
+
+    def _set_timestamp(
+        self, abs_parts: Parts, mtime: float, *, compact: bool
+    ) -> float | None:
+        """Record the timestamp in memory if it is not older."""
+        # Should we do the set?
+        old_mtime = self._timestamps.get_parts(abs_parts)
+        if old_mtime and old_mtime > mtime:
+            return None
+
+        # Set timestamp
+        self._timestamps.set_parts(abs_parts, mtime)
+        self._changed = True
+        if self._is_incremental():
+            self._dirty[abs_parts] = mtime
+
+        # compact
+        if compact:
+            self._compact_timestamps_below(Path(*abs_parts))
+        else:
+            self._auto_compact_parts(abs_parts, mtime)
+        return mtime
+
+    def _get_big_dir_parts(self, abs_parts: Parts, mtime: float) -> Parts | None:
+        """Return the set path or its parent if it is a big directory to compact."""
+        threshold = self._config.compact_threshold
+        if not threshold:
+            return None
+        if self._timestamps.child_count(abs_parts) >= threshold:
+            return abs_parts
+        parent_parts = abs_parts[:-1]
+        # Re-check a directory only once it has grown since it was compacted.
+        last_count = self._compacted_child_counts.get(parent_parts, 0)
+        if self._timestamps.child_count(parent_parts) >= last_count + threshold:
+            # Only an entry no newer than its ancestors makes the parent compactable.
+            max_timestamp = self._timestamps.get_max(parent_parts)
+            if max_timestamp is not None and mtime <= max_timestamp:
+                return parent_parts
+        return None
+
+    def _auto_compact_parts(self, abs_parts: Parts, mtime: float) -> None:
+        """Compact big directories now and queue others for dumpf()."""
+        if big_dir_parts := self._get_big_dir_parts(abs_parts, mtime):
+            deleted = self._compact_parts((big_dir_parts,))
+            self._compacted_child_counts[big_dir_parts] = self._timestamps.child_count(
+                big_dir_parts
+            )
+            if deleted:
+                self._printer.compact(
+                    "Compacted %d timestamps under", big_dir_parts, deleted
+                )
+        elif self._config.auto_compact and self._timestamps.child_count(abs_parts):
+            # Only paths with children have timestamps below them to compact.
+            self._compact_pending.add(abs_parts)
+
+    @staticmethod
+    def _now() -> float:
+        return datetime.now(tz=timezone.utc).timestamp()
 
     def set(
         self,
@@ -57,29 +122,63 @@ class TreestampsSet(TreestampsDump):
         compact: bool = False,
     ) -> float | None:
         """Record the timestamp."""
-        abs_path = self._get_absolute_path(self.root_dir, path)
-        if not abs_path:
+        abs_parts = self._get_absolute_parts(self.root_dir, path)
+        if abs_parts is None:
             return None
-
-        # Should we do the set?
-        old_mtime = self._timestamps.get(abs_path)
+        self._load_parts((abs_parts,))
         if mtime is None:
-            mtime = datetime.now(tz=timezone.utc).timestamp()
-        if old_mtime and old_mtime > mtime:
+            mtime = self._now()
+        if self._set_timestamp(abs_parts, mtime, compact=compact) is None:
             return None
 
-        # Set timestamp
-        self._timestamps[abs_path] = mtime
-        self._changed = True
-
-        # compact
-        if compact:
-            self._compact_timestamps_below(abs_path)
-
         # write to wal
-        self._write_ahead_log(abs_path, mtime)
+        self._write_ahead_log(abs_parts, mtime)
         return mtime
 
+    def set_many(
+        self,
+        paths: Iterable[Path | str],
+        mtimes: Iterable[float | None] | float | None = None,
+        *,
+        compact: bool = False,
+    ) -> list[float | None]:
+        """
+        Record the timestamps of many paths with one WAL write.
+
+        mtimes may be one timestamp for every path or one per path. None means
+        now. Returns what set() would have returned for each path.
+        """
+        parts_list = [self._get_absolute_parts(self.root_dir, path) for path in paths]
+        if mtimes is None or isinstance(mtimes, int | float):
+            mtimes = [mtimes] * len(parts_list)
+        else:
+            mtimes = list(mtimes)
+            if len(mtimes) != len(parts_list):
+                reason = f"{len(mtimes)} mtimes for {len(parts_list)} paths"
+                raise ValueError(reason)
+        self._load_parts(parts for parts in parts_list if parts is not None)
+        now = self._now()
+        results = []
+        wal_items = []
+        for abs_parts, mtime in zip(parts_list, mtimes, strict=True):
+            result = None
+            if abs_parts is not None:
+                result = self._set_timestamp(
+                    abs_parts, now if mtime is None else mtime, compact=compact
+                )
+                if result is not None:
+                    wal_items.append((abs_parts, result))
+            results.append(result)
+        self._write_ahead_log_many(wal_items)
+        return results
+
+    def apply_sets(
+        self, sets: Iterable[tuple[Path | str, float]]
+    ) -> list[float | None]:
+        """Apply a batch of paths and timestamps set by workers in one WAL write."""
+        sets = tuple(sets)
+        return self.set_many([path for path, _ in sets], [mtime for _, mtime in sets])
+
     def compact(self, path: Path | str) -> None:
         """
         Compact timestamps below path without recording a new timestamp.
@@ -0,0 +1,233 @@
+"""Sharded timestamp files."""
+
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from uuid import uuid4
+
+from treestamps.config import SHARD_SUBDIR
+from treestamps.serializers import get_serializer
+from treestamps.tree.load import TreestampLoad
+from treestamps.tree.set import TreestampsSet
+from treestamps.tree.store import Parts
+
+
+class TreestampsShard(TreestampsSet, TreestampLoad):
+    """
+    Split a tree's timestamps into shard files beside the main file.
+
+    Shards are keyed by top level subdirectory or by a hash of the top level
+    path component. They are loaded lazily when a path in them is read or
+    written and only changed shards are rewritten on dump.
+    """
+
+    def _get_path_shard_key(self, abs_parts: Parts) -> str | None:
+        """Return the shard key for absolute path parts, None if outside the root."""
+        root_parts = self.root_dir.parts
+        if not self._shard_layout or abs_parts[: len(root_parts)] != root_parts:
+            return None
+        return self._get_shard_key(self._shard_layout, abs_parts[len(root_parts) :])
+
+    def _get_shard_path(self, key: str) -> Path:
+        """Return the path of a root shard file."""
+        return self.root_dir / self.get_shard_filename(self._config.program_name, key)
+
+    def _load_shard(self, key: str) -> None:
+        """Load a root shard file the first time it is needed."""
+        if key in self._shards_loaded:
+            return
+        self._shards_loaded.add(key)
+        if path := self._shard_paths.get(key):
+            self.loadf(path)
+
+    def _load_all_shards(self) -> None:
+        """Load every root shard file."""
+        for key in tuple(self._shard_paths):
+            self._load_shard(key)
+
+    def _consume_child_timestamps(self, path: Path) -> None:
+        """Defer loading root shards written with the configured layout."""
+        if (
+            self._shard_layout
+            and path.parent == self.root_dir
+            and self._shard_layouts.get(self.root_dir) == self._shard_layout
+            and (match := self._shard_re.fullmatch(path.name))
+        ):
+            self._shard_paths[match.group("key")] = path
+            return
+        super()._consume_child_timestamps(path)
+
+    def _load_parent_shards(self) -> None:
+        """Load the shards of sharded parent trees that cover this tree."""
+        for parent, layout in tuple(self._shard_layouts.items()):
+            if parent == self.root_dir or not self.root_dir.is_relative_to(parent):
+                continue
+            top_name = self.root_dir.relative_to(parent).parts[0]
+            key = self._get_subtree_shard_key(layout, top_name)
+            path = parent / self.get_shard_filename(self._config.program_name, key)
+            if path.is_file():
+                self.loadf(path)
+
+    def loadf_tree(self) -> None:
+        """Load all timestamp files up and down this tree."""
+        super().loadf_tree()
+        self._load_parent_shards()
+
+    def _load_parts(self, parts_list: Iterable[Parts]) -> None:
+        """Load the shards of paths before they are used."""
+        if not self._shard_layout:
+            return
+        for abs_parts in parts_list:
+            key = self._get_path_shard_key(abs_parts)
+            if key is not None:
+                self._load_shard(key)
+
+    def _set_timestamp(
+        self, abs_parts: Parts, mtime: float, *, compact: bool
+    ) -> float | None:
+        """Mark the path's shard changed."""
+        result = super()._set_timestamp(abs_parts, mtime, compact=compact)
+        if (
+            result is not None
+            and self._shard_layout
+            and (key := self._get_path_shard_key(abs_parts)) is not None
+        ):
+            self._dirty_shards.add(key)
+        return result
+
+    def _compact_parts(self, parts_list: Iterable[Parts]) -> int:
+        """Load the shards of the subtrees first and mark them changed."""
+        if not self._shard_layout:
+            return super()._compact_parts(parts_list)
+        parts_list = tuple(parts_list)
+        root_depth = len(self.root_dir.parts)
+        keys = set()
+        for abs_parts in parts_list:
+            rel_parts = abs_parts[root_depth:]
+            if not rel_parts:
+                self._load_all_shards()
+                keys = set(self._get_all_shard_keys())
+                break
+            keys.add(self._get_subtree_shard_key(self._shard_layout, rel_parts[0]))
+        for key in keys:
+            self._load_shard(key)
+        deleted = super()._compact_parts(parts_list)
+        if deleted:
+            self._dirty_shards |= keys
+        return deleted
+
+    def _is_wal_delta(self) -> bool:
+        """Sharded trees never snapshot into the WAL, it would load every shard."""
+        return bool(self._shard_layout) or super()._is_wal_delta()
+
+    def dump_dict(self) -> dict:
+        """Serialize all timestamps, including unloaded shards, to a dict."""
+        if self._shard_layout:
+            self._load_all_shards()
+        return super().dump_dict()
+
+    def _get_shard_dict(self, key: str) -> dict:
+        """Serialize the timestamps in one shard."""
+        yaml = {}
+        root_parts = self.root_dir.parts
+        for name in self._timestamps.child_names(root_parts):
+            if self._get_subtree_shard_key(self._shard_layout, name) != key:  # pyright: ignore[reportArgumentType]
+                continue
+            top_parts = (*root_parts, name)
+            if self._shard_layout != SHARD_SUBDIR:
+                timestamp = self._timestamps.get(Path(*top_parts))
+                if timestamp is not None:
+                    yaml[name] = timestamp
+            for abs_path, timestamp in self._timestamps.items_below(top_parts):
+                yaml[self._get_relative_path_str(abs_path)] = timestamp
+        if yaml:
+            yaml = {**self._get_dumpable_program_config(), **yaml}
+        return yaml
+
+    def _get_main_shard_dict(self) -> dict:
+        """Serialize the timestamps kept in the main file."""
+        yaml = self._get_dumpable_program_config()
+        timestamp = self._timestamps.get(self.root_dir)
+        if timestamp is not None:
+            yaml[self._get_relative_path_str(self.root_dir)] = timestamp
+        if self._shard_layout == SHARD_SUBDIR:
+            for name in self._timestamps.child_names(self.root_dir.parts):
+                timestamp = self._timestamps.get(self.root_dir / name)
+                if timestamp is not None:
+                    yaml[name] = timestamp
+        self._set_metadata(yaml, self._SHARDS_TAG, self._shard_layout)
+        return yaml
+
+    def _get_all_shard_keys(self) -> frozenset[str]:
+        """Return the keys of every shard with timestamps or a file."""
+        keys = set(self._shard_paths)
+        for name in self._timestamps.child_names(self.root_dir.parts):
+            keys.add(self._get_subtree_shard_key(self._shard_layout, name))  # pyright: ignore[reportArgumentType]
+        return frozenset(keys)
+
+    def _write_shard(self, path: Path, yaml: dict) -> None:
+        """Write one shard file or remove it if empty."""
+        try:
+            if yaml:
+                # Serializers are not thread safe, so use a private one.
+                get_serializer(self._config.file_format).dump(yaml, path)
+            else:
+                path.unlink(missing_ok=True)
+        except Exception as exc:
+            self._printer.error(f"Writing timestamp shard {path}", exc)
+
+    def _write_shards(self, shards: dict[Path, dict]) -> None:
+        """Write shard files, in parallel if configured."""
+        if self._config.shard_workers > 1 and len(shards) > 1:
+            with ThreadPoolExecutor(
+                max_workers=self._config.shard_workers,
+                thread_name_prefix="treestamps-shard",
+            ) as executor:
+                for future in [
+                    executor.submit(self._write_shard, path, yaml)
+                    for path, yaml in shards.items()
+                ]:
+                    future.result()
+        else:
+            for path, yaml in shards.items():
+                self._write_shard(path, yaml)
+
+    def _dumpf_full(self, *, background: bool = False) -> None:
+        """Write the changed shards and the main file."""
+        if not self._shard_layout:
+            super()._dumpf_full(background=background)
+            return
+        if (
+            self._wal_recovered
+            or not self._dump_path.exists()
+            or self._were_child_timestamps_consumed()
+            or self._shard_layouts.get(self.root_dir) != self._shard_layout
+        ):
+            # Timestamps may have arrived for any shard.
+            self._load_all_shards()
+            keys = self._get_all_shard_keys()
+        else:
+            keys = self._dirty_shards
+        keys = keys - {""}
+        self._close_wal()
+        paths = {key: self._get_shard_path(key) for key in keys}
+        with self._stats.timer("dump_dict"):
+            shards = {path: self._get_shard_dict(key) for key, path in paths.items()}
+        with self._stats.timer("serialize"):
+            self._write_shards(shards)
+        for key, path in paths.items():
+            if shards[path]:
+                self._shard_paths[key] = path
+            else:
+                self._shard_paths.pop(key, None)
+        # Don't clean up shards just rewritten over consumed ones.
+        self._consumed_paths.difference_update(shards)
+
+        yaml = self._get_main_shard_dict()
+        generation = uuid4().hex
+        self._set_metadata(yaml, self._GENERATION_TAG, generation)
+        self._generations[self.root_dir] = generation
+        self._write_dump_file(yaml)
+        self._shard_layouts[self.root_dir] = self._shard_layout
+        self._dirty_shards = set()
+        self._printer.save("Saved %d timestamp shards for", self.root_dir, len(keys))
@@ -0,0 +1,103 @@
+"""Picklable timestamp snapshots for worker processes."""
+
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from treestamps.tree.index import TimestampIndex
+from treestamps.tree.paths import normalize_parts
+from treestamps.tree.store import Parts, TimestampTrie
+
+
+class TimestampSnapshot:
+    """
+    Compact copy of a tree's timestamps for worker processes.
+
+    Timestamps below the root are packed into the 16 bytes per entry of a
+    TimestampIndex, so pickling it is one bytes copy instead of a Path per
+    entry. The few others, like parent directory timestamps, are kept as path
+    parts. get() answers like Treestamps.get(). set() records timestamps in
+    the worker and take_sets() returns them as a batch for the parent to
+    apply with apply_sets().
+    """
+
+    def __init__(
+        self,
+        root_dir: Path,
+        data: bytes,
+        extra: Iterable[tuple[Parts, float]] = (),
+    ) -> None:
+        """Unpack the index and the extra timestamps."""
+        self.root_dir: Path = root_dir
+        self._root_parts: Parts = root_dir.parts
+        self._data: bytes = data
+        self._extra: tuple[tuple[Parts, float], ...] = tuple(extra)
+        self._index: TimestampIndex = TimestampIndex.from_bytes(data)
+        self._overlay: TimestampTrie = TimestampTrie()
+        self._overlay.merge_max(self._extra)
+        self._sets: list[tuple[str, float]] = []
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Pickle the packed bytes, not the views over them."""
+        return {
+            "root_dir": self.root_dir,
+            "data": self._data,
+            "extra": self._extra,
+            "sets": self._sets,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Unpack the index after unpickling."""
+        self.__init__(state["root_dir"], state["data"], state["extra"])
+        self._sets = state["sets"]
+
+    def __len__(self) -> int:
+        """Return the number of packed timestamps."""
+        return len(self._index)
+
+    def _get_parts(self, abs_parts: Parts) -> float | None:
+        """Get the max timestamp of absolute path parts and their ancestors."""
+        rel_parts = abs_parts[len(self._root_parts) :]
+        return max(
+            (
+                timestamp
+                for timestamp in (
+                    self._index.get_max(rel_parts),
+                    self._overlay.get_max(abs_parts),
+                )
+                if timestamp is not None
+            ),
+            default=None,
+        )
+
+    def _set_parts(self, abs_parts: Parts, mtime: float | None) -> float | None:
+        """Record a timestamp if it is not older than the path's own."""
+        if mtime is None:
+            mtime = datetime.now(tz=timezone.utc).timestamp()
+        rel_parts = abs_parts[len(self._root_parts) :]
+        for old_mtime in (
+            self._overlay.get_parts(abs_parts),
+            self._index.get(str(Path(*rel_parts))),
+        ):
+            if old_mtime and old_mtime > mtime:
+                return None
+        self._overlay.set_parts(abs_parts, mtime)
+        self._sets.append((str(Path(*abs_parts)), mtime))
+        return mtime
+
+    def get(self, path: Path | str) -> float | None:
+        """Get the timestamps up the directory tree. All the way to root."""
+        abs_parts = normalize_parts(self._root_parts, path)
+        return None if abs_parts is None else self._get_parts(abs_parts)
+
+    def set(self, path: Path | str, mtime: float | None = None) -> float | None:
+        """Record a timestamp in this snapshot to send back with take_sets()."""
+        abs_parts = normalize_parts(self._root_parts, path)
+        return None if abs_parts is None else self._set_parts(abs_parts, mtime)
+
+    def take_sets(self) -> list[tuple[str, float]]:
+        """Return and forget the absolute paths and timestamps set so far."""
+        sets = self._sets
+        self._sets = []
+        return sets
@@ -0,0 +1,401 @@
+"""Timestamp stores."""
+
+from abc import ABC, abstractmethod
+from collections.abc import (
+    ItemsView,
+    Iterable,
+    Iterator,
+    MutableMapping,
+    Sequence,
+)
+from operator import itemgetter
+from pathlib import Path
+
+Parts = tuple[str, ...]
+
+
+class TimestampStore(MutableMapping[Path, float], ABC):
+    """
+    Absolute path keyed timestamp store.
+
+    Behaves like a dict[Path, float] with extra tree aware operations that
+    take path parts so hot paths need not allocate Path objects.
+    """
+
+    def get_parts(self, parts: Parts) -> float | None:
+        """Return a path's own timestamp by its parts."""
+        return self.get(Path(*parts))
+
+    def set_parts(self, parts: Parts, value: float) -> None:
+        """Set a path's own timestamp by its parts."""
+        self[Path(*parts)] = value
+
+    def iter_parts(self) -> Iterator[tuple[Parts, float]]:
+        """Iterate over path parts, timestamp pairs."""
+        for path, timestamp in self.items():
+            yield path.parts, timestamp
+
+    @abstractmethod
+    def get_max(self, parts: Parts) -> float | None:
+        """Return the maximum timestamp of a path and all its ancestors."""
+
+    def get_max_many(self, parts_list: Sequence[Parts]) -> list[float | None]:
+        """Return get_max() for many paths."""
+        return [self.get_max(parts) for parts in parts_list]
+
+    @abstractmethod
+    def compact_below(self, parts: Parts) -> int:
+        """Delete timestamps below a path older than it. Return deleted count."""
+
+    def compact_many(self, parts_list: Iterable[Parts]) -> int:
+        """
+        Delete timestamps below paths older than any of their ancestors.
+
+        Return the deleted count.
+        """
+        roots = frozenset(parts_list)
+        deleted = 0
+        for parts, timestamp in tuple(self.iter_parts()):
+            if not any(
+                len(parts) > len(root) and parts[: len(root)] == root for root in roots
+            ):
+                continue
+            old_timestamp = self.get_max(parts[:-1])
+            if old_timestamp is not None and timestamp < old_timestamp:
+                del self[Path(*parts)]
+                deleted += 1
+        return deleted
+
+    def merge_max(self, items: Iterable[tuple[Parts, float]]) -> int:
+        """
+        Set timestamps newer than the path's current maximum.
+
+        Items are applied parents first. Return the number of accepted items.
+        """
+        accepted = 0
+        for parts, timestamp in sorted(items, key=itemgetter(0)):
+            old_timestamp = self.get_max(parts)
+            if old_timestamp is None or timestamp > old_timestamp:
+                self.set_parts(parts, timestamp)
+                accepted += 1
+        return accepted
+
+    def items_below(self, parts: Parts) -> Iterator[tuple[Path, float]]:
+        """Iterate over timestamps strictly below a path."""
+        depth = len(parts)
+        for path, timestamp in self.items():
+            if len(path.parts) > depth and path.parts[:depth] == parts:
+                yield path, timestamp
+
+    def child_names(self, parts: Parts) -> tuple[str, ...]:
+        """Return the names of children of a path that lead to timestamps."""
+        depth = len(parts)
+        return tuple(
+            dict.fromkeys(
+                path.parts[depth]
+                for path in self
+                if len(path.parts) > depth and path.parts[:depth] == parts
+            )
+        )
+
+    def child_count(self, parts: Parts) -> int:
+        """Return the number of children of a path that lead to timestamps."""
+        return len(self.child_names(parts))
+
+    def __repr__(self) -> str:
+        """Represent as a dict."""
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+
+class _Node:
+    """Trie node for one path component."""
+
+    __slots__ = ("children", "timestamp")
+
+    def __init__(self) -> None:
+        """Initialize empty node."""
+        self.children: dict[str, _Node] = {}
+        self.timestamp: float | None = None
+
+
+class TimestampTrie(TimestampStore):
+    """Path component keyed trie of timestamps."""
+
+    def __init__(self) -> None:
+        """Initialize empty trie."""
+        self._root: _Node = _Node()
+        self._len: int = 0
+
+    def _find(self, parts: Parts) -> _Node | None:
+        """Find the node for path parts."""
+        node = self._root
+        for part in parts:
+            node = node.children.get(part)
+            if node is None:
+                break
+        return node
+
+    def _find_or_create(self, parts: Parts) -> _Node:
+        """Find the node for path parts, creating it if needed."""
+        node = self._root
+        for part in parts:
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = _Node()
+            node = child
+        return node
+
+    def __getitem__(self, key: Path) -> float:
+        """Get a path's own timestamp."""
+        node = self._find(key.parts)
+        if node is None or node.timestamp is None:
+            raise KeyError(key)
+        return node.timestamp
+
+    def __setitem__(self, key: Path, value: float) -> None:
+        """Set a path's own timestamp."""
+        self.set_parts(key.parts, value)
+
+    def get_parts(self, parts: Parts) -> float | None:
+        """Return a path's own timestamp without a Path."""
+        node = self._find(parts)
+        return None if node is None else node.timestamp
+
+    def set_parts(self, parts: Parts, value: float) -> None:
+        """Set a path's own timestamp without a Path."""
+        node = self._find_or_create(parts)
+        if node.timestamp is None:
+            self._len += 1
+        node.timestamp = value
+
+    def __delitem__(self, key: Path) -> None:
+        """Delete a path's own timestamp and prune empty nodes."""
+        stack = [self._root]
+        for part in key.parts:
+            node = stack[-1].children.get(part)
+            if node is None:
+                raise KeyError(key)
+            stack.append(node)
+        node = stack[-1]
+        if node.timestamp is None:
+            raise KeyError(key)
+        node.timestamp = None
+        self._len -= 1
+        for part in reversed(key.parts):
+            node = stack.pop()
+            if node.children or node.timestamp is not None:
+                break
+            del stack[-1].children[part]
+
+    def _iter_parts(
+        self, parts: Parts = (), node: _Node | None = None
+    ) -> Iterator[tuple[Parts, float]]:
+        """Walk the (sub)trie depth first yielding parents before children."""
+        stack: list[tuple[Parts, _Node]] = [(parts, node or self._root)]
+        while stack:
+            parts, node = stack.pop()
+            if node.timestamp is not None:
+                yield parts, node.timestamp
+            stack.extend(
+                ((*parts, part), child)
+                for part, child in reversed(node.children.items())
+            )
+
+    def __iter__(self) -> Iterator[Path]:
+        """Iterate over paths with timestamps."""
+        for parts, _ in self._iter_parts():
+            yield Path(*parts)
+
+    def __len__(self) -> int:
+        """Return number of timestamps."""
+        return self._len
+
+    def iter_parts(self) -> Iterator[tuple[Parts, float]]:
+        """Walk the trie once yielding path parts and timestamps."""
+        return self._iter_parts()
+
+    def items(self) -> ItemsView[Path, float]:
+        """Return an items view that walks the trie once."""
+        return _TrieItemsView(self)
+
+    def clear(self) -> None:
+        """Remove all timestamps."""
+        self._root = _Node()
+        self._len = 0
+
+    def items_below(self, parts: Parts) -> Iterator[tuple[Path, float]]:
+        """Walk only the subtree below a path."""
+        node = self._find(parts)
+        if node is None:
+            return
+        for part, child in node.children.items():
+            for child_parts, timestamp in self._iter_parts((*parts, part), child):
+                yield Path(*child_parts), timestamp
+
+    def child_names(self, parts: Parts) -> tuple[str, ...]:
+        """Return the child node names of a path."""
+        node = self._find(parts)
+        return tuple(node.children) if node else ()
+
+    def child_count(self, parts: Parts) -> int:
+        """Return the number of child nodes of a path."""
+        node = self._find(parts)
+        return len(node.children) if node else 0
+
+    def get_max(self, parts: Parts) -> float | None:
+        """Return the running max timestamp walking down to path."""
+        result: float | None = None
+        node = self._root
+        for part in parts:
+            node = node.children.get(part)
+            if node is None:
+                break
+            timestamp = node.timestamp
+            if timestamp is not None and (result is None or timestamp > result):
+                result = timestamp
+        return result
+
+    def get_max_many(self, parts_list: Sequence[Parts]) -> list[float | None]:
+        """
+        Return get_max() for many paths.
+
+        Paths are visited in sorted order so siblings reuse the walk down
+        their shared ancestors.
+        """
+        results: list[float | None] = [None] * len(parts_list)
+        order = sorted(range(len(parts_list)), key=parts_list.__getitem__)
+        # Stack of (node, running max) for each component of prev_parts.
+        stack: list[tuple[_Node | None, float | None]] = [(self._root, None)]
+        prev_parts: Parts = ()
+        for index in order:
+            parts = parts_list[index]
+            common = 0
+            limit = min(len(prev_parts), len(parts))
+            while common < limit and prev_parts[common] == parts[common]:
+                common += 1
+            del stack[common + 1 :]
+            node, result = stack[-1]
+            for part in parts[common:]:
+                if node is not None:
+                    node = node.children.get(part)
+                    if node is not None:
+                        timestamp = node.timestamp
+                        if timestamp is not None and (
+                            result is None or timestamp > result
+                        ):
+                            result = timestamp
+                stack.append((node, result))
+            results[index] = result
+            prev_parts = parts
+        return results
+
+    def merge_max(self, items: Iterable[tuple[Parts, float]]) -> int:
+        """
+        Set timestamps newer than the path's current maximum.
+
+        Items are sorted so siblings share the walk down from their common
+        ancestor and the ancestor max is carried down instead of recomputed.
+        """
+        accepted = 0
+        prev_parts: Parts = ()
+        # Nodes along prev_parts and the running max down to each of them.
+        stack: list[tuple[_Node, float | None]] = [(self._root, None)]
+        for parts, timestamp in sorted(items, key=itemgetter(0)):
+            common = 0
+            limit = min(len(prev_parts), len(parts))
+            while common < limit and prev_parts[common] == parts[common]:
+                common += 1
+            del stack[common + 1 :]
+            node, running = stack[-1]
+            for part in parts[len(stack) - 1 :]:
+                child = node.children.get(part)
+                if child is None:
+                    break
+                node = child
+                if node.timestamp is not None and (
+                    running is None or node.timestamp > running
+                ):
+                    running = node.timestamp
+                stack.append((node, running))
+            if running is None or timestamp > running:
+                for part in parts[len(stack) - 1 :]:
+                    child = node.children[part] = _Node()
+                    node = child
+                    stack.append((node, running))
+                if node.timestamp is None:
+                    self._len += 1
+                node.timestamp = timestamp
+                stack[-1] = (node, timestamp)
+                accepted += 1
+            prev_parts = parts[: len(stack) - 1]
+        return accepted
+
+    def _compact_node(self, node: _Node, root_timestamp: float) -> int:
+        """Delete older timestamps below node and prune empty children."""
+        deleted = 0
+        for part, child in tuple(node.children.items()):
+            deleted += self._compact_node(child, root_timestamp)
+            if child.timestamp is not None and child.timestamp < root_timestamp:
+                child.timestamp = None
+                deleted += 1
+            if not child.children and child.timestamp is None:
+                del node.children[part]
+        return deleted
+
+    def compact_below(self, parts: Parts) -> int:
+        """Delete timestamps in the subtree older than the subtree root."""
+        node = self._find(parts)
+        if node is None or node.timestamp is None:
+            return 0
+        deleted = self._compact_node(node, node.timestamp)
+        self._len -= deleted
+        return deleted
+
+    def _compact_node_max(self, node: _Node, running: float | None) -> int:
+        """Delete timestamps older than the running max of their ancestors."""
+        deleted = 0
+        for part, child in tuple(node.children.items()):
+            child_running = running
+            timestamp = child.timestamp
+            if timestamp is not None:
+                if running is not None and timestamp < running:
+                    child.timestamp = None
+                    deleted += 1
+                else:
+                    child_running = timestamp
+            if child.children:
+                deleted += self._compact_node_max(child, child_running)
+            if not child.children and child.timestamp is None:
+                del node.children[part]
+        return deleted
+
+    def compact_many(self, parts_list: Iterable[Parts]) -> int:
+        """
+        Compact the subtrees below many paths in one bottom up pass.
+
+        Only the subtrees are walked, so the cost scales with their size.
+        Subtrees inside another subtree in the list are not walked twice.
+        """
+        deleted = 0
+        prev_parts: Parts | None = None
+        for parts in sorted(set(parts_list)):
+            if prev_parts is not None and parts[: len(prev_parts)] == prev_parts:
+                continue
+            node = self._find(parts)
+            if node is None or not node.children:
+                continue
+            prev_parts = parts
+            deleted += self._compact_node_max(node, self.get_max(parts))
+        self._len -= deleted
+        return deleted
+
+
+class _TrieItemsView(ItemsView[Path, float]):
+    """Items view that avoids a lookup per key."""
+
+    _mapping: TimestampTrie
+
+    def __iter__(self) -> Iterator[tuple[Path, float]]:
+        """Iterate over path, timestamp pairs."""
+        for parts, timestamp in self._mapping._iter_parts():  # noqa: SLF001
+            yield Path(*parts), timestamp
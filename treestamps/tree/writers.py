@@ -0,0 +1,117 @@
+"""Multi process writer methods."""
+
+import os
+from pathlib import Path
+from typing import TextIO
+
+from treestamps.lock import FileLock
+from treestamps.tree.indexed import TreestampsIndexed
+
+
+class TreestampsWriters(TreestampsIndexed):
+    """
+    Let many processes write timestamps for the same tree.
+
+    With multi_writer, each writer appends to its own WAL named by writer_id
+    or its PID and holds a lock on it while it is open. dumpf() holds a lock
+    file while it merges the main file other writers may have written since
+    this one loaded and atomically replaces it. loadf_tree() reads under a
+    shared lock on the same file. WALs of other writers are removed only once
+    their writer has released them.
+    """
+
+    def _get_dump_mtime_ns(self) -> int | None:
+        """Return the main file's modification time."""
+        try:
+            return self._dump_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _opened_timestamps_file(self, path: Path, file: TextIO) -> None:
+        """Remember which version of the main file was loaded."""
+        super()._opened_timestamps_file(path, file)
+        if self._config.multi_writer and path == self._dump_path:
+            self._dump_mtime_ns = os.fstat(file.fileno()).st_mtime_ns
+
+    def loadf_tree(self) -> None:
+        """Don't read the main file while another writer replaces it."""
+        if not self._config.multi_writer:
+            super().loadf_tree()
+            return
+        self._dump_mtime_ns = None
+        with FileLock(self._lock_path, shared=True):
+            super().loadf_tree()
+
+    def _write_dump_file(self, yaml: dict) -> None:
+        """Replace the main file so other writers never read it half written."""
+        if not self._config.multi_writer:
+            super()._write_dump_file(yaml)
+            return
+        tmp_path = self._dump_path.with_name(
+            f"{self._dump_path.name}.{os.getpid()}.tmp"
+        )
+        with self._stats.timer("serialize"):
+            self._serializer.dump(yaml, tmp_path)
+            with tmp_path.open("rb") as file:
+                os.fsync(file.fileno())
+        tmp_path.replace(self._dump_path)
+
+    def _is_wal_delta(self) -> bool:
+        """Writers only log their own timestamps."""
+        return self._config.multi_writer or super()._is_wal_delta()
+
+    def _open_wal(self) -> None:
+        """Lock a WAL without a base before truncating it and writing its header."""
+        if not self._config.multi_writer:
+            super()._open_wal()
+            return
+        # Other writers change the main file, so only the config is written.
+        config = self._get_dumpable_program_config()
+        header = self._serializer.dumps(config) + self._serializer.WAL_HEADER
+        self._wal.open(header, truncate=True)
+        self._consumed_paths.add(self._wal_path)
+
+    def _merge_dump_file(self) -> None:
+        """Merge the main file if another writer wrote it since it was loaded."""
+        mtime_ns = self._get_dump_mtime_ns()
+        if mtime_ns is not None and mtime_ns != self._dump_mtime_ns:
+            self.loadf(self._dump_path)
+
+    def _is_other_writer_wal(self, path: Path) -> bool:
+        """Return if the path is the WAL of another writer of this tree."""
+        return (
+            path.parent == self.root_dir
+            and path != self._wal_path
+            and bool(self._writer_wal_re.fullmatch(path.name))
+        )
+
+    def _cleanup_other_writer_wals(self) -> None:
+        """Remove consumed WALs of other writers that are not in use."""
+        for path in tuple(self._consumed_paths):
+            if not self._is_other_writer_wal(path):
+                continue
+            self._consumed_paths.discard(path)
+            wal_lock = FileLock(path)
+            try:
+                if wal_lock.acquire(blocking=False):
+                    path.unlink(missing_ok=True)
+            except Exception as exc:
+                self._printer.warn(f"Removing old timestamp {path}", exc)
+            finally:
+                wal_lock.release()
+
+    def cleanup_old_timestamps(self) -> None:
+        """Keep the WALs of other writers that are still running."""
+        if self._config.multi_writer:
+            self._cleanup_other_writer_wals()
+        super().cleanup_old_timestamps()
+
+    def dumpf(self) -> None:
+        """Merge and dump while holding the tree's lock."""
+        if not self._config.multi_writer or self._config.read_only:
+            super().dumpf()
+            return
+        with FileLock(self._lock_path):
+            self._merge_dump_file()
+            super().dumpf()
+            self._dump_mtime_ns = self._get_dump_mtime_ns()
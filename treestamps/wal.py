@@ -0,0 +1,160 @@
+"""Write ahead log file writer."""
+
+import os
+from pathlib import Path
+from time import monotonic, sleep
+from typing import TextIO
+
+from treestamps.lock import lock_file
+
+WAL_DURABILITY_NONE = "none"
+WAL_DURABILITY_FLUSH = "flush"
+WAL_DURABILITY_FSYNC = "fsync"
+WAL_DURABILITIES = frozenset(
+    {WAL_DURABILITY_FLUSH, WAL_DURABILITY_FSYNC, WAL_DURABILITY_NONE}
+)
+WAL_MODE_SNAPSHOT = "snapshot"
+WAL_MODE_DELTA = "delta"
+WAL_MODES = frozenset({WAL_MODE_DELTA, WAL_MODE_SNAPSHOT})
+
+
+class WriteAheadLog:
+    """
+    Buffered append only log with a configurable durability policy.
+
+    none: Leave flushing to the buffer and the OS.
+    flush: Flush the buffer to the OS when a group commits.
+    fsync: Flush and fsync to disk when a group commits.
+
+    A group commits after flush_entries entries or when an entry is written
+    flush_ms milliseconds after the last commit, whichever comes first. With
+    neither set every entry commits.
+
+    With locked, the log holds an advisory lock on its file while open so
+    other processes can tell it is in use. Opening waits up to LOCK_WAIT
+    seconds for the lock, so other writers probing it don't make it fail.
+    """
+
+    _BUFFER_SIZE: int = 64 * 1024
+    _LOCK_WAIT: float = 1.0
+    _LOCK_POLL: float = 0.01
+
+    def __init__(
+        self,
+        path: Path,
+        durability: str = WAL_DURABILITY_NONE,
+        flush_entries: int = 0,
+        flush_ms: float = 0.0,
+        *,
+        locked: bool = False,
+    ) -> None:
+        """Initialize policy and counters."""
+        self.path: Path = path
+        self._locked: bool = locked
+        self._durability: str = durability
+        self._flush_entries: int = flush_entries
+        self._flush_interval: float = flush_ms / 1000
+        self._file: TextIO | None = None
+        self._pending: int = 0
+        self._last_commit: float = 0.0
+        self.entries_written: int = 0
+        self.flushes: int = 0
+        self.syncs: int = 0
+
+    @property
+    def is_open(self) -> bool:
+        """Return if the log file is open."""
+        return self._file is not None
+
+    def _lock(self, file: TextIO) -> bool:
+        """Wait briefly for the lock. Return if it was taken."""
+        deadline = monotonic() + self._LOCK_WAIT
+        while not lock_file(file, blocking=False):
+            if monotonic() >= deadline:
+                return False
+            sleep(self._LOCK_POLL)
+        return True
+
+    def _is_linked(self, file: TextIO) -> bool:
+        """Return if the open file is still the one at the log's path."""
+        try:
+            return os.fstat(file.fileno()).st_ino == self.path.stat().st_ino
+        except FileNotFoundError:
+            return False
+
+    def _open_locked(self) -> TextIO:
+        """Open and lock the log, reopening it if it was removed while waiting."""
+        while True:
+            file = self.path.open("a", buffering=self._BUFFER_SIZE)
+            if not self._lock(file):
+                file.close()
+                reason = f"Write ahead log {self.path} is in use by another writer"
+                raise ValueError(reason)
+            if self._is_linked(file):
+                return file
+            file.close()
+
+    def open(self, header: str = "", *, truncate: bool = False) -> None:
+        """Open the log for appending, truncate it if asked and write a header."""
+        if self._locked:
+            self._file = self._open_locked()
+        else:
+            self._file = self.path.open("a", buffering=self._BUFFER_SIZE)
+        if truncate:
+            # Only truncate once locked so a live writer's log survives.
+            self._file.truncate(0)
+        if header:
+            self._file.write(header)
+        self._last_commit = monotonic()
+
+    def _is_group_full(self) -> bool:
+        """Return if the pending group should commit."""
+        if not self._flush_entries and not self._flush_interval:
+            return True
+        if self._flush_entries and self._pending >= self._flush_entries:
+            return True
+        return bool(
+            self._flush_interval
+            and monotonic() - self._last_commit >= self._flush_interval
+        )
+
+    def commit(self) -> None:
+        """Flush pending entries according to the durability policy."""
+        if self._file is None or not self._pending:
+            return
+        self._file.flush()
+        self.flushes += 1
+        if self._durability == WAL_DURABILITY_FSYNC:
+            os.fsync(self._file.fileno())
+            self.syncs += 1
+        self._pending = 0
+        self._last_commit = monotonic()
+
+    def write(self, text: str, entries: int = 1) -> None:
+        """Append preformatted entries to the log."""
+        if self._file is None:
+            reason = f"Write ahead log {self.path} is not open"
+            raise ValueError(reason)
+        self._file.write(text)
+        self.entries_written += entries
+        if self._durability == WAL_DURABILITY_NONE:
+            return
+        self._pending += entries
+        if self._is_group_full():
+            self.commit()
+
+    def close(self) -> None:
+        """Commit and close the log."""
+        if self._file is None:
+            return
+        self.commit()
+        self._file.close()
+        self._file = None
+
+    def get_counters(self) -> dict[str, int]:
+        """Return throughput counters."""
+        return {
+            "entries_written": self.entries_written,
+            "flushes": self.flushes,
+            "syncs": self.syncs,
+        }